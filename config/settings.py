@@ -41,11 +41,57 @@ class Settings:
         'walk_forward_train_weeks': {'min': 4, 'type': int},
         'walk_forward_test_weeks': {'min': 1, 'type': int},
         'walk_forward_min_train_weeks': {'min': 4, 'type': int},
+        'walk_forward_parallel_folds': {'min': 1, 'type': int},
+        'walk_forward_warm_start': {'min': 0.0, 'max': 1.0, 'type': float},
+        'walk_forward_warm_generations': {'min': 1, 'type': int},
+        'walk_forward_test_finalists': {'min': 1, 'type': int},
+        'cpcv_groups': {'min': 0, 'type': int},
+        'cpcv_test_groups': {'min': 1, 'type': int},
         'total_data_weeks': {'min': 8, 'type': int},
         'max_drawdown_limit': {'min': 0.0, 'max': 1.0, 'type': float},
         'min_profit_factor': {'min': 0.0, 'type': float},
         'min_win_rate': {'min': 0.0, 'max': 1.0, 'type': float},
         'diversity_selection_weight': {'min': 0.0, 'max': 1.0, 'type': float},
+        # Hall of fame / elitism
+        'hall_of_fame_size': {'min': 1, 'type': int},
+        'elite_size': {'min': 1, 'type': int},
+        # Adaptive mutation
+        'adaptive_mutation_patience': {'min': 1, 'type': int},
+        'adaptive_mutation_step': {'min': 1.0, 'type': float},
+        # Early stopping
+        'early_stop_patience': {'min': 0, 'type': int},
+        'early_stop_min_delta': {'min': 0.0, 'type': float},
+        'early_stop_min_diversity': {'min': 0.0, 'max': 1.0, 'type': float},
+        'early_stop_bar_margin': {'type': float},
+        # Surrogate pre-screening
+        'surrogate_oversample': {'min': 1, 'type': int},
+        'surrogate_min_samples': {'min': 2, 'type': int},
+        'surrogate_uncertainty_weight': {'min': 0.0, 'type': float},
+        # Reproduction
+        'ga_seed': {'min': 0, 'type': int},
+        # Resolution schedule
+        'resolution_initial': {'min': 0.0, 'max': 1.0, 'type': float},
+        'resolution_factor': {'min': 1.0, 'type': float},
+        'resolution_patience': {'min': 1, 'type': int},
+        'resolution_full_precision_at': {'min': 0.0, 'max': 1.0, 'type': float},
+        # Differential evolution / CMA-ES
+        'de_mutation_factor': {'min': 0.0, 'max': 2.0, 'type': float},
+        'de_crossover_rate': {'min': 0.0, 'max': 1.0, 'type': float},
+        'cmaes_sigma': {'min': 0.0, 'max': 1.0, 'type': float},
+        # Budget
+        'max_evaluations': {'min': 1, 'type': int},
+        'max_runtime_minutes': {'min': 0.0, 'type': float},
+        # Warm start
+        'seed_fraction': {'min': 0.0, 'max': 1.0, 'type': float},
+        # Novelty archive
+        'novelty_threshold': {'min': 0.0, 'max': 1.0, 'type': float},
+        'novelty_max_retries': {'min': 0, 'type': int},
+        'novelty_neighbours': {'min': 1, 'type': int},
+        # Optuna
+        'optuna_workers': {'min': 1, 'type': int},
+        # Hybrid GA + Optuna
+        'hybrid_ga_generations': {'min': 1, 'type': int},
+        'hybrid_optuna_trials': {'min': 1, 'type': int},
         # On-the-fly optimization settings
     }
 
@@ -114,6 +160,11 @@ class Settings:
         self.num_pairs = self.config['num_pairs']
         self.checkpoint_dir = os.path.join(self.project_dir, self.config['checkpoint_dir'])
         self.checkpoint_frequency = self.config['checkpoint_frequency']
+        # Journal every finished backtest next to the checkpoint so --resume
+        # does not repeat the ones an interrupted generation had finished
+        self.evaluation_journal = self.config.get('evaluation_journal', True)
+        # GA checkpoints are versioned JSON, gzip-compressed unless disabled
+        self.checkpoint_compress = self.config.get('checkpoint_compress', True)
         self.add_max_open_trades = self.config['add_max_open_trades']
         self.fix_pairs = self.config['fix_pairs']
         self.add_dynamic_timeframes = self.config['add_dynamic_timeframes']
@@ -137,7 +188,60 @@ class Settings:
         self.optuna_sampler = self.config.get('optuna_sampler', 'tpe')
         self.optuna_n_startup_trials = self.config.get('optuna_n_startup_trials', 10)
         self.optuna_pruning = self.config.get('optuna_pruning', False)
+        # With pruning, trials are backtested on the most recent
+        # optuna_fidelity_weeks first and stopped by a 'median' or
+        # 'hyperband' pruner before the full window if they lag
+        self.optuna_pruner = self.config.get('optuna_pruner', 'median')
+        self.optuna_fidelity_weeks = self.config.get('optuna_fidelity_weeks', [4, 12])
+        if self.optuna_pruner not in ('median', 'hyperband'):
+            raise ConfigurationError(
+                f"optuna_pruner must be 'median' or 'hyperband', got {self.optuna_pruner!r}"
+            )
         self.optuna_n_jobs = self.config.get('optuna_n_jobs', 1)
+        # Studies persist in checkpoint_dir ('sqlite' or 'journal') so
+        # --resume can continue them; 'memory' keeps the old behaviour.
+        # The study name defaults to a fingerprint of the search space
+        self.optuna_storage = self.config.get('optuna_storage', 'sqlite')
+        self.optuna_study_name = self.config.get('optuna_study_name')
+        # Worker processes sharing a stored study (optuna_n_jobs threads
+        # still run inside each one)
+        self.optuna_workers = self.config.get('optuna_workers', 1)
+        # Drive the study with ask/tell on the pool_processes worker pool,
+        # one trial in flight per worker, sampled with TPE's constant liar
+        self.optuna_ask_tell = self.config.get('optuna_ask_tell', False)
+        if self.optuna_storage not in ('sqlite', 'journal', 'memory'):
+            raise ConfigurationError(
+                f"optuna_storage must be 'sqlite', 'journal' or 'memory', got {self.optuna_storage!r}"
+            )
+
+        # Hybrid (--optimizer hybrid): GA generations before Optuna takes
+        # over, and Optuna trials after (unset: half the generations each)
+        self.hybrid_ga_generations = self.config.get('hybrid_ga_generations')
+        self.hybrid_optuna_trials = self.config.get('hybrid_optuna_trials')
+
+        # NSGA-II objectives: parse_backtest_results metric names, prefixed
+        # with '-' for metrics to minimise
+        self.nsga2_objectives = self.config.get(
+            'nsga2_objectives', ['total_profit_percent', 'sortino_ratio', '-max_drawdown']
+        )
+
+        # Run budget (unset = unlimited): stop after max_evaluations backtests
+        # or before max_runtime_minutes of wall-clock time; the last
+        # generation is shrunk to fit and a checkpoint is left for --resume
+        self.max_evaluations = self.config.get('max_evaluations')
+        self.max_runtime_minutes = self.config.get('max_runtime_minutes')
+
+        # Differential evolution (--optimizer de): de_strategy is 'rand1bin',
+        # 'best1bin' or 'cmaes'; mutation factor F and crossover rate CR apply
+        # to DE, cmaes_sigma is the initial CMA-ES step as a fraction of range
+        self.de_strategy = self.config.get('de_strategy', 'rand1bin')
+        self.de_mutation_factor = self.config.get('de_mutation_factor', 0.5)
+        self.de_crossover_rate = self.config.get('de_crossover_rate', 0.9)
+        self.cmaes_sigma = self.config.get('cmaes_sigma', 0.3)
+        if self.de_strategy not in ('rand1bin', 'best1bin', 'cmaes'):
+            raise ConfigurationError(
+                f"de_strategy must be 'rand1bin', 'best1bin' or 'cmaes', got {self.de_strategy!r}"
+            )
 
         # Anti-overfitting settings (critical for profitable strategies)
         self.enable_walk_forward = self.config.get('enable_walk_forward', False)
@@ -145,6 +249,25 @@ class Settings:
         self.walk_forward_train_weeks = self.config.get('walk_forward_train_weeks', 26)
         self.walk_forward_test_weeks = self.config.get('walk_forward_test_weeks', 4)
         self.walk_forward_min_train_weeks = self.config.get('walk_forward_min_train_weeks', 12)
+        # Folds optimized at once; their backtests share one pool_processes pool
+        self.walk_forward_parallel_folds = self.config.get('walk_forward_parallel_folds', 1)
+        # Seed each fold with the top walk_forward_warm_start share of the
+        # previous fold's last generation (0 disables); warm-started folds run
+        # walk_forward_warm_generations generations (unset = generations)
+        self.walk_forward_warm_start = self.config.get('walk_forward_warm_start', 0.0)
+        self.walk_forward_warm_generations = self.config.get('walk_forward_warm_generations')
+        # Distinct hall-of-fame genomes per fold backtested on the test window
+        # (the winner plus walk_forward_test_finalists - 1 runners-up)
+        self.walk_forward_test_finalists = self.config.get('walk_forward_test_finalists', 1)
+        # Backtest each test candidate once over total_data_weeks with its
+        # trades exported and score every window from that trade list;
+        # walk_forward_equity_reset starts each window from the starting
+        # balance. cpcv_groups > 0 also scores every fold winner on each
+        # combination of cpcv_test_groups held-out groups
+        self.walk_forward_segment_reuse = self.config.get('walk_forward_segment_reuse', False)
+        self.walk_forward_equity_reset = self.config.get('walk_forward_equity_reset', True)
+        self.cpcv_groups = self.config.get('cpcv_groups', 0)
+        self.cpcv_test_groups = self.config.get('cpcv_test_groups', 2)
         self.total_data_weeks = self.config.get('total_data_weeks', 52)
         self.max_drawdown_limit = self.config.get('max_drawdown_limit', 0.35)
         self.min_profit_factor = self.config.get('min_profit_factor', 1.0)
@@ -152,6 +275,65 @@ class Settings:
         self.enable_diversity_selection = self.config.get('enable_diversity_selection', True)
         self.diversity_selection_weight = self.config.get('diversity_selection_weight', 0.3)
 
+        # Hall of fame of the best distinct genomes; the top elite_size are
+        # carried unchanged into every new generation
+        self.hall_of_fame_size = self.config.get('hall_of_fame_size', 10)
+        self.elite_size = self.config.get('elite_size', 1)
+
+        # Adaptive mutation: raise the rate toward max_mutation_prob while
+        # fitness stalls or diversity collapses, decay it back on progress
+        self.adaptive_mutation = self.config.get('adaptive_mutation', True)
+        self.adaptive_mutation_patience = self.config.get('adaptive_mutation_patience', 2)
+        self.adaptive_mutation_step = self.config.get('adaptive_mutation_step', 1.5)
+
+        # Convergence-based early stopping (all criteria disabled by default)
+        self.early_stop_patience = self.config.get('early_stop_patience', 0)
+        self.early_stop_min_delta = self.config.get('early_stop_min_delta', 1e-4)
+        self.early_stop_min_diversity = self.config.get('early_stop_min_diversity', 0.0)
+        self.early_stop_bar_margin = self.config.get('early_stop_bar_margin')
+
+        # Surrogate pre-screening of offspring (requires scikit-learn)
+        self.surrogate_enabled = self.config.get('surrogate_enabled', False)
+        self.surrogate_oversample = self.config.get('surrogate_oversample', 3)
+        self.surrogate_min_samples = self.config.get('surrogate_min_samples', 30)
+        self.surrogate_uncertainty_weight = self.config.get('surrogate_uncertainty_weight', 1.0)
+
+        # Reproduction: batch_operators crosses and mutates the whole offspring
+        # set as one NumPy array; ga_seed (unset = unseeded) derives every
+        # generation's randomness from (seed, generation) so resumed runs
+        # replay exactly
+        self.batch_operators = self.config.get('batch_operators', False)
+        self.crossover_method = self.config.get('crossover_method', 'single_point')
+        self.ga_seed = self.config.get('ga_seed')
+        if self.crossover_method not in ('single_point', 'uniform'):
+            raise ConfigurationError(
+                f"crossover_method must be 'single_point' or 'uniform', got {self.crossover_method!r}"
+            )
+
+        # Coarse-to-fine grid for numeric genes: start at resolution_initial
+        # of each range (0 disables), divide by resolution_factor on each
+        # plateau, reach declared precision by resolution_full_precision_at
+        # of the generations
+        self.resolution_initial = self.config.get('resolution_initial', 0.0)
+        self.resolution_factor = self.config.get('resolution_factor', 2.0)
+        self.resolution_patience = self.config.get('resolution_patience', 2)
+        self.resolution_full_precision_at = self.config.get('resolution_full_precision_at', 0.5)
+        if self.resolution_factor <= 1:
+            raise ConfigurationError(
+                f"resolution_factor must be greater than 1, got {self.resolution_factor}"
+            )
+
+        # Warm start: at most this fraction of the first population comes
+        # from --seed-from; the rest stays random
+        self.seed_fraction = self.config.get('seed_fraction', 0.25)
+
+        # Novelty archive: genomes within novelty_threshold (RMS normalised
+        # gene distance) of an evaluated one are re-mutated or scored from
+        # their neighbours instead of backtested (0 disables)
+        self.novelty_threshold = self.config.get('novelty_threshold', 0.0)
+        self.novelty_max_retries = self.config.get('novelty_max_retries', 3)
+        self.novelty_neighbours = self.config.get('novelty_neighbours', 3)
+
         # Validate walk-forward settings consistency
         if self.enable_walk_forward:
             if self.walk_forward_train_weeks + self.walk_forward_test_weeks > self.total_data_weeks:
@@ -160,6 +342,12 @@ class Settings:
                     f"walk_forward_test_weeks ({self.walk_forward_test_weeks}) exceeds "
                     f"total_data_weeks ({self.total_data_weeks})"
                 )
+            if self.cpcv_groups and not (
+                    self.cpcv_test_groups < self.cpcv_groups <= self.total_data_weeks):
+                raise ConfigurationError(
+                    f"cpcv_groups ({self.cpcv_groups}) must exceed cpcv_test_groups "
+                    f"({self.cpcv_test_groups}) and be at most total_data_weeks ({self.total_data_weeks})"
+                )
 
         # Set proxy environment variables
         for key, value in self.config.get('proxy', {}).items():
@@ -0,0 +1,79 @@
+"""Self-adaptive mutation rate for the genetic algorithm.
+
+A fixed mutation rate is a compromise: too low and a converged population
+stalls on a plateau, too high and a population that is still improving keeps
+throwing good genes away. The controller here starts at ``mutation_prob`` and
+raises the rate geometrically toward ``max_mutation_prob`` while the best
+fitness stalls or diversity collapses, then lowers it back once progress
+resumes.
+"""
+from typing import Any, Dict, Optional
+
+
+class AdaptiveMutationRate:
+    """Mutation rate that reacts to fitness progress and population diversity."""
+
+    def __init__(
+        self,
+        base_rate: float,
+        max_rate: float,
+        diversity_threshold: float = 0.1,
+        patience: int = 2,
+        step: float = 1.5,
+        min_improvement: float = 1e-4
+    ):
+        """
+        Args:
+            base_rate: Rate used while the search is making progress
+            max_rate: Upper bound the rate can be raised to
+            diversity_threshold: Diversity below which the rate is raised
+            patience: Generations without improvement before raising the rate
+            step: Multiplicative factor applied on each raise or decay
+            min_improvement: Fitness gain that counts as progress
+        """
+        self.base_rate = base_rate
+        self.max_rate = max(max_rate, base_rate)
+        self.diversity_threshold = diversity_threshold
+        self.patience = patience
+        self.step = step
+        self.min_improvement = min_improvement
+        self.rate = base_rate
+        self.best_fitness: Optional[float] = None
+        self.stalled_generations = 0
+
+    def update(self, best_fitness: float, diversity: Optional[float] = None) -> float:
+        """Record one generation's outcome and return the rate for the next one.
+
+        Args:
+            best_fitness: Best fitness measured in the generation
+            diversity: Population diversity, or None if not measured
+
+        Returns:
+            Mutation rate to use when breeding the next generation
+        """
+        improved = (self.best_fitness is None
+                    or best_fitness > self.best_fitness + self.min_improvement)
+        if improved:
+            self.best_fitness = best_fitness
+            self.stalled_generations = 0
+        else:
+            self.stalled_generations += 1
+
+        collapsed = diversity is not None and diversity < self.diversity_threshold
+        if self.stalled_generations >= self.patience or collapsed:
+            self.rate = min(self.max_rate, self.rate * self.step)
+        elif improved:
+            self.rate = max(self.base_rate, self.rate / self.step)
+        return self.rate
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'best_fitness': self.best_fitness,
+            'stalled_generations': self.stalled_generations,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.rate = state.get('rate', self.base_rate)
+        self.best_fitness = state.get('best_fitness')
+        self.stalled_generations = state.get('stalled_generations', 0)
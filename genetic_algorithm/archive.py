@@ -0,0 +1,124 @@
+"""Archive of every evaluated genome, indexed for nearest-neighbour lookup.
+
+Int genes and rounding to ``decimal_places`` make mutation land very close to
+genomes that were already backtested, and an elite re-enters every
+generation unchanged. Re-running Freqtrade on those spends the fixed backtest
+budget on answers we already have. The archive stores each evaluated genome
+in the normalised [0, 1] gene space of ``genetic_algorithm.encoding`` and
+answers two questions: how far is a candidate from anything already
+evaluated, and what do its nearest evaluated neighbours suggest its fitness
+is.
+
+Distances are root-mean-square over dimensions, so a threshold reads as the
+typical per-gene difference as a fraction of the gene's range. Queries use a
+SciPy KD-tree when SciPy is installed and a vectorised brute-force scan
+otherwise.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from genetic_algorithm.individual import Individual
+from genetic_algorithm.encoding import encode_genes, encode_pairs
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    cKDTree = None
+    SCIPY_AVAILABLE = False
+
+
+class EvaluationArchive:
+    """Every evaluated genome with its fitness, searchable by distance."""
+
+    def __init__(self, parameters: List[Dict[str, Any]], all_pairs: Optional[List[str]] = None):
+        """
+        Args:
+            parameters: Parameter definitions used to encode genes
+            all_pairs: Pairs to one-hot encode; None when pairs are fixed
+        """
+        self.parameters = parameters
+        self.all_pairs = all_pairs
+        self.entries: List[Tuple[List[Any], List[str], float]] = []
+        self._vectors: List[List[float]] = []
+        self._fitnesses: List[float] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._tree = None
+
+    def _encode(self, genes: List[Any], trading_pairs: List[str]) -> List[float]:
+        return encode_genes(genes, self.parameters) + encode_pairs(trading_pairs, self.all_pairs)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, individuals: List[Individual]) -> None:
+        """Archive evaluated individuals; those without a fitness are skipped."""
+        for ind in individuals:
+            if ind.fitness is None:
+                continue
+            self.entries.append((list(ind.genes), list(ind.trading_pairs), ind.fitness))
+            self._vectors.append(self._encode(ind.genes, ind.trading_pairs))
+            self._fitnesses.append(ind.fitness)
+        self._matrix = None
+        self._tree = None
+
+    def _index(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.asarray(self._vectors, dtype=float)
+            if SCIPY_AVAILABLE:
+                self._tree = cKDTree(self._matrix)
+        return self._matrix
+
+    def neighbours(self, individual: Individual, k: int = 1) -> List[Tuple[float, float]]:
+        """Return up to ``k`` (distance, fitness) pairs for the nearest archived genomes."""
+        if not self._vectors:
+            return []
+        matrix = self._index()
+        point = np.asarray(self._encode(individual.genes, individual.trading_pairs), dtype=float)
+        k = min(k, len(self._vectors))
+        scale = math.sqrt(max(matrix.shape[1], 1))
+        if self._tree is not None:
+            distances, indices = self._tree.query(point, k=k)
+            distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        else:
+            all_distances = np.sqrt(((matrix - point) ** 2).sum(axis=1))
+            indices = np.argsort(all_distances)[:k]
+            distances = all_distances[indices]
+        return [(float(d) / scale, self._fitnesses[i]) for d, i in zip(distances, indices)]
+
+    def distance(self, individual: Individual) -> float:
+        """Distance to the nearest archived genome (inf when the archive is empty)."""
+        nearest = self.neighbours(individual, k=1)
+        return nearest[0][0] if nearest else float('inf')
+
+    def estimate(self, individual: Individual, k: int = 3) -> float:
+        """Inverse-distance weighted fitness of the nearest archived genomes.
+
+        An exact match returns the archived fitness itself. Neighbours without
+        a finite fitness carry no magnitude to average, so they are left out;
+        if none remain the estimate is -inf.
+        """
+        neighbours = self.neighbours(individual, k=k)
+        if neighbours and neighbours[0][0] < 1e-12:
+            return neighbours[0][1]
+        finite = [(d, f) for d, f in neighbours if math.isfinite(f)]
+        if not finite:
+            return float('-inf')
+        weights = [1.0 / d for d, _ in finite]
+        return sum(w * f for w, (_, f) in zip(weights, finite)) / sum(weights)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'entries': self.entries}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.entries = []
+        self._vectors = []
+        self._fitnesses = []
+        for genes, pairs, fitness in state.get('entries', []):
+            self.entries.append((list(genes), list(pairs), fitness))
+            self._vectors.append(self._encode(genes, pairs))
+            self._fitnesses.append(fitness)
+        self._matrix = None
+        self._tree = None
@@ -0,0 +1,213 @@
+"""Vectorized crossover and mutation over a whole offspring set.
+
+``operators.crossover`` and ``operators.mutate`` work one pair or one
+individual at a time and draw from the global ``random`` module, so the
+result depends on call order and is hard to reproduce across workers. The
+functions here operate on a gene matrix (one row per individual, one column
+per parameter) and draw every random number from a ``numpy.random.Generator``.
+With ``generation_rng`` that generator is seeded from the run seed and the
+generation number alone, so resuming at generation N replays generation N
+exactly.
+
+Booleans are stored as 0/1 and categoricals as option indices; Int and
+Decimal genes keep their values. ``array_to_genes`` restores the declared
+types and precision. Trading pairs are not part of the matrix:
+``batch_crossover_pairs`` recombines them for the same crossed pairs of rows,
+as ``operators.crossover(with_pair=True)`` does.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from genetic_algorithm.individual import Individual, grid_step
+
+
+def generation_rng(seed: int, generation: int) -> np.random.Generator:
+    """Generator for one generation, independent of any earlier draws."""
+    return np.random.default_rng([seed, generation])
+
+
+def generation_seed(seed: int, generation: int) -> int:
+    """Integer seed for the ``random`` module, derived like ``generation_rng``."""
+    return int(np.random.SeedSequence([seed, generation]).generate_state(1)[0])
+
+
+def genes_to_array(individuals: List[Individual], parameters: List[Dict[str, Any]]) -> np.ndarray:
+    """Encode individuals' genes as a float matrix of shape (n, len(parameters))."""
+    matrix = np.zeros((len(individuals), len(parameters)))
+    for row, ind in enumerate(individuals):
+        for col, param in enumerate(parameters):
+            value = ind.genes[col]
+            if param['type'] == 'Categorical':
+                options = param.get('options', [])
+                matrix[row, col] = options.index(value) if value in options else 0
+            else:
+                matrix[row, col] = float(value)
+    return matrix
+
+
+def array_to_genes(row: np.ndarray, parameters: List[Dict[str, Any]]) -> List[Any]:
+    """Decode one matrix row back to typed gene values."""
+    genes = []
+    for value, param in zip(row, parameters):
+        param_type = param['type']
+        if param_type == 'Int':
+            genes.append(int(round(value)))
+        elif param_type == 'Decimal':
+            genes.append(round(float(value), param.get('decimal_places', 2)))
+        elif param_type == 'Boolean':
+            genes.append(bool(value >= 0.5))
+        elif param_type == 'Categorical':
+            genes.append(param['options'][int(value)])
+        else:
+            genes.append(float(value))
+    return genes
+
+
+def draw_crossed(n_rows: int, n_genes: int, rng: np.random.Generator,
+                 crossover_prob: float) -> np.ndarray:
+    """
+    Decide which pairs of consecutive rows are crossed.
+
+    Returns:
+        Boolean array with one entry per pair of rows; all False when there
+        are fewer than two genes, as ``operators.crossover`` leaves such
+        parents untouched
+    """
+    n_pairs = n_rows // 2
+    if n_pairs == 0 or n_genes < 2:
+        return np.zeros(n_pairs, dtype=bool)
+    return rng.random(n_pairs) < crossover_prob
+
+
+def batch_crossover(genes: np.ndarray, rng: np.random.Generator, crossover_prob: float,
+                    method: str = 'single_point',
+                    crossed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Cross consecutive rows (0 with 1, 2 with 3, ...) in one pass.
+
+    Args:
+        genes: Gene matrix; an odd last row is left untouched
+        rng: Random generator
+        crossover_prob: Probability that a pair is crossed
+        method: 'single_point' (swap every gene after a random cut) or
+            'uniform' (swap each gene with probability 0.5)
+        crossed: Pairs to cross, from ``draw_crossed``; None draws them
+
+    Returns:
+        New gene matrix
+    """
+    children = genes.copy()
+    n_pairs, n_genes = len(genes) // 2, genes.shape[1]
+    if crossed is None:
+        crossed = draw_crossed(len(genes), n_genes, rng, crossover_prob)
+    if not crossed.any():
+        return children
+
+    if method == 'uniform':
+        swap = rng.random((n_pairs, n_genes)) < 0.5
+    else:
+        points = rng.integers(1, n_genes, size=n_pairs)
+        swap = np.arange(n_genes)[None, :] >= points[:, None]
+    swap &= crossed[:, None]
+
+    first, second = genes[0:2 * n_pairs:2], genes[1:2 * n_pairs:2]
+    children[0:2 * n_pairs:2] = np.where(swap, second, first)
+    children[1:2 * n_pairs:2] = np.where(swap, first, second)
+    return children
+
+
+def batch_crossover_pairs(trading_pairs: List[List[str]], crossed: np.ndarray,
+                          rng: np.random.Generator) -> List[List[str]]:
+    """
+    Recombine the trading pairs of the crossed rows.
+
+    As in ``operators.crossover``, both children draw from one shuffle of
+    their parents' combined pairs and keep their parent's pair count.
+
+    Args:
+        trading_pairs: Pair list of each row
+        crossed: Pairs of rows to cross, from ``draw_crossed``
+        rng: Random generator
+
+    Returns:
+        New pair lists
+    """
+    children = [list(pairs) for pairs in trading_pairs]
+    for index in np.flatnonzero(crossed):
+        first, second = trading_pairs[2 * index], trading_pairs[2 * index + 1]
+        if not first or not second:
+            continue
+        combined = list(dict.fromkeys(first + second))
+        shuffled = [combined[i] for i in rng.permutation(len(combined))]
+        children[2 * index] = shuffled[:len(first)]
+        children[2 * index + 1] = shuffled[:len(second)]
+    return children
+
+
+def batch_mutate(genes: np.ndarray, parameters: List[Dict[str, Any]], rng: np.random.Generator,
+                 mutation_rate: float, resolution: Optional[float] = None) -> np.ndarray:
+    """
+    Mutate every gene of every row with probability ``mutation_rate``.
+
+    Numeric genes get one of the three strategies of ``operators.mutate``
+    (Gaussian noise of 10% of the range, uniform reset, or scaling by
+    0.8-1.2) and are clamped to their range. Booleans flip and categoricals
+    are redrawn. On a resolution grid, a mutated numeric gene that would
+    round back to its old grid point moves one step instead.
+
+    Returns:
+        New gene matrix
+    """
+    mutated = genes.copy()
+    n_rows = len(genes)
+    if n_rows == 0:
+        return mutated
+    mask = rng.random(genes.shape) < mutation_rate
+
+    for col, param in enumerate(parameters):
+        rows = np.flatnonzero(mask[:, col])
+        if rows.size == 0:
+            continue
+        param_type = param['type']
+        old = genes[rows, col]
+
+        if param_type == 'Boolean':
+            mutated[rows, col] = 1.0 - old
+            continue
+        if param_type == 'Categorical':
+            mutated[rows, col] = rng.integers(0, max(1, len(param.get('options', []))), size=rows.size)
+            continue
+        if param_type not in ('Int', 'Decimal'):
+            continue
+
+        start, end = param.get('start', 0), param.get('end', 100)
+        strategy = rng.integers(0, 3, size=rows.size)
+        noise = old + rng.normal(0.0, (end - start) * 0.1, size=rows.size)
+        if param_type == 'Int':
+            reset = rng.integers(int(start), int(end) + 1, size=rows.size).astype(float)
+        else:
+            reset = rng.uniform(start, end, size=rows.size)
+        scale = old * rng.uniform(0.8, 1.2, size=rows.size)
+        new = np.clip(np.choose(strategy, [noise, reset, scale]), start, end)
+
+        step = grid_step(param, resolution)
+        if step is not None:
+            new = _snap(new, start, end, step)
+            old_snapped = _snap(old, start, end, step)
+            stuck = new == old_snapped
+            direction = rng.choice([-1.0, 1.0], size=rows.size)
+            # Step away from a boundary rather than off it.
+            direction = np.where(new + direction * step > end, -1.0, direction)
+            direction = np.where(new + direction * step < start, 1.0, direction)
+            moved = new + direction * step
+            in_range = (moved >= start) & (moved <= end)
+            new = np.where(stuck & in_range, moved, new)
+        mutated[rows, col] = new
+    return mutated
+
+
+def _snap(values: np.ndarray, start: float, end: float, step: float) -> np.ndarray:
+    """Vector form of ``individual.snap_to_grid``."""
+    snapped = start + np.round((values - start) / step) * step
+    return np.maximum(start, np.where(snapped > end, snapped - step, snapped))
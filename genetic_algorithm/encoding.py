@@ -0,0 +1,74 @@
+"""Numeric encoding of genomes.
+
+Genes mix Int, Decimal, Boolean and Categorical values on unrelated scales.
+Anything that learns from or measures distances between evaluated genomes
+needs them on a common footing, so every gene maps to [0, 1]: numeric genes
+by their position in the declared range, booleans to 0/1 and categoricals to
+their option index spread over the unit interval.
+"""
+from typing import Any, Dict, List, Optional
+
+
+def encode_gene(value: Any, param: Dict[str, Any]) -> float:
+    """Map one gene value to [0, 1] according to its parameter definition."""
+    param_type = param.get('type')
+    if param_type in ('Int', 'Decimal'):
+        start = param.get('start', 0)
+        end = param.get('end', 1)
+        if end <= start:
+            return 0.0
+        return min(1.0, max(0.0, (float(value) - start) / (end - start)))
+    if param_type == 'Boolean':
+        return 1.0 if value else 0.0
+    if param_type == 'Categorical':
+        options = param.get('options', [])
+        if len(options) < 2 or value not in options:
+            return 0.0
+        return options.index(value) / (len(options) - 1)
+    return 0.0
+
+
+def encode_genes(genes: List[Any], parameters: List[Dict[str, Any]]) -> List[float]:
+    """Map a gene list to a vector of floats in [0, 1]."""
+    return [encode_gene(value, param) for value, param in zip(genes, parameters)]
+
+
+def encode_pairs(trading_pairs: List[str], all_pairs: Optional[List[str]]) -> List[float]:
+    """Multi-hot vector over ``all_pairs``; empty when pairs are not searched."""
+    if not all_pairs:
+        return []
+    selected = set(trading_pairs)
+    return [1.0 if pair in selected else 0.0 for pair in all_pairs]
+
+
+def decode_gene(x: float, param: Dict[str, Any]) -> Any:
+    """Inverse of ``encode_gene``: map a coordinate in [0, 1] to a valid gene value.
+
+    Int genes are rounded, Decimal genes rounded to ``decimal_places``,
+    booleans thresholded at 0.5 and categoricals mapped to the nearest option.
+    """
+    x = min(1.0, max(0.0, float(x)))
+    param_type = param.get('type')
+    if param_type in ('Int', 'Decimal'):
+        start = param.get('start', 0)
+        value = start + x * (param.get('end', 1) - start)
+        if param_type == 'Int':
+            return int(round(value))
+        return round(value, param.get('decimal_places', 2))
+    if param_type == 'Boolean':
+        return x >= 0.5
+    if param_type == 'Categorical':
+        options = param.get('options', [])
+        return options[int(round(x * (len(options) - 1)))] if options else None
+    return x
+
+
+def decode_genes(vector: List[float], parameters: List[Dict[str, Any]]) -> List[Any]:
+    """Map a vector in [0, 1]^n back to a gene list."""
+    return [decode_gene(x, param) for x, param in zip(vector, parameters)]
+
+
+def decode_pairs(vector: List[float], all_pairs: List[str], num_pairs: int) -> List[str]:
+    """The ``num_pairs`` pairs with the highest scores, in ``all_pairs`` order."""
+    ranked = sorted(range(len(all_pairs)), key=lambda i: -vector[i])[:num_pairs]
+    return [all_pairs[i] for i in sorted(ranked)]
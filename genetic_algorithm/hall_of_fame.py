@@ -0,0 +1,79 @@
+"""Bounded archive of the best distinct genomes seen during a search.
+
+The per-generation winner list loses every runner-up, and consecutive winners
+are often the same genome re-evaluated. The hall of fame keeps the top K
+*distinct* genomes ever evaluated in a min-heap, so inserting is O(log K) and
+the weakest member is always at the root, ready to be displaced. Genomes are
+deduplicated by a hash of their genes and trading pairs.
+"""
+import hashlib
+import heapq
+import itertools
+import json
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from genetic_algorithm.individual import Individual
+
+
+def genome_key(individual: Individual) -> str:
+    """Stable hash of an individual's genes and (order-independent) pairs."""
+    payload = json.dumps([individual.genes, sorted(individual.trading_pairs)], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class HallOfFame:
+    """Top-K distinct individuals by fitness."""
+
+    def __init__(self, maxsize: int = 10):
+        """
+        Args:
+            maxsize: Maximum number of individuals kept
+        """
+        self.maxsize = maxsize
+        self._heap: List[Tuple[float, int, str, Individual]] = []
+        self._keys: Dict[str, float] = {}
+        self._counter = itertools.count()
+
+    def update(self, individuals: List[Individual]) -> int:
+        """Offer evaluated individuals to the archive.
+
+        Individuals without a finite fitness and genomes already archived are
+        ignored. Accepted individuals are stored as copies, so later genetic
+        operations on the originals do not alter the archive.
+
+        Returns:
+            Number of individuals that entered the archive
+        """
+        inserted = 0
+        for ind in individuals:
+            if ind.fitness is None or not math.isfinite(ind.fitness):
+                continue
+            key = genome_key(ind)
+            if key in self._keys:
+                continue
+            entry = (ind.fitness, next(self._counter), key, ind.copy())
+            if len(self._heap) < self.maxsize:
+                heapq.heappush(self._heap, entry)
+            elif ind.fitness > self._heap[0][0]:
+                evicted = heapq.heapreplace(self._heap, entry)
+                del self._keys[evicted[2]]
+            else:
+                continue
+            self._keys[key] = ind.fitness
+            inserted += 1
+        return inserted
+
+    def top(self, n: Optional[int] = None) -> List[Individual]:
+        """Return up to ``n`` archived individuals, best first."""
+        ranked = sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))
+        return [entry[3] for entry in ranked[:n]]
+
+    def __contains__(self, individual: Individual) -> bool:
+        return genome_key(individual) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[Individual]:
+        return iter(self.top())
@@ -3,6 +3,36 @@ import random
 import copy
 
 
+def grid_step(param: Dict[str, Any], resolution: Optional[float]) -> Optional[float]:
+    """
+    Grid spacing for a numeric gene at ``resolution`` (a fraction of its range).
+
+    Returns None when the grid is no coarser than the declared precision:
+    one for Int genes, ``decimal_places`` for Decimal genes.
+    """
+    if not resolution or param.get('type') not in ('Int', 'Decimal'):
+        return None
+    step = resolution * (param['end'] - param['start'])
+    if param['type'] == 'Int':
+        step = round(step)
+        return step if step > 1 else None
+    precision = 10 ** -param.get('decimal_places', 2)
+    return step if step > precision else None
+
+
+def snap_to_grid(value: float, param: Dict[str, Any], resolution: Optional[float]) -> float:
+    """Snap a numeric gene to the nearest grid point counted from ``start``."""
+    step = grid_step(param, resolution)
+    if step is None:
+        return value
+    start, end = param['start'], param['end']
+    snapped = start + round((value - start) / step) * step
+    # Snapping must not leave the declared range.
+    if snapped > end:
+        snapped -= step
+    return max(start, snapped)
+
+
 class Individual:
     """Represents an individual in the genetic algorithm population."""
 
@@ -11,43 +41,60 @@ class Individual:
         self.trading_pairs = trading_pairs
         self.fitness: Optional[float] = None
         self.param_types = param_types
+        # Raw backtest metrics, kept by optimizers that need more than fitness
+        self.metrics: Optional[Dict[str, Any]] = None
 
     @classmethod
     def create_random(cls, parameters: List[Dict[str, Any]], all_pairs: List[str],
-                      num_pairs: Optional[int]) -> 'Individual':
-        """Create a random individual with random genes and trading pairs."""
+                      num_pairs: Optional[int], rng: Optional[random.Random] = None) -> 'Individual':
+        """Create a random individual with random genes and trading pairs.
+
+        ``rng`` replaces the global ``random`` module, for callers that keep
+        their own random state.
+        """
+        rng = rng or random
         genes = []
         for param in parameters:
             param_type = param['type']
             if param_type == 'Int':
                 if param.get('name') == 'max_open_trades':
                     min_value = max(1, int(param['start']))
-                    value = random.randint(min_value, int(param['end']))
+                    value = rng.randint(min_value, int(param['end']))
                 else:
-                    value = random.randint(int(param['start']), int(param['end']))
+                    value = rng.randint(int(param['start']), int(param['end']))
             elif param_type == 'Decimal':
-                value = random.uniform(param['start'] + 1e-10, param['end'] - 1e-10)
+                value = rng.uniform(param['start'] + 1e-10, param['end'] - 1e-10)
                 value = round(value, param['decimal_places'])
             elif param_type == 'Categorical':
-                value = random.choice(param['options'])
+                value = rng.choice(param['options'])
             elif param_type == 'Boolean':
-                value = random.choice([True, False])
+                value = rng.choice([True, False])
             else:
                 raise ValueError(f"Unknown parameter type: {param_type}")
             genes.append(value)
 
         if num_pairs is not None:
-            trading_pairs = random.sample(all_pairs, min(num_pairs, len(all_pairs)))
+            trading_pairs = rng.sample(all_pairs, min(num_pairs, len(all_pairs)))
         else:
             trading_pairs = all_pairs.copy()
         return cls(genes, trading_pairs, parameters)
 
-    def constrain_genes(self, parameters: List[Dict[str, Any]]) -> None:
-        """Constrain gene values to their valid ranges."""
+    def constrain_genes(self, parameters: List[Dict[str, Any]],
+                        resolution: Optional[float] = None) -> None:
+        """Constrain gene values to their valid ranges.
+
+        Args:
+            parameters: Parameter definitions
+            resolution: Optional grid spacing as a fraction of each numeric
+                gene's range; genes are snapped to that grid before rounding
+                to their declared precision
+        """
         for i, param in enumerate(parameters):
             if i >= len(self.genes):
                 break
             param_type = param['type']
+            if resolution and param_type in ('Int', 'Decimal'):
+                self.genes[i] = snap_to_grid(self.genes[i], param, resolution)
             if param_type == 'Int':
                 if param.get('name') == 'max_open_trades':
                     min_value = max(1, int(param['start']))
@@ -58,9 +105,10 @@ class Individual:
                 self.genes[i] = round(max(param['start'], min(param['end'], self.genes[i])), param['decimal_places'])
 
 
-    def after_genetic_operation(self, parameters: List[Dict[str, Any]]) -> None:
+    def after_genetic_operation(self, parameters: List[Dict[str, Any]],
+                                resolution: Optional[float] = None) -> None:
         """Apply constraints after crossover or mutation operations."""
-        self.constrain_genes(parameters)
+        self.constrain_genes(parameters, resolution)
 
     def copy(self) -> 'Individual':
         """Create a deep copy of this individual."""
@@ -1,12 +1,13 @@
 """Genetic algorithm operators for crossover, mutation, and selection."""
 import random
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
-from genetic_algorithm.individual import Individual
+from genetic_algorithm.individual import Individual, grid_step, snap_to_grid
 
 
 def crossover(parent1: Individual, parent2: Individual,
-              with_pair: bool = True) -> Tuple[Individual, Individual]:
+              with_pair: bool = True,
+              rng: Optional[random.Random] = None) -> Tuple[Individual, Individual]:
     """
     Perform single-point crossover between two parents.
 
@@ -14,23 +15,27 @@ def crossover(parent1: Individual, parent2: Individual,
         parent1: First parent individual
         parent2: Second parent individual
         with_pair: Whether to also crossover trading pairs
+        rng: Random generator to draw from (default: the ``random`` module)
 
     Returns:
         Tuple of two child individuals
     """
+    rng = rng or random
     if len(parent1.genes) < 2:
         # Can't crossover with less than 2 genes
         return parent1.copy(), parent2.copy()
 
     # Crossover genes at random point
-    point = random.randint(1, len(parent1.genes) - 1)
+    point = rng.randint(1, len(parent1.genes) - 1)
     child1_genes = parent1.genes[:point] + parent2.genes[point:]
     child2_genes = parent2.genes[:point] + parent1.genes[point:]
 
     # Crossover trading pairs
     if with_pair and parent1.trading_pairs and parent2.trading_pairs:
-        all_pairs = list(set(parent1.trading_pairs + parent2.trading_pairs))
-        random.shuffle(all_pairs)
+        # Order-preserving de-duplication: set order follows the string hash
+        # seed, which would make seeded runs differ between processes.
+        all_pairs = list(dict.fromkeys(parent1.trading_pairs + parent2.trading_pairs))
+        rng.shuffle(all_pairs)
 
         child1_pairs = all_pairs[:len(parent1.trading_pairs)]
         child2_pairs = all_pairs[:len(parent2.trading_pairs)]
@@ -46,7 +51,9 @@ def crossover(parent1: Individual, parent2: Individual,
     )
 
 
-def mutate(individual: Individual, mutation_rate: float) -> None:
+def mutate(individual: Individual, mutation_rate: float,
+           resolution: Optional[float] = None,
+           rng: Optional[random.Random] = None) -> None:
     """
     Apply mutation to an individual's genes.
 
@@ -58,25 +65,32 @@ def mutate(individual: Individual, mutation_rate: float) -> None:
     Args:
         individual: Individual to mutate (modified in place)
         mutation_rate: Probability of mutating each gene
+        resolution: Optional grid spacing (fraction of range) that numeric
+            genes are snapped to; a mutated gene always moves at least one
+            grid step
+        rng: Random generator to draw from (default: the ``random`` module)
     """
+    rng = rng or random
     for i in range(len(individual.genes)):
-        if random.random() >= mutation_rate:
+        if rng.random() >= mutation_rate:
             continue
 
         param_type = individual.param_types[i]
 
         # Handle dictionary-style parameter types
         if isinstance(param_type, dict) and 'type' in param_type:
-            _mutate_typed_gene(individual, i, param_type)
+            _mutate_typed_gene(individual, i, param_type, resolution, rng)
         # Handle boolean genes
         elif isinstance(individual.genes[i], bool):
             individual.genes[i] = not individual.genes[i]
         # Handle categorical/list genes
         elif isinstance(param_type, dict) and 'options' in param_type:
-            individual.genes[i] = random.choice(param_type['options'])
+            individual.genes[i] = rng.choice(param_type['options'])
 
 
-def _mutate_typed_gene(individual: Individual, index: int, param_type: Dict[str, Any]) -> None:
+def _mutate_typed_gene(individual: Individual, index: int, param_type: Dict[str, Any],
+                       resolution: Optional[float] = None,
+                       rng: Optional[random.Random] = None) -> None:
     """
     Apply mutation to a typed gene (Int, Decimal, Boolean, Categorical).
 
@@ -84,7 +98,10 @@ def _mutate_typed_gene(individual: Individual, index: int, param_type: Dict[str,
         individual: Individual being mutated
         index: Index of the gene to mutate
         param_type: Parameter type definition
+        resolution: Optional grid spacing as a fraction of the gene's range
+        rng: Random generator to draw from (default: the ``random`` module)
     """
+    rng = rng or random
     gene_type = param_type['type']
 
     if gene_type == 'Boolean':
@@ -94,40 +111,53 @@ def _mutate_typed_gene(individual: Individual, index: int, param_type: Dict[str,
     if gene_type == 'Categorical':
         options = param_type.get('options', [])
         if options:
-            individual.genes[index] = random.choice(options)
+            individual.genes[index] = rng.choice(options)
         return
 
     # Numeric types: Int or Decimal
     if gene_type not in ('Int', 'Decimal'):
         return
 
-    mutation_strategy = random.choice(['noise', 'reset', 'scale'])
+    mutation_strategy = rng.choice(['noise', 'reset', 'scale'])
     start = param_type.get('start', 0)
     end = param_type.get('end', 100)
     decimal_places = param_type.get('decimal_places', 2)
 
+    step = grid_step(param_type, resolution)
+
     if mutation_strategy == 'noise':
         # Add Gaussian noise
         noise_scale = (end - start) * 0.1
-        noise = random.gauss(0, noise_scale)
+        noise = rng.gauss(0, noise_scale)
         new_value = individual.genes[index] + noise
 
     elif mutation_strategy == 'reset':
         # Reset to random value
         if gene_type == 'Int':
-            individual.genes[index] = random.randint(int(start), int(end))
-            return
+            new_value = rng.randint(int(start), int(end))
         else:
-            new_value = random.uniform(start, end)
+            new_value = rng.uniform(start, end)
 
     else:  # scale
         # Scale by random factor
-        scale_factor = random.uniform(0.8, 1.2)
+        scale_factor = rng.uniform(0.8, 1.2)
         new_value = individual.genes[index] * scale_factor
 
     # Clamp to valid range
     new_value = max(start, min(end, new_value))
 
+    if step is not None:
+        old_value = snap_to_grid(individual.genes[index], param_type, resolution)
+        new_value = snap_to_grid(new_value, param_type, resolution)
+        # On a coarse grid small moves round back to the same point; step
+        # to a neighbour instead so the mutation is not a silent no-op.
+        if new_value == old_value:
+            direction = rng.choice([-1, 1])
+            if not start <= new_value + direction * step <= end:
+                direction = -direction
+            if start <= new_value + direction * step <= end:
+                new_value += direction * step
+
     # Apply type-specific formatting
     if gene_type == 'Int':
         individual.genes[index] = int(round(new_value))
@@ -135,13 +165,15 @@ def _mutate_typed_gene(individual: Individual, index: int, param_type: Dict[str,
         individual.genes[index] = round(new_value, decimal_places)
 
 
-def select_tournament(population: List[Individual], tournament_size: int) -> Individual:
+def select_tournament(population: List[Individual], tournament_size: int,
+                      rng: Optional[random.Random] = None) -> Individual:
     """
     Select an individual using tournament selection.
 
     Args:
         population: List of individuals to select from
         tournament_size: Number of individuals in tournament
+        rng: Random generator to draw from (default: the ``random`` module)
 
     Returns:
         Individual with highest fitness from tournament
@@ -153,7 +185,7 @@ def select_tournament(population: List[Individual], tournament_size: int) -> Ind
         raise ValueError("Cannot select from empty population")
 
     tournament_size = min(tournament_size, len(population))
-    tournament = random.sample(population, tournament_size)
+    tournament = (rng or random).sample(population, tournament_size)
 
     return max(tournament, key=lambda ind: ind.fitness if ind.fitness is not None else float('-inf'))
 
@@ -204,7 +236,8 @@ def calculate_genetic_distance(ind1: Individual, ind2: Individual) -> float:
     return total_distance / num_genes
 
 
-def calculate_population_diversity(population: List[Individual]) -> float:
+def calculate_population_diversity(population: List[Individual],
+                                   rng: Optional[random.Random] = None) -> float:
     """
     Calculate average diversity of a population.
 
@@ -212,6 +245,7 @@ def calculate_population_diversity(population: List[Individual]) -> float:
 
     Args:
         population: List of individuals
+        rng: Random generator for sampling (default: the ``random`` module)
 
     Returns:
         Average pairwise genetic distance (0 to 1)
@@ -224,7 +258,7 @@ def calculate_population_diversity(population: List[Individual]) -> float:
 
     # Sample pairs for efficiency if population is large
     sample_size = min(len(population), 20)
-    sample = random.sample(population, sample_size)
+    sample = (rng or random).sample(population, sample_size)
 
     for i in range(len(sample)):
         for j in range(i + 1, len(sample)):
@@ -238,7 +272,8 @@ def select_with_diversity(
     population: List[Individual],
     tournament_size: int,
     diversity_weight: float = 0.3,
-    reference_individual: Individual = None
+    reference_individual: Individual = None,
+    rng: Optional[random.Random] = None
 ) -> Individual:
     """
     Select individual considering both fitness and diversity.
@@ -252,6 +287,7 @@ def select_with_diversity(
         tournament_size: Number of individuals in tournament
         diversity_weight: Weight for diversity (0 to 1, default 0.3)
         reference_individual: Individual to measure diversity against
+        rng: Random generator to draw from (default: the ``random`` module)
 
     Returns:
         Selected individual balancing fitness and diversity
@@ -260,7 +296,7 @@ def select_with_diversity(
         raise ValueError("Cannot select from empty population")
 
     tournament_size = min(tournament_size, len(population))
-    tournament = random.sample(population, tournament_size)
+    tournament = (rng or random).sample(population, tournament_size)
 
     def combined_score(ind: Individual) -> float:
         fitness = ind.fitness if ind.fitness is not None else float('-inf')
@@ -292,7 +328,9 @@ def select_with_diversity(
 def maintain_diversity(
     population: List[Individual],
     min_diversity: float = 0.1,
-    mutation_boost: float = 0.3
+    mutation_boost: float = 0.3,
+    resolution: Optional[float] = None,
+    rng: Optional[random.Random] = None
 ) -> int:
     """
     Maintain population diversity by mutating similar individuals.
@@ -304,11 +342,13 @@ def maintain_diversity(
         population: List of individuals (modified in place)
         min_diversity: Minimum diversity threshold
         mutation_boost: Additional mutation rate for similar individuals
+        resolution: Optional grid spacing passed on to ``mutate``
+        rng: Random generator to draw from (default: the ``random`` module)
 
     Returns:
         Number of individuals that were mutated
     """
-    current_diversity = calculate_population_diversity(population)
+    current_diversity = calculate_population_diversity(population, rng)
 
     if current_diversity >= min_diversity:
         return 0
@@ -328,7 +368,7 @@ def maintain_diversity(
                      population[j].fitness > population[i].fitness)
                 ) else j
 
-                mutate(population[target_idx], mutation_boost)
+                mutate(population[target_idx], mutation_boost, resolution, rng)
                 mutations_applied += 1
 
                 # Limit mutations per pass
@@ -1,4 +1,5 @@
 """Population management for genetic algorithm."""
+import random
 from typing import List, Dict, Optional
 from genetic_algorithm.individual import Individual
 
@@ -16,7 +17,7 @@ class Population:
 
     @classmethod
     def create_random(cls, size: int, parameters: Dict, trading_pairs: List[str],
-                      num_pairs: Optional[int]) -> 'Population':
+                      num_pairs: Optional[int], rng: Optional[random.Random] = None) -> 'Population':
         """Create a population of random individuals.
 
         Args:
@@ -24,11 +25,13 @@ class Population:
             parameters: Parameter definitions for individuals
             trading_pairs: Available trading pairs
             num_pairs: Number of pairs per individual (None for all pairs)
+            rng: Random generator to draw from (default: the ``random`` module)
 
         Returns:
             New Population instance with random individuals
         """
-        return cls([Individual.create_random(parameters, trading_pairs, num_pairs) for _ in range(size)])
+        return cls([Individual.create_random(parameters, trading_pairs, num_pairs, rng)
+                    for _ in range(size)])
 
     def get_best(self) -> Individual:
         """Get the individual with the highest fitness.
@@ -0,0 +1,118 @@
+"""Coarse-to-fine resolution schedule for numeric genes.
+
+Decimal genes carry full ``decimal_places`` precision from the first
+generation. Early on, the search cannot yet tell 0.0281 from 0.0284, so
+backtests spent on that distinction are wasted, and near-identical genomes
+rarely repeat exactly, which defeats caching. The schedule snaps numeric genes
+to a grid that is a fraction of each gene's range, starting at
+``resolution_initial``. Each refinement divides the grid by
+``resolution_factor``. The grid is refined when the best fitness has not
+improved for ``patience`` generations, meaning the search has converged at
+the current grid. It is also refined at least steadily enough to reach
+declared precision by ``full_precision_at``.
+"""
+import math
+from typing import Any, Dict, Optional
+
+# Below this fraction of a range the grid is finer than any sensible
+# declared precision, so the schedule hands over to plain rounding.
+MIN_RESOLUTION = 1e-3
+
+
+class ResolutionSchedule:
+    """Grid spacing for numeric genes that refines as the search converges."""
+
+    def __init__(
+        self,
+        initial: float,
+        factor: float = 2.0,
+        patience: int = 2,
+        full_precision_at: Optional[int] = None,
+        min_improvement: float = 1e-4
+    ):
+        """
+        Args:
+            initial: Starting grid spacing as a fraction of each gene's range
+            factor: Divisor applied to the spacing on each refinement
+            patience: Generations without improvement before refining
+            full_precision_at: Generation by which declared precision is
+                reached regardless of progress (None: only on convergence)
+            min_improvement: Fitness gain that counts as progress
+
+        Raises:
+            ValueError: If factor does not shrink the grid (factor <= 1)
+        """
+        if factor <= 1:
+            raise ValueError(f"Resolution factor must be greater than 1, got {factor}")
+        self.initial = initial
+        self.factor = factor
+        self.patience = patience
+        self.full_precision_at = full_precision_at
+        self.min_improvement = min_improvement
+        self.stages = max(1, math.ceil(math.log(initial / MIN_RESOLUTION) / math.log(factor)))
+        self.stage = 0
+        self.best_fitness: Optional[float] = None
+        self.stalled_generations = 0
+
+    @property
+    def resolution(self) -> Optional[float]:
+        """Current grid spacing, or None once declared precision is in force."""
+        if self.stage >= self.stages:
+            return None
+        return self.initial / self.factor ** self.stage
+
+    def describe(self) -> str:
+        resolution = self.resolution
+        if resolution is None:
+            return "declared precision"
+        return f"{resolution:.2%} of range (stage {self.stage + 1}/{self.stages})"
+
+    def update(self, generation: int, best_fitness: float) -> Optional[float]:
+        """Record a finished generation and return the spacing for the next one.
+
+        Args:
+            generation: Number of generations completed so far
+            best_fitness: Best fitness found so far
+        """
+        if self.best_fitness is None or best_fitness > self.best_fitness + self.min_improvement:
+            self.best_fitness = best_fitness
+            self.stalled_generations = 0
+        else:
+            self.stalled_generations += 1
+
+        if self.stalled_generations >= self.patience:
+            self.stage += 1
+            self.stalled_generations = 0
+
+        if self.full_precision_at:
+            due = math.floor(self.stages * generation / self.full_precision_at)
+            self.stage = max(self.stage, due)
+        self.stage = min(self.stage, self.stages)
+        return self.resolution
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'stage': self.stage,
+            'best_fitness': self.best_fitness,
+            'stalled_generations': self.stalled_generations,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.stage = state.get('stage', 0)
+        self.best_fitness = state.get('best_fitness')
+        self.stalled_generations = state.get('stalled_generations', 0)
+
+
+def create_resolution_schedule_from_settings(settings: Any) -> Optional[ResolutionSchedule]:
+    """Create the schedule from the resolution_* settings, or None when disabled."""
+    initial = getattr(settings, 'resolution_initial', 0.0)
+    if not initial:
+        return None
+    full_precision_fraction = getattr(settings, 'resolution_full_precision_at', 0.5)
+    return ResolutionSchedule(
+        initial=initial,
+        factor=getattr(settings, 'resolution_factor', 2.0),
+        patience=getattr(settings, 'resolution_patience', 2),
+        full_precision_at=(max(1, round(settings.generations * full_precision_fraction))
+                           if full_precision_fraction else None),
+    )
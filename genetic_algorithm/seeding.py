@@ -0,0 +1,202 @@
+"""Seed a new run with winners from earlier runs.
+
+Each run saves its winners to ``best_generations_dir``, and the daily
+workflow copies the deployed strategy to ``daily_results/<date>/<gen>/``.
+Starting every run from random genomes throws that away and spends the
+first generations finding the same region again. This module loads prior
+winners from any of these sources:
+
+  * ``best_individual_gen*.json`` and ``finalists*.json`` written by main.py
+  * rendered strategy files (``*.py``), whose parameter defaults are the
+    genes, with pairs taken from a ``config.json`` next to them
+
+Genes are then mapped onto the current parameter schema. They are matched by
+name when the source records names, and by position when it does not. Values
+outside a changed range are clipped, unknown categorical values and missing
+genes fall back to the parameter default, and a seed that matches less than
+half of the current parameters is dropped as belonging to another strategy.
+"""
+import glob
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+from genetic_algorithm.individual import Individual
+from genetic_algorithm.hall_of_fame import genome_key
+from strategy.gen_template import parse_parameters
+from utils.logging_config import logger
+
+SEED_FILE_PATTERNS = ('best_individual_gen*.json', 'finalists*.json', '*.py')
+
+
+def _records_from_json(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    entries = data if isinstance(data, list) else [data]
+    records = []
+    for entry in entries:
+        genes = entry.get('genes')
+        if not isinstance(genes, list):
+            continue
+        names = entry.get('param_names')
+        records.append({
+            'genes': dict(zip(names, genes)) if names else genes,
+            'trading_pairs': entry.get('trading_pairs') or [],
+            'fitness': entry.get('fitness'),
+            'source': path,
+        })
+    return records
+
+
+def _records_from_strategy(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        parameters = parse_parameters(f.read())
+    genes = {p['name']: p.get('default') for p in parameters if p.get('optimize')}
+    if not genes:
+        return []
+
+    trading_pairs = []
+    config_path = os.path.join(os.path.dirname(path), 'config.json')
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r') as f:
+                trading_pairs = json.load(f)['exchange']['pair_whitelist']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read pairs from {config_path}: {e}")
+    return [{'genes': genes, 'trading_pairs': trading_pairs, 'fitness': None, 'source': path}]
+
+
+def find_seed_files(paths: List[str]) -> List[str]:
+    """Expand files and directories (searched recursively) into seed files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in SEED_FILE_PATTERNS:
+                files.extend(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            logger.warning(f"Seed path not found: {path}")
+    return sorted(set(files))
+
+
+def load_seed_records(paths: List[str]) -> List[Dict[str, Any]]:
+    """Read raw seed records (genes, trading_pairs, fitness, source) from ``paths``."""
+    records = []
+    for path in find_seed_files(paths):
+        try:
+            if path.endswith('.json'):
+                records.extend(_records_from_json(path))
+            elif path.endswith('.py'):
+                records.extend(_records_from_strategy(path))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable seed file {path}: {e}")
+    return records
+
+
+def _repair_gene(value: Any, param: Dict[str, Any]) -> Any:
+    """Coerce a seed value into ``param``'s current domain, or return its default."""
+    param_type = param['type']
+    if param_type in ('Int', 'Decimal'):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return param.get('default', param['start'])
+        # Range clipping and Int/decimal rounding happen in constrain_genes.
+        return value
+    if param_type == 'Boolean':
+        return value if isinstance(value, bool) else bool(param.get('default', False))
+    if param_type == 'Categorical':
+        options = param.get('options', [])
+        if value in options:
+            return value
+        return param.get('default') if param.get('default') in options else options[0]
+    return value
+
+
+def repair_genes(genes: Any, parameters: List[Dict[str, Any]]) -> Optional[List[Any]]:
+    """
+    Map seed genes onto the current parameter schema.
+
+    Args:
+        genes: Dict of name -> value, or a positional list
+        parameters: Current parameter definitions
+
+    Returns:
+        Gene list in parameter order, or None if fewer than half of the
+        parameters could be taken from the seed
+    """
+    if isinstance(genes, dict):
+        values = [genes.get(param['name']) for param in parameters]
+        matched = sum(param['name'] in genes for param in parameters)
+    elif len(genes) == len(parameters):
+        values, matched = list(genes), len(genes)
+    else:
+        return None
+    if matched * 2 < len(parameters):
+        return None
+
+    repaired = [
+        _repair_gene(value, param) if value is not None else param.get('default', param.get('start'))
+        for value, param in zip(values, parameters)
+    ]
+    probe = Individual(repaired, [], parameters)
+    probe.constrain_genes(parameters)
+    return probe.genes
+
+
+def _repair_pairs(trading_pairs: List[str], all_pairs: List[str],
+                  num_pairs: Optional[int]) -> List[str]:
+    """Keep seed pairs that are still available and top up to ``num_pairs``."""
+    if num_pairs is None:
+        return list(all_pairs)
+    available = set(all_pairs)
+    kept = [pair for pair in dict.fromkeys(trading_pairs) if pair in available][:num_pairs]
+    spare = [pair for pair in all_pairs if pair not in kept]
+    kept.extend(random.sample(spare, min(num_pairs - len(kept), len(spare))))
+    return kept
+
+
+def load_seed_individuals(
+    paths: List[str],
+    parameters: List[Dict[str, Any]],
+    all_pairs: List[str],
+    num_pairs: Optional[int],
+    limit: int
+) -> List[Individual]:
+    """
+    Load up to ``limit`` distinct prior winners as unevaluated individuals.
+
+    Records with a recorded fitness come first, best first. Seeds are always
+    re-evaluated, because their fitness was measured on another window.
+
+    Args:
+        paths: Seed files or directories
+        parameters: Current parameter definitions
+        all_pairs: Currently available trading pairs
+        num_pairs: Pairs per individual, or None when pairs are fixed
+        limit: Maximum number of individuals to return
+    """
+    records = load_seed_records(paths)
+    records.sort(key=lambda r: r['fitness'] if isinstance(r['fitness'], (int, float)) else float('-inf'),
+                 reverse=True)
+
+    seeds, keys, dropped = [], set(), 0
+    for record in records:
+        if len(seeds) >= limit:
+            break
+        genes = repair_genes(record['genes'], parameters)
+        if genes is None:
+            dropped += 1
+            continue
+        ind = Individual(genes, _repair_pairs(record['trading_pairs'], all_pairs, num_pairs), parameters)
+        key = genome_key(ind)
+        if key in keys:
+            continue
+        keys.add(key)
+        seeds.append(ind)
+
+    logger.info(
+        f"Loaded {len(seeds)} seed individuals from {len(records)} records"
+        + (f" ({dropped} dropped: schema mismatch)" if dropped else "")
+    )
+    return seeds
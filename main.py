@@ -10,15 +10,20 @@ from config.config import LOG_CONFIG
 from utils.logging_config import logger
 from utils.file_operations import create_directories
 from genetic_algorithm.individual import Individual
+from genetic_algorithm.seeding import load_seed_individuals
 from data.downloader import download_data
 from strategy.gen_template import generate_dynamic_template
 from optimization.genetic_optimizer import GeneticOptimizer
+from optimization.nsga2_optimizer import NSGA2Optimizer
+from optimization.de_optimizer import DEOptimizer
 
 try:
     from optimization.optuna_optimizer import OptunaOptimizer
+    from optimization.hybrid_optimizer import HybridOptimizer
     OPTUNA_AVAILABLE = True
 except ImportError:
     OptunaOptimizer = None
+    HybridOptimizer = None
     OPTUNA_AVAILABLE = False
 
 
@@ -37,9 +42,9 @@ def run_optimization(settings: Settings, optimizer_type: str = 'genetic',
 
     Args:
         settings: Settings object containing optimization configuration
-        optimizer_type: Type of optimizer to use ('genetic' or 'optuna')
+        optimizer_type: Type of optimizer to use ('genetic', 'optuna', 'nsga2', 'de' or 'hybrid')
         initial_individuals: Optional list of initial individuals
-        resume: Resume the genetic optimizer from its latest checkpoint
+        resume: Resume the genetic or DE optimizer from its latest checkpoint
 
     Returns:
         List of (generation/trial, best_individual) tuples
@@ -53,10 +58,39 @@ def run_optimization(settings: Settings, optimizer_type: str = 'genetic',
             optimizer_type = 'genetic'
         else:
             logger.info("Using Optuna optimizer")
-            if resume:
-                logger.warning("--resume is not supported by the Optuna optimizer; starting fresh")
             optimizer = OptunaOptimizer(settings, settings.parameters, all_pairs)
-            return optimizer.optimize(initial_individuals)
+            return optimizer.optimize(initial_individuals, resume=resume)
+
+    if optimizer_type == 'hybrid':
+        if not OPTUNA_AVAILABLE:
+            logger.warning("Optuna not installed. Falling back to genetic algorithm. "
+                          "Install optuna with: pip install optuna")
+            optimizer_type = 'genetic'
+        else:
+            logger.info("Using hybrid GA + Optuna optimizer")
+            if resume:
+                logger.warning("--resume is not supported by the hybrid optimizer; starting fresh")
+            optimizer = HybridOptimizer(settings, settings.parameters, all_pairs)
+            best_individuals = optimizer.optimize(initial_individuals)
+            save_finalists(optimizer.get_finalists(), settings)
+            return best_individuals
+
+    if optimizer_type == 'nsga2':
+        logger.info("Using NSGA-II multi-objective optimizer")
+        if resume:
+            logger.warning("--resume is not supported by the NSGA-II optimizer; starting fresh")
+        optimizer = NSGA2Optimizer(settings, settings.parameters, all_pairs)
+        best_individuals = optimizer.optimize(initial_individuals)
+        save_pareto_front(optimizer.get_pareto_front(), optimizer.objective_specs, settings)
+        return best_individuals
+
+    if optimizer_type == 'de':
+        logger.info(f"Using differential evolution optimizer ({getattr(settings, 'de_strategy', 'rand1bin')})")
+        optimizer = DEOptimizer(settings, settings.parameters, all_pairs)
+        best_individuals = optimizer.optimize(initial_individuals, resume=resume)
+        if not optimizer.stopped_on_budget:
+            optimizer.clear_checkpoint()
+        return best_individuals
 
     logger.info("Using Genetic Algorithm optimizer")
     optimizer = GeneticOptimizer(settings, settings.parameters, all_pairs)
@@ -70,20 +104,39 @@ def run_optimization(settings: Settings, optimizer_type: str = 'genetic',
                 f"{validation.get('composite_fitness', float('nan')):.4f} "
                 f"over {validation.get('num_folds', 0)} folds"
             )
+            for fold in validation.get('fold_results', []):
+                save_finalists(fold.get('finalists', []), settings,
+                               f"finalists_fold{fold['fold']}.json")
         return best_individuals
 
     best_individuals = optimizer.optimize(initial_individuals, resume=resume)
-    # A completed run invalidates the checkpoint; keep it only for crashes.
-    optimizer.clear_checkpoint()
+    save_finalists(optimizer.get_finalists(), settings)
+    # A completed run invalidates the checkpoint; keep it for crashes, for
+    # runs cut short by their budget, which --resume can continue, and for
+    # runs that stopped early, so --resume sees they already converged.
+    if not optimizer.stop_reason:
+        optimizer.clear_checkpoint()
     return best_individuals
 
 
+def load_initial_individuals(settings: Settings, seed_paths: List[str]) -> List[Individual]:
+    """Load prior winners to seed up to seed_fraction of the first population."""
+    all_pairs = load_trading_pairs(settings.config_file)
+    limit = int(settings.population_size * getattr(settings, 'seed_fraction', 0.25))
+    return load_seed_individuals(
+        seed_paths, settings.parameters, all_pairs,
+        num_pairs=None if settings.fix_pairs else settings.num_pairs,
+        limit=limit
+    )
+
+
 def save_best_individual(individual: Individual, generation: int, settings: Settings):
     filename = f"{settings.best_generations_dir}/best_individual_gen{generation}.json"
     data = {
         'generation': generation,
         'fitness': individual.fitness,
         'genes': individual.genes,
+        'param_names': [param['name'] for param in settings.parameters],
         'trading_pairs': individual.trading_pairs
     }
     with open(filename, 'w') as f:
@@ -91,6 +144,51 @@ def save_best_individual(individual: Individual, generation: int, settings: Sett
     logger.info(f"Saved best individual from generation {generation} to {filename}")
 
 
+def save_finalists(individuals: List[Individual], settings: Settings,
+                   filename: str = 'finalists.json') -> None:
+    """Save the hall of fame so later validation stages can test several finalists."""
+    if not individuals:
+        return
+    path = os.path.join(settings.best_generations_dir, filename)
+    data = [
+        {
+            'rank': rank,
+            'fitness': ind.fitness,
+            'genes': ind.genes,
+            'param_names': [param['name'] for param in settings.parameters],
+            'trading_pairs': ind.trading_pairs
+        }
+        for rank, ind in enumerate(individuals, start=1)
+    ]
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Saved {len(data)} finalists to {path}")
+
+
+def save_pareto_front(individuals: List[Individual], objectives: List[str], settings: Settings,
+                      filename: str = 'pareto_front.json') -> None:
+    """Save the Pareto front with its metrics so an operating point can be picked later."""
+    if not individuals:
+        logger.warning("NSGA-II found no feasible individuals; no Pareto front saved")
+        return
+    path = os.path.join(settings.best_generations_dir, filename)
+    data = {
+        'objectives': objectives,
+        'front': [
+            {
+                'fitness': ind.fitness,
+                'metrics': ind.metrics,
+                'genes': ind.genes,
+                'trading_pairs': ind.trading_pairs
+            }
+            for ind in sorted(individuals, key=lambda ind: ind.fitness, reverse=True)
+        ]
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Saved Pareto front of {len(individuals)} individuals to {path}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run optimization for trading strategy')
     parser.add_argument('--config', type=str, default='ga.json', help='Path to the configuration file')
@@ -98,8 +196,16 @@ def main():
     parser.add_argument('--start-date', type=str, default='20240101', help='Start date for data download (YYYYMMDD)')
     parser.add_argument('--end-date', type=str, default=date.today().strftime('%Y%m%d'), help='End date for data download (YYYYMMDD)')
     parser.add_argument('--resume', action='store_true', help='Resume from the latest checkpoint')
-    parser.add_argument('--optimizer', type=str, default='genetic', choices=['genetic', 'optuna'],
-                        help='Optimizer to use: genetic (default) or optuna')
+    parser.add_argument('--optimizer', type=str, default='genetic', choices=['genetic', 'optuna', 'nsga2', 'de', 'hybrid'],
+                        help='Optimizer to use: genetic (default), optuna, nsga2 (multi-objective), '
+                             'de (differential evolution / CMA-ES) or hybrid (GA, then Optuna)')
+    parser.add_argument('--seed-from', type=str, nargs='+', default=None, metavar='PATH',
+                        help='Seed the initial population from earlier winners: best_individual_gen*.json, '
+                             'finalists*.json, strategy .py files, or directories containing them')
+    parser.add_argument('--max-evaluations', type=int, default=None, metavar='N',
+                        help='Stop after N backtests (overrides max_evaluations)')
+    parser.add_argument('--max-runtime', type=float, default=None, metavar='MINUTES',
+                        help='Stop before MINUTES of wall-clock time are up (overrides max_runtime_minutes)')
     args = parser.parse_args()
 
     # Worker processes and lazily-imported modules read the global settings
@@ -110,6 +216,10 @@ def main():
     try:
         # Initialize settings
         settings = Settings(args.config)
+        if args.max_evaluations is not None:
+            settings.max_evaluations = args.max_evaluations
+        if args.max_runtime is not None:
+            settings.max_runtime_minutes = args.max_runtime
 
         # Generate dynamic template and get parameters
         _, parameters = generate_dynamic_template(settings.base_strategy_file)
@@ -134,9 +244,14 @@ def main():
         if hasattr(settings, 'optimizer_type') and args.optimizer == 'genetic':
             optimizer_type = settings.optimizer_type
 
+        initial_individuals = None
+        if args.seed_from:
+            initial_individuals = load_initial_individuals(settings, args.seed_from)
+
         # Run optimization
         logger.info(f"Starting optimization with {optimizer_type} optimizer")
-        best_individuals = run_optimization(settings, optimizer_type, resume=args.resume)
+        best_individuals = run_optimization(settings, optimizer_type, initial_individuals,
+                                            resume=args.resume)
 
         # Save best individuals
         for gen, ind in best_individuals:
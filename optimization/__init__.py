@@ -1,10 +1,15 @@
 from optimization.base_optimizer import BaseOptimizer
 from optimization.genetic_optimizer import GeneticOptimizer
+from optimization.nsga2_optimizer import NSGA2Optimizer
+from optimization.de_optimizer import DEOptimizer
 
-# OptunaOptimizer is optional - only import if optuna is installed
+# OptunaOptimizer and HybridOptimizer are optional - only import if optuna is installed
 try:
     from optimization.optuna_optimizer import OptunaOptimizer
-    __all__ = ['BaseOptimizer', 'OptunaOptimizer', 'GeneticOptimizer']
+    from optimization.hybrid_optimizer import HybridOptimizer
+    __all__ = ['BaseOptimizer', 'OptunaOptimizer', 'HybridOptimizer', 'GeneticOptimizer',
+               'NSGA2Optimizer', 'DEOptimizer']
 except ImportError:
     OptunaOptimizer = None
-    __all__ = ['BaseOptimizer', 'GeneticOptimizer']
+    HybridOptimizer = None
+    __all__ = ['BaseOptimizer', 'GeneticOptimizer', 'NSGA2Optimizer', 'DEOptimizer']
@@ -0,0 +1,131 @@
+"""Evaluation and wall-clock budget for an optimization run.
+
+``population_size x generations`` fixes how many backtests a run makes, but
+not how long it takes: a slow day's backtests can push a scheduled run past
+its deadline. A budget caps the run at ``max_evaluations`` backtests and/or
+``max_runtime_minutes`` of wall-clock time, whichever comes first. The
+optimizer asks for an allowance before each batch of backtests. The last
+batch is shrunk to what still fits, using the observed time per backtest,
+and the run then stops cleanly with a checkpoint instead of being killed
+mid-generation.
+
+The evaluation count is carried over in checkpoints. The runtime limit
+applies to each invocation, so a resumed run gets its own deadline.
+Walk-forward folds share one budget, including folds trained concurrently:
+each batch reserves its backtests before running so that two folds cannot
+both take the last ones.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class Budget:
+    """Track backtests and wall-clock time against optional limits."""
+
+    def __init__(
+        self,
+        max_evaluations: Optional[int] = None,
+        max_runtime_minutes: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_evaluations: Backtests allowed in total (None: unlimited)
+            max_runtime_minutes: Wall-clock limit for this invocation (None: unlimited)
+            clock: Time source in seconds, replaceable for tests
+        """
+        self.max_evaluations = max_evaluations
+        self.max_seconds = max_runtime_minutes * 60 if max_runtime_minutes else None
+        self.clock = clock
+        self.started = clock()
+        self.evaluations = 0
+        # Backtests granted by reserve() that have not been recorded yet
+        self.reserved = 0
+        self.timed_evaluations = 0
+        self.evaluation_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_evaluations is not None or self.max_seconds is not None
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    @property
+    def seconds_per_evaluation(self) -> Optional[float]:
+        """Observed wall time per backtest (parallel batches included), if known."""
+        if not self.timed_evaluations:
+            return None
+        return self.evaluation_seconds / self.timed_evaluations
+
+    def record(self, evaluations: int, seconds: Optional[float] = None,
+               reserved: int = 0) -> None:
+        """Count a finished batch of backtests and the wall time it took.
+
+        Args:
+            evaluations: Backtests in the batch
+            seconds: Wall time of the batch, if measured
+            reserved: How many of them were granted by reserve()
+        """
+        with self._lock:
+            self.evaluations += evaluations
+            self.reserved = max(0, self.reserved - reserved)
+            if seconds is not None and evaluations:
+                self.timed_evaluations += evaluations
+                self.evaluation_seconds += seconds
+
+    def allowance(self, requested: int) -> int:
+        """How many of ``requested`` backtests still fit in the budget."""
+        allowed = requested
+        if self.max_evaluations is not None:
+            allowed = min(allowed, max(0, self.max_evaluations - self.evaluations - self.reserved))
+        per_evaluation = self.seconds_per_evaluation
+        if self.max_seconds is not None and per_evaluation:
+            remaining = self.max_seconds - self.elapsed
+            allowed = min(allowed, max(0, int(remaining / per_evaluation)))
+        return allowed
+
+    def reserve(self, requested: int) -> int:
+        """Claim up to ``requested`` backtests; pass the claim to record() when done."""
+        with self._lock:
+            allowed = self.allowance(requested)
+            self.reserved += allowed
+            return allowed
+
+    def exhausted(self) -> Optional[str]:
+        """Reason the budget is used up, or None while another backtest fits."""
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return f"evaluation budget of {self.max_evaluations} backtests used"
+        if self.max_seconds is not None:
+            remaining = self.max_seconds - self.elapsed
+            per_evaluation = self.seconds_per_evaluation or 0.0
+            if remaining <= 0 or remaining < per_evaluation:
+                return f"runtime limit of {self.max_seconds / 60:g} minutes reached"
+        return None
+
+    def describe(self) -> str:
+        parts = [f"{self.evaluations}"
+                 + (f"/{self.max_evaluations}" if self.max_evaluations is not None else "")
+                 + " backtests"]
+        minutes = f"{self.elapsed / 60:.1f}"
+        if self.max_seconds is not None:
+            minutes += f"/{self.max_seconds / 60:g}"
+        parts.append(f"{minutes} min")
+        return ", ".join(parts)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'evaluations': self.evaluations}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.evaluations = state.get('evaluations', 0)
+
+
+def create_budget_from_settings(settings: Any) -> Budget:
+    """Create a Budget from the max_evaluations / max_runtime_minutes settings."""
+    return Budget(
+        max_evaluations=getattr(settings, 'max_evaluations', None),
+        max_runtime_minutes=getattr(settings, 'max_runtime_minutes', None),
+    )
@@ -0,0 +1,207 @@
+"""Versioned, compact GA checkpoints written off the critical path.
+
+Checkpoints used to be a pickle of the optimizer's state. Every
+``Individual`` in it carried its own deep copy of the parameter
+definitions, a file written by one version of the class could fail to load
+after the class changed, and the write ran on the main thread between
+generations. The document format here fixes all three:
+
+  * the parameter schema and the trading-pair table are stored once; each
+    group of individuals is stored as columns: a gene matrix, pair
+    indices and fitness values
+  * the interpreter RNG state is stored explicitly, and the document
+    carries a format version that is checked on load
+  * it is plain JSON, gzip-compressed by default, written by a background
+    thread to a temporary file, fsync'd and renamed into place, so a crash
+    mid-write leaves the previous checkpoint intact
+
+The state is copied on the calling thread, which is cheap. Serialising,
+compressing and writing happen on the writer thread while the next
+generation's backtests run.
+"""
+import gzip
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from genetic_algorithm.individual import Individual
+from utils.logging_config import logger
+
+CHECKPOINT_FORMAT = 'genetrader-ga-checkpoint'
+CHECKPOINT_VERSION = 1
+
+# State keys holding individuals, and how they are nested
+_INDIVIDUAL_LISTS = ('individuals', 'hall_of_fame')
+_INDIVIDUAL_SINGLES = ('overall_best',)
+_GENERATION_PAIRS = ('best_individuals',)
+
+
+def _plain(value: Any) -> Any:
+    """Copy containers and turn tuples and NumPy values into JSON types."""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return value
+
+
+class CheckpointCodec:
+    """Convert optimizer state to a JSON document and back."""
+
+    def __init__(self, parameters: List[Dict[str, Any]]):
+        """
+        Args:
+            parameters: Current parameter definitions; decoded individuals
+                share this list instead of carrying their own copy
+        """
+        self.parameters = parameters
+
+    def encode(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Snapshot ``state`` as a document that no longer shares mutable data with it."""
+        pairs: List[str] = []
+        pair_index: Dict[str, int] = {}
+
+        def columns(individuals: Sequence[Individual]) -> Dict[str, Any]:
+            encoded_pairs = []
+            for ind in individuals:
+                row = []
+                for pair in ind.trading_pairs:
+                    if pair not in pair_index:
+                        pair_index[pair] = len(pairs)
+                        pairs.append(pair)
+                    row.append(pair_index[pair])
+                encoded_pairs.append(row)
+            return {
+                'genes': [_plain(ind.genes) for ind in individuals],
+                'pairs': encoded_pairs,
+                'fitness': [ind.fitness for ind in individuals],
+            }
+
+        encoded: Dict[str, Any] = {}
+        for key, value in state.items():
+            if key in _INDIVIDUAL_LISTS and value is not None:
+                encoded[key] = columns(value)
+            elif key in _INDIVIDUAL_SINGLES and value is not None:
+                encoded[key] = columns([value])
+            elif key in _GENERATION_PAIRS and value is not None:
+                encoded[key] = dict(columns([ind for _, ind in value]),
+                                    generation=[gen for gen, _ in value])
+            else:
+                encoded[key] = _plain(value)
+
+        return {
+            'format': CHECKPOINT_FORMAT,
+            'version': CHECKPOINT_VERSION,
+            'parameters': _plain(self.parameters),
+            'pairs': pairs,
+            'state': encoded,
+        }
+
+    def decode(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild optimizer state from a document.
+
+        Raises:
+            ValueError: If the document is not a GA checkpoint, is from a
+                newer format version, or was written for other parameters
+        """
+        if document.get('format') != CHECKPOINT_FORMAT:
+            raise ValueError("not a GA checkpoint")
+        if document.get('version', 0) > CHECKPOINT_VERSION:
+            raise ValueError(f"checkpoint format version {document['version']} is newer than "
+                             f"this code ({CHECKPOINT_VERSION})")
+        saved = [(p.get('name'), p.get('type')) for p in document.get('parameters', [])]
+        current = [(p.get('name'), p.get('type')) for p in self.parameters]
+        if saved != current:
+            raise ValueError("checkpoint was written for different strategy parameters")
+
+        pairs = document.get('pairs', [])
+
+        def individuals(block: Dict[str, Any]) -> List[Individual]:
+            decoded = []
+            for genes, pair_indices, fitness in zip(block['genes'], block['pairs'], block['fitness']):
+                ind = Individual(list(genes), [pairs[i] for i in pair_indices], self.parameters)
+                ind.fitness = fitness
+                decoded.append(ind)
+            return decoded
+
+        state: Dict[str, Any] = {}
+        for key, value in document['state'].items():
+            if key in _INDIVIDUAL_LISTS and value is not None:
+                state[key] = individuals(value)
+            elif key in _INDIVIDUAL_SINGLES and value is not None:
+                state[key] = individuals(value)[0]
+            elif key in _GENERATION_PAIRS and value is not None:
+                state[key] = list(zip(value['generation'], individuals(value)))
+            else:
+                state[key] = value
+
+        random_state = state.get('random_state')
+        if random_state is not None:
+            version, internal, gauss = random_state
+            state['random_state'] = (version, tuple(internal), gauss)
+        return state
+
+
+def write_document(path: str, document: Dict[str, Any]) -> None:
+    """Write a document atomically; gzip-compressed when ``path`` ends in .gz."""
+    tmp_path = path + '.tmp'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(tmp_path, 'wt') as f:
+        json.dump(document, f, separators=(',', ':'))
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_document(path: str) -> Dict[str, Any]:
+    """Read a document written by ``write_document``."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        return json.load(f)
+
+
+class CheckpointWriter:
+    """Write checkpoints one at a time on a background thread."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='checkpoint')
+        self._pending: Optional[Future] = None
+
+    def submit(self, path: str, document: Dict[str, Any],
+               on_written: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queue a write; ``on_written`` runs after the file is in place.
+
+        The previous write is finished first, so checkpoints land in order.
+        """
+        self.wait()
+        self._pending = self._executor.submit(self._write, path, document, on_written)
+
+    @staticmethod
+    def _write(path: str, document: Dict[str, Any],
+               on_written: Optional[Callable[[], None]]) -> None:
+        try:
+            write_document(path, document)
+        except Exception as e:
+            logger.error(f"Failed to write checkpoint {path}: {e}")
+            return
+        next_generation = document['state'].get('next_generation', 0)
+        logger.info(f"Checkpoint saved: {path} (next generation: {next_generation + 1})")
+        if on_written is not None:
+            on_written()
+
+    def wait(self) -> None:
+        """Block until the queued write, if any, has finished."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def close(self) -> None:
+        """Finish the queued write and stop the thread."""
+        self.wait()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,449 @@
+"""Differential evolution and CMA-ES optimizer.
+
+The GA's crossover and mutation are blind to the scale and correlation of
+the parameters, so on smooth, mostly numeric search spaces it spends many
+backtests rediscovering directions it has already seen. This optimizer
+works on the unit-cube encoding from ``genetic_algorithm.encoding`` instead,
+where every gene is a coordinate in [0, 1]:
+
+- ``rand1bin`` / ``best1bin``: classic differential evolution. Each member
+  is challenged by a trial vector built from scaled differences of other
+  members and replaces it only if it scores at least as well.
+- ``cmaes``: a (mu/mu_w, lambda) CMA-ES that adapts a full covariance matrix
+  to the shape of the fitness landscape.
+
+Int genes are rounded, booleans thresholded and categoricals mapped to the
+nearest option when a vector is decoded. When pairs are searched, every pair
+gets a coordinate and the ``num_pairs`` highest are traded. Many nearby
+vectors therefore decode to the same genome; those are scored from a cache
+rather than backtested again.
+"""
+import gc
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from optimization.base_optimizer import BaseOptimizer
+from genetic_algorithm.encoding import encode_genes, encode_pairs, decode_genes, decode_pairs
+from genetic_algorithm.individual import Individual
+from optimization.budget import create_budget_from_settings
+from optimization.checkpoint import CheckpointCodec, CheckpointWriter, read_document
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from strategy.backtest import run_backtest
+from utils.logging_config import logger
+
+
+DE_STRATEGIES = ('rand1bin', 'best1bin', 'cmaes')
+
+
+class CMAES:
+    """Minimal CMA-ES (maximising) on the unit cube, following Hansen's tutorial."""
+
+    def __init__(self, dim: int, population_size: int, sigma: float = 0.3,
+                 mean: Optional[np.ndarray] = None):
+        """
+        Args:
+            dim: Number of coordinates
+            population_size: Candidates sampled per generation (lambda)
+            sigma: Initial step size, as a fraction of the unit range
+            mean: Initial mean (default: centre of the cube)
+        """
+        n = dim
+        self.dim = dim
+        self.population_size = max(2, population_size)
+        self.mu = self.population_size // 2
+        weights = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1.0 / np.sum(self.weights ** 2)
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, np.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.mean = np.full(n, 0.5) if mean is None else np.clip(np.asarray(mean, dtype=float), 0, 1)
+        self.sigma = sigma
+        self.cov = np.eye(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.generation = 0
+
+    def ask(self, rng: np.random.Generator) -> np.ndarray:
+        """Sample ``population_size`` candidates, clipped to the unit cube."""
+        eigenvalues, basis = np.linalg.eigh(self.cov)
+        scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        z = rng.standard_normal((self.population_size, self.dim))
+        return np.clip(self.mean + self.sigma * (z * scales) @ basis.T, 0.0, 1.0)
+
+    def tell(self, candidates: np.ndarray, fitness: np.ndarray) -> None:
+        """Move the distribution toward the best ``mu`` candidates.
+
+        The clipped candidates are used as sampled, which keeps the mean
+        inside the cube.
+        """
+        order = np.argsort(-np.asarray(fitness, dtype=float), kind='stable')[:self.mu]
+        selected = candidates[order]
+        old_mean = self.mean
+        self.mean = self.weights @ selected
+        y_w = (self.mean - old_mean) / self.sigma
+
+        eigenvalues, basis = np.linalg.eigh(self.cov)
+        inv_sqrt = basis @ np.diag(1 / np.sqrt(np.maximum(eigenvalues, 1e-20))) @ basis.T
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt @ y_w
+        self.generation += 1
+        ps_norm = np.linalg.norm(self.ps) / np.sqrt(1 - (1 - self.cs) ** (2 * self.generation))
+        hsig = float(ps_norm / self.chi_n < 1.4 + 2 / (self.dim + 1))
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+
+        steps = (selected - old_mean) / self.sigma
+        self.cov = ((1 - self.c1 - self.cmu) * self.cov
+                    + self.c1 * (np.outer(self.pc, self.pc)
+                                 + (1 - hsig) * self.cc * (2 - self.cc) * self.cov)
+                    + self.cmu * (steps.T * self.weights) @ steps)
+        self.cov = (self.cov + self.cov.T) / 2
+        self.sigma *= np.exp((self.cs / self.damps) * (np.linalg.norm(self.ps) / self.chi_n - 1))
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'mean': self.mean, 'sigma': self.sigma, 'cov': self.cov,
+            'pc': self.pc, 'ps': self.ps, 'generation': self.generation,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.mean = state['mean']
+        self.sigma = state['sigma']
+        self.cov = state['cov']
+        self.pc = state['pc']
+        self.ps = state['ps']
+        self.generation = state['generation']
+
+
+class DEOptimizer(BaseOptimizer):
+    """Differential evolution (or CMA-ES) over the unit-cube gene encoding."""
+
+    def __init__(self, settings: Any, parameters: List[Dict], all_pairs: List[str]):
+        """
+        Initialize the optimizer.
+
+        Args:
+            settings: Settings object containing optimization configuration
+            parameters: List of parameter definitions for optimization
+            all_pairs: List of all available trading pairs
+        """
+        super().__init__(settings, parameters)
+        self.all_pairs = all_pairs
+        self.strategy = getattr(settings, 'de_strategy', 'rand1bin')
+        if self.strategy not in DE_STRATEGIES:
+            raise ValueError(f"Unknown DE strategy {self.strategy!r}; expected one of {DE_STRATEGIES}")
+        if self.strategy != 'cmaes' and settings.population_size < 4:
+            raise ValueError("Differential evolution needs a population of at least 4")
+        self.mutation_factor = getattr(settings, 'de_mutation_factor', 0.5)
+        self.crossover_rate = getattr(settings, 'de_crossover_rate', 0.9)
+        self.cmaes_sigma = getattr(settings, 'cmaes_sigma', 0.3)
+        self.search_pairs = not settings.fix_pairs
+        self.dim = len(parameters) + (len(all_pairs) if self.search_pairs else 0)
+        self.rng = np.random.default_rng(getattr(settings, 'ga_seed', None))
+        self.best_individual: Optional[Individual] = None
+        self.budget = create_budget_from_settings(settings)
+        self.stopped_on_budget = False
+        # Decoded genome -> fitness, so vectors that round to the same genome
+        # are backtested once.
+        self.cache: Dict[Tuple, float] = {}
+        # Background checkpoint writer, created on the first save of a run
+        self._checkpoint_writer: Optional[CheckpointWriter] = None
+
+    def _to_individual(self, vector: np.ndarray) -> Individual:
+        genes = decode_genes(vector[:len(self.parameters)], self.parameters)
+        if self.search_pairs:
+            pairs = decode_pairs(vector[len(self.parameters):], self.all_pairs, self.settings.num_pairs)
+        else:
+            pairs = self.all_pairs.copy()
+        return Individual(genes, pairs, self.parameters)
+
+    @property
+    def backtests(self) -> int:
+        """Backtests run so far (cache hits excluded)."""
+        return self.budget.evaluations
+
+    def _to_vector(self, ind: Individual) -> np.ndarray:
+        vector = encode_genes(ind.genes, self.parameters)
+        if self.search_pairs:
+            vector += encode_pairs(ind.trading_pairs, self.all_pairs)
+        return np.asarray(vector, dtype=float)
+
+    def _initial_vectors(self, initial_individuals: Optional[List[Individual]]) -> np.ndarray:
+        """Uniform random population, with any seed individuals in the first rows."""
+        vectors = self.rng.random((self.settings.population_size, self.dim))
+        seeds = [self._to_vector(ind) for ind in (initial_individuals or [])]
+        for row, vector in enumerate(seeds[:len(vectors)]):
+            vectors[row] = vector
+        return vectors
+
+    def _evaluate(self, vectors: np.ndarray, gen: int, timerange: Optional[str],
+                  evaluator: PoolEvaluator) -> Tuple[List[Individual], np.ndarray]:
+        """
+        Decode ``vectors`` and score them, backtesting only unseen genomes.
+
+        Returns:
+            (decoded individuals with fitness set, fitness array)
+        """
+        individuals = [self._to_individual(vector) for vector in vectors]
+        keys = [(tuple(ind.genes), tuple(ind.trading_pairs)) for ind in individuals]
+        pending = {}
+        for key, ind in zip(keys, individuals):
+            if key not in self.cache and key not in pending:
+                pending[key] = ind
+        allowed = self.budget.allowance(len(pending))
+        if allowed < len(pending):
+            # Genomes past the budget are scored -inf but not cached.
+            logger.info(f"Budget: generation {gen+1} shrunk to {allowed} backtests")
+            pending = dict(list(pending.items())[:allowed])
+
+        eval_args = [
+            (ind.genes, ind.trading_pairs, gen + 1, timerange, len(self.parameters))
+            for ind in pending.values()
+        ]
+        started = self.budget.clock()
+        try:
+            fitnesses = evaluator.map(run_backtest, eval_args)
+        except Exception as e:
+            logger.error(f"Evaluation failed in generation {gen+1}: {type(e).__name__}: {str(e)}")
+            fitnesses = [None] * len(eval_args)
+        for key, fit in zip(pending, fitnesses):
+            self.cache[key] = fit if fit is not None else float('-inf')
+        self.budget.record(len(pending), self.budget.clock() - started)
+
+        for key, ind in zip(keys, individuals):
+            ind.fitness = self.cache.get(key, float('-inf'))
+        logger.info(
+            f"Generation {gen+1}: {len(pending)} backtests, "
+            f"{len(individuals) - len(pending)} scored from cache"
+        )
+        return individuals, np.array([ind.fitness for ind in individuals], dtype=float)
+
+    def _trial_vectors(self, vectors: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """DE mutation (rand/1 or best/1) followed by binomial crossover."""
+        n, dim = vectors.shape
+        others = np.array([
+            self.rng.choice([j for j in range(n) if j != i], size=3, replace=False)
+            for i in range(n)
+        ])
+        if self.strategy == 'best1bin':
+            base = np.broadcast_to(vectors[int(np.argmax(fitness))], vectors.shape)
+        else:
+            base = vectors[others[:, 2]]
+        mutants = base + self.mutation_factor * (vectors[others[:, 0]] - vectors[others[:, 1]])
+
+        cross = self.rng.random((n, dim)) < self.crossover_rate
+        # Every trial takes at least one coordinate from its mutant.
+        cross[np.arange(n), self.rng.integers(0, dim, size=n)] = True
+        return np.clip(np.where(cross, mutants, vectors), 0.0, 1.0)
+
+    def _checkpoint_path(self, checkpoint_name: str) -> str:
+        """Path of the checkpoint file inside the configured checkpoint dir."""
+        suffix = '.json.gz' if getattr(self.settings, 'checkpoint_compress', True) else '.json'
+        return os.path.join(self.settings.checkpoint_dir, f"{checkpoint_name}{suffix}")
+
+    def _legacy_checkpoint_path(self, checkpoint_name: str) -> str:
+        """Pickle checkpoint written before the versioned format."""
+        return os.path.join(self.settings.checkpoint_dir, f"{checkpoint_name}.pkl")
+
+    def _save_checkpoint(self, checkpoint_name: str, state: Dict[str, Any]) -> None:
+        """Persist optimizer state so --resume can continue after a crash.
+
+        Uses the GA's versioned document format; the state is copied here
+        and written by a background thread.
+        """
+        state = dict(state, strategy=self.strategy, population_size=self.settings.population_size,
+                     rng_state=self.rng.bit_generator.state, overall_best=self.best_individual,
+                     cache=[[list(genes), list(pairs), fitness]
+                            for (genes, pairs), fitness in self.cache.items()],
+                     budget=self.budget.get_state())
+        document = CheckpointCodec(self.parameters).encode(state)
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = CheckpointWriter()
+        self._checkpoint_writer.submit(self._checkpoint_path(checkpoint_name), document)
+
+    def _flush_checkpoints(self) -> None:
+        """Wait for queued checkpoint writes and stop the writer thread."""
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.close()
+            self._checkpoint_writer = None
+
+    @staticmethod
+    def _restore_arrays(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the lists a JSON checkpoint holds back into the arrays DE works on."""
+        state['cache'] = {(tuple(genes), tuple(pairs)): fitness
+                          for genes, pairs, fitness in state['cache']}
+        if state.get('vectors') is not None:
+            state['vectors'] = np.asarray(state['vectors'], dtype=float)
+            state['fitness'] = np.asarray(state['fitness'], dtype=float)
+        if state.get('cmaes') is not None:
+            state['cmaes'] = dict(state['cmaes'], **{
+                key: np.asarray(state['cmaes'][key], dtype=float)
+                for key in ('mean', 'cov', 'pc', 'ps')
+            })
+        return state
+
+    def _load_checkpoint(self, checkpoint_name: str) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint if one exists and matches the current run shape."""
+        self._flush_checkpoints()
+        path = self._checkpoint_path(checkpoint_name)
+        legacy_path = self._legacy_checkpoint_path(checkpoint_name)
+        if not os.path.exists(path) and os.path.exists(legacy_path):
+            path = legacy_path
+        if not os.path.exists(path):
+            logger.info(f"No checkpoint found at {path}; starting fresh")
+            return None
+        try:
+            if path == legacy_path:
+                # Pickles from before the versioned format still resume once.
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+            else:
+                state = self._restore_arrays(
+                    CheckpointCodec(self.parameters).decode(read_document(path))
+                )
+        except Exception as e:
+            logger.error(f"Failed to load checkpoint {path}: {e}; starting fresh")
+            return None
+        if (state.get('population_size') != self.settings.population_size
+                or state.get('strategy') != self.strategy):
+            logger.warning("Checkpoint does not match the current DE settings; starting fresh")
+            return None
+        if state.get('next_generation', 0) >= self.settings.generations:
+            logger.warning("Checkpoint is already past the final generation; starting fresh")
+            return None
+        return state
+
+    def clear_checkpoint(self, checkpoint_name: str = 'de_checkpoint') -> None:
+        """Remove the checkpoint after a fully completed run."""
+        self._flush_checkpoints()
+        for path in (self._checkpoint_path(checkpoint_name),
+                     self._legacy_checkpoint_path(checkpoint_name)):
+            if os.path.exists(path):
+                os.remove(path)
+                logger.info(f"Checkpoint removed: {path}")
+
+    def optimize(self, initial_individuals: List[Individual] = None,
+                 timerange: Optional[str] = None,
+                 resume: bool = False,
+                 checkpoint_name: Optional[str] = 'de_checkpoint',
+                 evaluator: Optional[PoolEvaluator] = None) -> List[Tuple[int, Individual]]:
+        """
+        Run differential evolution or CMA-ES.
+
+        Args:
+            initial_individuals: Optional individuals to seed the population
+                (DE) or the initial mean (CMA-ES)
+            timerange: Optional custom timerange for backtests
+            resume: Continue from the latest checkpoint if one exists
+            checkpoint_name: Checkpoint file name (None disables checkpointing)
+            evaluator: Worker pool to backtest on; None creates one with
+                pool_processes workers for this run only
+
+        Returns:
+            List of (generation, best individual of that generation) tuples
+        """
+        start_generation = 0
+        best_individuals: List[Tuple[int, Individual]] = []
+        vectors, fitness = None, None
+        self.budget = create_budget_from_settings(self.settings)
+        self.stopped_on_budget = False
+        cmaes = None
+        if self.strategy == 'cmaes':
+            seeds = [self._to_vector(ind) for ind in (initial_individuals or [])]
+            cmaes = CMAES(self.dim, self.settings.population_size, self.cmaes_sigma,
+                          mean=np.mean(seeds, axis=0) if seeds else None)
+
+        if resume and checkpoint_name:
+            state = self._load_checkpoint(checkpoint_name)
+            if state:
+                start_generation = state['next_generation']
+                best_individuals = state['best_individuals']
+                self.best_individual = state['overall_best']
+                self.rng.bit_generator.state = state['rng_state']
+                self.cache = state['cache']
+                self.budget.set_state(state['budget'])
+                vectors, fitness = state['vectors'], state['fitness']
+                if cmaes is not None:
+                    cmaes.set_state(state['cmaes'])
+                logger.info(f"Resumed from checkpoint at generation {start_generation + 1}")
+
+        logger.info(
+            f"Starting {self.strategy} optimization over {self.dim} coordinates "
+            f"with population {self.settings.population_size}"
+        )
+        checkpoint_frequency = getattr(self.settings, 'checkpoint_frequency', 0)
+        owns_evaluator = evaluator is None
+        if owns_evaluator:
+            evaluator = create_evaluator_from_settings(self.settings)
+        try:
+            for gen in range(start_generation, self.settings.generations):
+                if self.budget.exhausted():
+                    self.stopped_on_budget = True
+                    logger.info(f"Stopping before generation {gen+1}: {self.budget.exhausted()}")
+                    break
+                if cmaes is not None:
+                    vectors = cmaes.ask(self.rng)
+                    individuals, fitness = self._evaluate(vectors, gen, timerange, evaluator)
+                    cmaes.tell(vectors, fitness)
+                elif vectors is None:
+                    vectors = self._initial_vectors(initial_individuals)
+                    individuals, fitness = self._evaluate(vectors, gen, timerange, evaluator)
+                else:
+                    trials = self._trial_vectors(vectors, fitness)
+                    individuals, trial_fitness = self._evaluate(trials, gen, timerange, evaluator)
+                    improved = trial_fitness >= fitness
+                    vectors = np.where(improved[:, None], trials, vectors)
+                    fitness = np.where(improved, trial_fitness, fitness)
+                    logger.info(f"Generation {gen+1}: {int(improved.sum())} of {len(improved)} trials accepted")
+
+                # Like the GA, record this generation's winner; the overall
+                # best is kept separately.
+                best = individuals[int(np.argmax([ind.fitness for ind in individuals]))]
+                if self.best_individual is None or best.fitness > self.best_individual.fitness:
+                    self.best_individual = best.copy()
+                best_individuals.append((gen + 1, best.copy()))
+                logger.info(
+                    f"Generation {gen+1}: best fitness {self.best_individual.fitness:.4f} "
+                    f"after {self.backtests} backtests"
+                )
+                stop_reason = None
+                if self.budget.enabled:
+                    logger.info(f"Budget after generation {gen+1}: {self.budget.describe()}")
+                    stop_reason = self.budget.exhausted()
+
+                periodic = checkpoint_frequency and (gen + 1) % checkpoint_frequency == 0
+                if checkpoint_name and (periodic or stop_reason):
+                    self._save_checkpoint(checkpoint_name, {
+                        'next_generation': gen + 1,
+                        'best_individuals': best_individuals,
+                        'vectors': vectors,
+                        'fitness': fitness,
+                        'cmaes': cmaes.get_state() if cmaes is not None else None,
+                    })
+                if stop_reason:
+                    self.stopped_on_budget = True
+                    logger.info(f"Stopping after generation {gen+1}: {stop_reason}")
+                    break
+                gc.collect()
+        finally:
+            if owns_evaluator:
+                evaluator.close()
+            self._flush_checkpoints()
+
+        return best_individuals
+
+    def get_best_individual(self) -> Individual:
+        """
+        Get the best individual found during optimization.
+
+        Returns:
+            The best Individual found
+        """
+        return self.best_individual
@@ -0,0 +1,88 @@
+"""Convergence-based stop criteria for generational optimizers.
+
+Once the best fitness has plateaued and the population has collapsed onto
+one region, further generations mostly re-backtest near-copies of the
+winner. Each criterion below is disabled by default and can be switched on
+independently:
+
+  * patience: no improvement above ``min_delta`` for N generations
+  * diversity floor: population diversity below ``min_diversity``
+  * selection bar: the winner clears the chance bar by ``bar_margin``
+"""
+from typing import Any, Dict, Optional
+
+from strategy.selection_bar import SelectionBar
+
+
+class EarlyStopping:
+    """Decide after each generation whether the search has converged."""
+
+    def __init__(
+        self,
+        patience: int = 0,
+        min_delta: float = 1e-4,
+        min_diversity: float = 0.0,
+        bar_margin: Optional[float] = None
+    ):
+        """
+        Args:
+            patience: Generations without improvement before stopping (0 disables)
+            min_delta: Fitness gain that counts as an improvement
+            min_diversity: Stop when diversity falls below this (0 disables)
+            bar_margin: Stop when the winner's edge over the selection bar
+                reaches this margin (None disables)
+        """
+        self.patience = patience
+        self.min_delta = min_delta
+        self.min_diversity = min_diversity
+        self.bar_margin = bar_margin
+        self.best_fitness: Optional[float] = None
+        self.stalled_generations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.patience > 0 or self.min_diversity > 0 or self.bar_margin is not None
+
+    def check(self, best_fitness: float, diversity: Optional[float] = None,
+              bar: Optional[SelectionBar] = None) -> Optional[str]:
+        """Record one generation and return the reason to stop, if any.
+
+        Args:
+            best_fitness: Best fitness found so far
+            diversity: Population diversity, or None if not measured
+            bar: Selection bar for the generation, or None if unavailable
+
+        Returns:
+            Human-readable stop reason, or None to keep going
+        """
+        if self.best_fitness is None or best_fitness > self.best_fitness + self.min_delta:
+            self.best_fitness = best_fitness
+            self.stalled_generations = 0
+        else:
+            self.stalled_generations += 1
+
+        if self.patience > 0 and self.stalled_generations >= self.patience:
+            return (f"no improvement above {self.min_delta} for "
+                    f"{self.stalled_generations} generations")
+        if self.min_diversity > 0 and diversity is not None and diversity < self.min_diversity:
+            return f"diversity {diversity:.4f} below floor {self.min_diversity}"
+        if self.bar_margin is not None and bar is not None and bar.edge >= self.bar_margin:
+            return f"winner clears the selection bar by {bar.edge:+.4f} (margin {self.bar_margin})"
+        return None
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'best_fitness': self.best_fitness, 'stalled_generations': self.stalled_generations}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.best_fitness = state.get('best_fitness')
+        self.stalled_generations = state.get('stalled_generations', 0)
+
+
+def create_early_stopping_from_settings(settings: Any) -> EarlyStopping:
+    """Create EarlyStopping from the early_stop_* settings."""
+    return EarlyStopping(
+        patience=getattr(settings, 'early_stop_patience', 0),
+        min_delta=getattr(settings, 'early_stop_min_delta', 1e-4),
+        min_diversity=getattr(settings, 'early_stop_min_diversity', 0.0),
+        bar_margin=getattr(settings, 'early_stop_bar_margin', None),
+    )
@@ -0,0 +1,93 @@
+"""Worker pool shared by every backtest of a run.
+
+Each ``optimize()`` call used to create and tear down its own
+``multiprocessing.Pool``, so a walk-forward run paid the pool start-up once
+per fold, and out-of-sample test backtests ran serially in the parent
+process. A ``PoolEvaluator`` lives for the whole run. Training generations
+submit batches with ``map``, or with ``map_unordered`` to handle each
+result as soon as it finishes. Single backtests such as a fold's test
+evaluation are submitted with ``submit`` and collected later, so they
+overlap with whatever trains next.
+
+With one process the evaluator runs everything in-process. That keeps
+mocked backtests in tests working and avoids a pointless pool.
+"""
+import multiprocessing
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+def _call_indexed(job: Tuple[Callable, int, Sequence[Any]]) -> Tuple[int, Any]:
+    """Worker-side helper for ``map_unordered``: keep the result's position."""
+    func, index, args = job
+    return index, func(*args)
+
+
+class _Completed:
+    """Result of an in-process ``submit``, mirroring ``AsyncResult.get``."""
+
+    def __init__(self, value: Any = None, error: Optional[BaseException] = None):
+        self._value = value
+        self._error = error
+
+    def ready(self) -> bool:
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class PoolEvaluator:
+    """Run backtests on a long-lived process pool (or in-process)."""
+
+    def __init__(self, processes: int = 1):
+        """
+        Args:
+            processes: Worker processes; 1 or less evaluates in-process
+        """
+        self.processes = max(1, processes)
+        self._pool = multiprocessing.Pool(processes=self.processes) if self.processes > 1 else None
+
+    def map(self, func: Callable, args_list: Sequence[Sequence[Any]]) -> List[Any]:
+        """Call ``func(*args)`` for every entry and wait for all results, in order."""
+        if self._pool is not None:
+            return self._pool.starmap(func, args_list)
+        return [func(*args) for args in args_list]
+
+    def map_unordered(self, func: Callable,
+                      args_list: Sequence[Sequence[Any]]) -> Iterator[Tuple[int, Any]]:
+        """Yield ``(index, func(*args))`` for every entry as each one finishes."""
+        if self._pool is not None:
+            jobs = [(func, index, args) for index, args in enumerate(args_list)]
+            yield from self._pool.imap_unordered(_call_indexed, jobs)
+            return
+        for index, args in enumerate(args_list):
+            yield index, func(*args)
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Start ``func(*args, **kwargs)`` and return a handle whose ``get()`` waits for it."""
+        if self._pool is not None:
+            return self._pool.apply_async(func, args, kwargs)
+        try:
+            return _Completed(func(*args, **kwargs))
+        except Exception as e:
+            return _Completed(error=e)
+
+    def close(self) -> None:
+        """Stop the workers; outstanding work is abandoned."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> 'PoolEvaluator':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def create_evaluator_from_settings(settings: Any) -> PoolEvaluator:
+    """Create a PoolEvaluator with ``pool_processes`` workers."""
+    return PoolEvaluator(getattr(settings, 'pool_processes', 1))
@@ -6,26 +6,60 @@ into the unified optimizer interface.
 Features:
 - Walk-forward validation to prevent overfitting
 - Diversity-aware selection to prevent premature convergence
-- Elitism to preserve best solutions
+- Top-k elitism from a hall of fame of the best distinct genomes
+- Adaptive mutation rate driven by fitness progress and diversity
+- Optional surrogate pre-screening of bred offspring
+- Optional novelty archive that avoids backtesting near-duplicate genomes
+- Optional coarse-to-fine grid for numeric genes
+- Optional vectorized reproduction and per-generation seeded randomness
+- Optional backtest-count and wall-clock budget
+- Optional concurrent walk-forward folds sharing one worker pool
+- Optional warm start of each walk-forward fold from the previous one
+- Optional fold tests and CPCV splits sliced from one full-range backtest
+- Optional out-of-sample test of each fold's top-K finalists
+- Per-backtest journal, so --resume skips backtests finished before a crash
+- Versioned JSON checkpoints written on a background thread
 """
 import gc
+import copy
+import math
 import os
 import pickle
 import random
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from typing import List, Tuple, Any, Dict, Optional
 
+import numpy as np
+
 from optimization.base_optimizer import BaseOptimizer
 from genetic_algorithm.individual import Individual
 from genetic_algorithm.population import Population
+from genetic_algorithm.adaptive_mutation import AdaptiveMutationRate
+from genetic_algorithm.hall_of_fame import HallOfFame, genome_key
+from genetic_algorithm.archive import EvaluationArchive
+from genetic_algorithm.resolution import create_resolution_schedule_from_settings
+from genetic_algorithm.batch_operators import (
+    generation_rng, generation_seed, genes_to_array, array_to_genes,
+    draw_crossed, batch_crossover, batch_crossover_pairs, batch_mutate
+)
 from genetic_algorithm.operators import (
     crossover, mutate, select_tournament,
     select_with_diversity, maintain_diversity, calculate_population_diversity
 )
+from optimization.early_stopping import create_early_stopping_from_settings
+from optimization.budget import Budget, create_budget_from_settings
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from optimization.journal import EvaluationJournal
+from optimization.checkpoint import CheckpointCodec, CheckpointWriter, read_document
+from optimization.surrogate import SurrogateModel, SKLEARN_AVAILABLE
 from strategy.backtest import run_backtest
+from strategy.segments import SegmentStore, create_segment_store_from_settings
 from strategy.walk_forward import WalkForwardValidator, create_validator_from_settings
 from strategy.selection_bar import from_fitnesses as selection_bar
 from utils.logging_config import logger
+from utils.stats import rank_correlation
 
 
 class GeneticOptimizer(BaseOptimizer):
@@ -48,6 +82,27 @@ class GeneticOptimizer(BaseOptimizer):
         super().__init__(settings, parameters)
         self.all_pairs = all_pairs
         self.best_individual: Optional[Individual] = None
+        self.stop_reason: Optional[str] = None
+        self.budget = create_budget_from_settings(settings)
+        # True when the last run ended because its budget ran out
+        self.stopped_on_budget = False
+        # Last evaluated generation of the last run (warm-starts the next fold)
+        self.last_generation: List[Individual] = []
+        # Journal of finished backtests for the current checkpointed run
+        self.journal: Optional[EvaluationJournal] = None
+        # Background checkpoint writer, created on the first save of a run
+        self._checkpoint_writer: Optional[CheckpointWriter] = None
+        self.hall_of_fame = HallOfFame(getattr(settings, 'hall_of_fame_size', 10))
+        self.archive = self._create_archive()
+        # Grid spacing (fraction of range) for numeric genes; None = declared precision
+        self.resolution: Optional[float] = None
+        # Run seed; with it every generation's random draws derive from
+        # (seed, generation) alone, so a resumed run replays exactly. Each
+        # optimizer draws from its own generators, never the global ones,
+        # so walk-forward folds trained in parallel cannot disturb each other.
+        self.seed: Optional[int] = getattr(settings, 'ga_seed', None)
+        self.random = random.Random()
+        self.rng: Optional[np.random.Generator] = None
 
     def _create_population(self, population_size: int, initial_individuals: List[Individual] = None) -> Population:
         """
@@ -64,48 +119,349 @@ class GeneticOptimizer(BaseOptimizer):
             size=population_size,
             parameters=self.parameters,
             trading_pairs=self.all_pairs,
-            num_pairs=None if self.settings.fix_pairs else self.settings.num_pairs
+            num_pairs=None if self.settings.fix_pairs else self.settings.num_pairs,
+            rng=self.random
         )
+        if self.resolution:
+            for ind in population.individuals:
+                ind.constrain_genes(self.parameters, self.resolution)
 
         if initial_individuals:
-            population.individuals.extend(initial_individuals)
+            # Copies, so walk-forward folds seeded from the same list stay independent.
+            population.individuals.extend(ind.copy() for ind in initial_individuals)
 
         return population
 
+    def _breed(self, parents: List[Individual], elites: List[Individual],
+               size: int, mutation_rate: float) -> List[Individual]:
+        """
+        Produce ``size`` offspring by selection, crossover and mutation.
+
+        The first ``len(elites)`` offspring are copies of ``elites``; they take
+        no part in crossover and are never mutated.
+        """
+        enable_diversity = getattr(self.settings, 'enable_diversity_selection', False)
+        diversity_weight = getattr(self.settings, 'diversity_selection_weight', 0.3)
+
+        # Select individuals for the next generation with diversity consideration
+        offspring = []
+        for i in range(size):
+            if enable_diversity and i > 0 and offspring:
+                # Use diversity-aware selection
+                reference = offspring[-1] if offspring else None
+                selected = select_with_diversity(
+                    parents,
+                    self.settings.tournament_size,
+                    diversity_weight=diversity_weight,
+                    reference_individual=reference,
+                    rng=self.random
+                )
+            else:
+                selected = select_tournament(parents, self.settings.tournament_size, self.random)
+            offspring.append(selected.copy())
+
+        # Elitism: preserve the best individuals
+        elite_count = min(len(elites), size)
+        offspring[:elite_count] = [elite.copy() for elite in elites[:elite_count]]
+
+        if getattr(self.settings, 'batch_operators', False):
+            self._batch_reproduce(offspring[elite_count:], mutation_rate)
+            return offspring
+
+        # Apply crossover
+        for i in range(elite_count, len(offspring) - 1, 2):
+            if self.random.random() < self.settings.crossover_prob:
+                offspring[i], offspring[i+1] = crossover(
+                    offspring[i],
+                    offspring[i+1],
+                    with_pair=self.settings.fix_pairs,
+                    rng=self.random
+                )
+                offspring[i].after_genetic_operation(self.parameters, self.resolution)
+                offspring[i+1].after_genetic_operation(self.parameters, self.resolution)
+
+        # Apply mutation (skip elites)
+        for ind in offspring[elite_count:]:
+            mutate(ind, mutation_rate, self.resolution, self.random)
+            ind.after_genetic_operation(self.parameters, self.resolution)
+
+        return offspring
+
+    def _batch_reproduce(self, children: List[Individual], mutation_rate: float) -> None:
+        """Cross and mutate ``children`` in place as one gene matrix."""
+        if not children:
+            return
+        rng = self.rng if self.rng is not None else np.random.default_rng()
+        genes = genes_to_array(children, self.parameters)
+        crossed = draw_crossed(len(genes), genes.shape[1], rng, self.settings.crossover_prob)
+        genes = batch_crossover(genes, rng, self.settings.crossover_prob,
+                                getattr(self.settings, 'crossover_method', 'single_point'),
+                                crossed=crossed)
+        # Pairs are recombined under the same condition as in _breed's scalar path.
+        if self.settings.fix_pairs:
+            pairs = batch_crossover_pairs([ind.trading_pairs for ind in children], crossed, rng)
+            for ind, row_pairs in zip(children, pairs):
+                ind.trading_pairs = row_pairs
+        genes = batch_mutate(genes, self.parameters, rng, mutation_rate, self.resolution)
+        for ind, row in zip(children, genes):
+            ind.genes = array_to_genes(row, self.parameters)
+            ind.after_genetic_operation(self.parameters, self.resolution)
+
+    def _seed_generation(self, generation: int) -> None:
+        """Reseed this optimizer's generators for ``generation`` when a seed is set."""
+        if self.seed is None:
+            self.rng = None
+            return
+        self.random.seed(generation_seed(self.seed, generation))
+        self.rng = generation_rng(self.seed, generation)
+
+    def _create_archive(self) -> EvaluationArchive:
+        """Archive of every evaluated genome, in the same space the GA searches."""
+        return EvaluationArchive(
+            self.parameters,
+            all_pairs=None if self.settings.fix_pairs else self.all_pairs,
+        )
+
+    def _evaluate(self, individuals: List[Individual], gen: int,
+                  timerange: Optional[str], evaluator: PoolEvaluator) -> bool:
+        """
+        Backtest ``individuals`` on ``evaluator`` and store their fitness in place.
+
+        Returns:
+            True if every backtest ran; False if the batch failed, in which
+            case the individuals carry -inf rather than a stale fitness
+        """
+        eval_args = [
+            (ind.genes, ind.trading_pairs, gen + 1, timerange, len(self.parameters))
+            for ind in individuals
+        ]
+        fitnesses: List[float] = [float('-inf')] * len(individuals)
+        try:
+            # Results are journaled as they finish, not when the batch does.
+            for index, fit in evaluator.map_unordered(run_backtest, eval_args):
+                fitnesses[index] = fit if fit is not None else float('-inf')
+                if self.journal is not None:
+                    ind = individuals[index]
+                    self.journal.record(ind.genes, ind.trading_pairs, timerange,
+                                        fitnesses[index], gen + 1)
+
+            for ind, fit in zip(individuals, fitnesses):
+                ind.fitness = fit
+            return True
+
+        except (OSError, multiprocessing.TimeoutError) as e:
+            logger.error(f"Process error in generation {gen+1}: {str(e)}")
+            for ind in individuals:
+                ind.fitness = float('-inf')
+        except ValueError as e:
+            logger.error(f"Value error in generation {gen+1}: {str(e)}")
+            for ind in individuals:
+                if ind.fitness is None:
+                    ind.fitness = float('-inf')
+        except Exception as e:
+            logger.error(f"Unexpected error in generation {gen+1}: {type(e).__name__}: {str(e)}")
+            # A failed evaluation must not leave individuals carrying
+            # fitness inherited from a previous generation's genes.
+            for ind in individuals:
+                ind.fitness = float('-inf')
+        return False
+
+    def _replay_journal(self, individuals: List[Individual],
+                        timerange: Optional[str]) -> List[Individual]:
+        """Take fitness from the journal where it has one; return the rest."""
+        if self.journal is None or not len(self.journal):
+            return list(individuals)
+        remaining = []
+        for ind in individuals:
+            fitness = self.journal.take(ind.genes, ind.trading_pairs, timerange)
+            if fitness is None:
+                remaining.append(ind)
+            else:
+                ind.fitness = fitness
+        replayed = len(individuals) - len(remaining)
+        if replayed:
+            # They were backtested before the crash, after the checkpoint.
+            self.budget.record(replayed)
+            logger.info(f"Replayed {replayed} backtests from the evaluation journal")
+        return remaining
+
+    def _skip_near_duplicates(self, individuals: List[Individual],
+                              threshold: float) -> Tuple[List[Individual], List[Individual]]:
+        """
+        Score genomes that sit within ``threshold`` of an archived one from
+        their neighbours instead of backtesting them.
+
+        Returns:
+            (genomes that still need a backtest, genomes whose fitness is an
+            estimate rather than an exact archive match)
+        """
+        if threshold <= 0 or not len(self.archive):
+            return list(individuals), []
+        k = getattr(self.settings, 'novelty_neighbours', 3)
+        pending, estimated = [], []
+        for ind in individuals:
+            distance = self.archive.distance(ind)
+            if distance < threshold:
+                ind.fitness = self.archive.estimate(ind, k=k)
+                if distance >= 1e-12:
+                    estimated.append(ind)
+            else:
+                pending.append(ind)
+        skipped = len(individuals) - len(pending)
+        if skipped:
+            logger.info(f"Scored {skipped} near-duplicate genomes from the archive instead of backtesting")
+        return pending, estimated
+
+    def _generation_winner(self, candidates: List[Individual],
+                           estimated: List[Individual]) -> Individual:
+        """
+        Best of ``candidates`` whose fitness came from a backtest.
+
+        Estimated fitness steers selection but never names a winner. If every
+        candidate was estimated, the best backtest so far stands.
+        """
+        estimated_ids = {id(ind) for ind in estimated}
+        measured = [ind for ind in candidates if id(ind) not in estimated_ids]
+        if measured:
+            return max(measured, key=lambda ind: ind.fitness)
+        if len(self.hall_of_fame):
+            return self.hall_of_fame.top(1)[0].copy()
+        return max(candidates, key=lambda ind: ind.fitness)
+
+    def _remutate_near_duplicates(self, offspring: List[Individual], mutation_rate: float,
+                                  threshold: float) -> None:
+        """Give offspring that landed next to an archived genome another mutation."""
+        retries = getattr(self.settings, 'novelty_max_retries', 3)
+        # A plain-rate mutation of a near-duplicate usually stays a near-duplicate.
+        rate = min(1.0, max(2 * mutation_rate, 0.5))
+        remutated = 0
+        for ind in offspring:
+            for _ in range(retries):
+                if self.archive.distance(ind) >= threshold:
+                    break
+                mutate(ind, rate, self.resolution, self.random)
+                ind.after_genetic_operation(self.parameters, self.resolution)
+                remutated += 1
+        if remutated:
+            logger.info(f"Re-mutated near-duplicate offspring {remutated} times")
+
+    def _create_mutation_control(self) -> Optional[AdaptiveMutationRate]:
+        """Build the adaptive mutation controller unless it is disabled."""
+        if not getattr(self.settings, 'adaptive_mutation', True):
+            return None
+        return AdaptiveMutationRate(
+            base_rate=self.settings.mutation_prob,
+            max_rate=getattr(self.settings, 'max_mutation_prob', self.settings.mutation_prob),
+            diversity_threshold=getattr(self.settings, 'diversity_threshold', 0.1),
+            patience=getattr(self.settings, 'adaptive_mutation_patience', 2),
+            step=getattr(self.settings, 'adaptive_mutation_step', 1.5),
+        )
+
+    def _create_surrogate(self) -> Optional[SurrogateModel]:
+        """Build the offspring pre-screening model if it is enabled and available."""
+        if not getattr(self.settings, 'surrogate_enabled', False):
+            return None
+        if not SKLEARN_AVAILABLE:
+            logger.warning("surrogate_enabled is set but scikit-learn is not installed; "
+                           "offspring will not be pre-screened")
+            return None
+        return SurrogateModel(
+            self.parameters,
+            all_pairs=None if self.settings.fix_pairs else self.all_pairs,
+            min_samples=getattr(self.settings, 'surrogate_min_samples', 30),
+            uncertainty_weight=getattr(self.settings, 'surrogate_uncertainty_weight', 1.0),
+            seed=self.seed,
+        )
+
+    def _screen_offspring(self, surrogate: SurrogateModel, offspring: List[Individual],
+                          parents: List[Individual], elites: List[Individual],
+                          mutation_rate: float) -> List[Individual]:
+        """Breed an oversampled pool and keep the offspring the surrogate ranks highest."""
+        oversample = getattr(self.settings, 'surrogate_oversample', 3)
+        if oversample <= 1:
+            return offspring
+        elite_count = len(elites)
+        pool = offspring[elite_count:]
+        for _ in range(oversample - 1):
+            # Each extra brood carries its own elite copies up front; drop them.
+            brood = self._breed(parents, elites, len(offspring), mutation_rate)
+            pool.extend(brood[elite_count:])
+        screened = surrogate.screen(pool, len(offspring) - elite_count)
+        logger.info(f"Surrogate screened {len(pool)} bred offspring down to {len(screened)}")
+        return offspring[:elite_count] + screened
+
     def _checkpoint_path(self, checkpoint_name: str) -> str:
         """Path of the checkpoint file inside the configured checkpoint dir."""
+        suffix = '.json.gz' if getattr(self.settings, 'checkpoint_compress', True) else '.json'
+        return os.path.join(self.settings.checkpoint_dir, f"{checkpoint_name}{suffix}")
+
+    def _legacy_checkpoint_path(self, checkpoint_name: str) -> str:
+        """Pickle checkpoint written before the versioned format."""
         return os.path.join(self.settings.checkpoint_dir, f"{checkpoint_name}.pkl")
 
+    def _journal_path(self, checkpoint_name: str) -> str:
+        """Path of the evaluation journal that accompanies a checkpoint."""
+        return os.path.join(self.settings.checkpoint_dir, f"{checkpoint_name}.journal.jsonl")
+
     def _save_checkpoint(self, checkpoint_name: str, next_generation: int,
                          population: Population,
-                         best_individuals: List[Tuple[int, Individual]]) -> None:
-        """Persist optimizer state so --resume can continue after a crash."""
+                         best_individuals: List[Tuple[int, Individual]],
+                         extra: Optional[Dict[str, Any]] = None) -> None:
+        """Persist optimizer state so --resume can continue after a crash.
+
+        ``extra`` carries the state of optional components (surrogate, mutation
+        controller, ...) keyed by component name. The state is copied here and
+        written by a background thread; ``_flush_checkpoints`` waits for it.
+        """
         path = self._checkpoint_path(checkpoint_name)
         state = {
             'next_generation': next_generation,
             'individuals': population.individuals,
             'best_individuals': best_individuals,
             'overall_best': self.best_individual,
-            'random_state': random.getstate(),
+            # A seeded run re-derives its random state from the seed.
+            'seed': self.seed,
+            'random_state': self.random.getstate() if self.seed is None else None,
             'population_size': self.settings.population_size,
             'generations': self.settings.generations,
         }
-        tmp_path = path + '.tmp'
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(tmp_path, 'wb') as f:
-            pickle.dump(state, f)
-        os.replace(tmp_path, path)
-        logger.info(f"Checkpoint saved: {path} (next generation: {next_generation + 1})")
+        state.update(extra or {})
+        document = CheckpointCodec(self.parameters).encode(state)
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = CheckpointWriter()
+        # Everything journaled so far is in this checkpoint; the journal's
+        # copy is dropped once the checkpoint is on disk.
+        journal = self.journal
+        if journal is not None:
+            self._checkpoint_writer.wait()
+            journal.rotate()
+        self._checkpoint_writer.submit(
+            path, document, on_written=journal.discard_rotated if journal is not None else None
+        )
+
+    def _flush_checkpoints(self) -> None:
+        """Wait for queued checkpoint writes and stop the writer thread."""
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.close()
+            self._checkpoint_writer = None
 
     def _load_checkpoint(self, checkpoint_name: str) -> Optional[Dict[str, Any]]:
         """Load a checkpoint if one exists and matches the current run shape."""
+        self._flush_checkpoints()
         path = self._checkpoint_path(checkpoint_name)
+        legacy_path = self._legacy_checkpoint_path(checkpoint_name)
+        if not os.path.exists(path) and os.path.exists(legacy_path):
+            path = legacy_path
         if not os.path.exists(path):
             logger.info(f"No checkpoint found at {path}; starting fresh")
             return None
         try:
-            with open(path, 'rb') as f:
-                state = pickle.load(f)
+            if path == legacy_path:
+                # Pickles from before the versioned format still resume once.
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+            else:
+                state = CheckpointCodec(self.parameters).decode(read_document(path))
         except Exception as e:
             logger.error(f"Failed to load checkpoint {path}: {e}; starting fresh")
             return None
@@ -121,15 +477,20 @@ class GeneticOptimizer(BaseOptimizer):
 
     def clear_checkpoint(self, checkpoint_name: str = 'ga_checkpoint') -> None:
         """Remove the checkpoint after a fully completed run."""
-        path = self._checkpoint_path(checkpoint_name)
-        if os.path.exists(path):
-            os.remove(path)
-            logger.info(f"Checkpoint removed: {path}")
+        self._flush_checkpoints()
+        for path in (self._checkpoint_path(checkpoint_name),
+                     self._legacy_checkpoint_path(checkpoint_name)):
+            if os.path.exists(path):
+                os.remove(path)
+                logger.info(f"Checkpoint removed: {path}")
+        EvaluationJournal(self._journal_path(checkpoint_name)).clear()
 
     def optimize(self, initial_individuals: List[Individual] = None,
                  timerange: Optional[str] = None,
                  resume: bool = False,
-                 checkpoint_name: Optional[str] = 'ga_checkpoint') -> List[Tuple[int, Individual]]:
+                 checkpoint_name: Optional[str] = 'ga_checkpoint',
+                 evaluator: Optional[PoolEvaluator] = None,
+                 budget: Optional[Budget] = None) -> List[Tuple[int, Individual]]:
         """
         Run genetic algorithm optimization with anti-overfitting measures.
 
@@ -138,6 +499,7 @@ class GeneticOptimizer(BaseOptimizer):
         - Elitism to preserve best solutions
         - Population diversity maintenance
         - Periodic checkpointing (resume with resume=True)
+        - Optional convergence-based early stopping (see early_stop_* settings)
 
         Args:
             initial_individuals: Optional list of initial individuals to seed the population
@@ -145,6 +507,10 @@ class GeneticOptimizer(BaseOptimizer):
                 for every backtest in this run; None uses the configured recent window
             resume: Resume from the latest checkpoint if one exists
             checkpoint_name: Base name for checkpoint files; None disables checkpointing
+            evaluator: Worker pool to backtest on; None creates one with
+                pool_processes workers for this run only
+            budget: Budget shared with other runs (walk-forward folds); None
+                creates one from max_evaluations / max_runtime_minutes
 
         Returns:
             List of tuples containing (generation number, best individual)
@@ -152,6 +518,19 @@ class GeneticOptimizer(BaseOptimizer):
         best_individuals: List[Tuple[int, Individual]] = []
         start_generation = 0
         population = None
+        surrogate = self._create_surrogate()
+        mutation_control = self._create_mutation_control()
+        early_stopping = create_early_stopping_from_settings(self.settings)
+        resolution_schedule = create_resolution_schedule_from_settings(self.settings)
+        owns_budget = budget is None
+        self.budget = create_budget_from_settings(self.settings) if owns_budget else budget
+        self.stop_reason = None
+        self.stopped_on_budget = False
+        self.hall_of_fame = HallOfFame(getattr(self.settings, 'hall_of_fame_size', 10))
+        self.archive = self._create_archive()
+        # At least one slot must stay open for offspring.
+        elite_size = max(1, min(getattr(self.settings, 'elite_size', 1),
+                                self.settings.population_size - 1))
 
         if resume and checkpoint_name:
             state = self._load_checkpoint(checkpoint_name)
@@ -160,63 +539,124 @@ class GeneticOptimizer(BaseOptimizer):
                 best_individuals = state['best_individuals']
                 self.best_individual = state['overall_best']
                 population = Population(state['individuals'])
-                random.setstate(state['random_state'])
+                if state.get('seed') is not None:
+                    self.seed = state['seed']
+                elif state.get('random_state') is not None:
+                    self.random.setstate(state['random_state'])
+                if surrogate is not None and state.get('surrogate'):
+                    # Refit with the checkpointed run's seed
+                    surrogate.seed = self.seed
+                    surrogate.set_state(state['surrogate'])
+                if mutation_control is not None and state.get('mutation_control'):
+                    mutation_control.set_state(state['mutation_control'])
+                if state.get('early_stopping'):
+                    early_stopping.set_state(state['early_stopping'])
+                self.hall_of_fame.update(state.get('hall_of_fame') or [])
+                if state.get('archive'):
+                    self.archive.set_state(state['archive'])
+                if resolution_schedule is not None and state.get('resolution_schedule'):
+                    resolution_schedule.set_state(state['resolution_schedule'])
+                if owns_budget and state.get('budget'):
+                    self.budget.set_state(state['budget'])
+                # A converged run stays converged; only a budget stop
+                # (stored without a reason) is continued.
+                self.stop_reason = state.get('stop_reason')
                 logger.info(f"Resumed from checkpoint at generation {start_generation + 1}")
 
+        # Backtests finished since the last checkpoint; a fresh run starts an
+        # empty journal, a resumed one replays it.
+        self.journal = None
+        if checkpoint_name and getattr(self.settings, 'evaluation_journal', True):
+            self.journal = EvaluationJournal(self._journal_path(checkpoint_name))
+            if resume:
+                if self.journal.load():
+                    logger.info(f"Evaluation journal holds {len(self.journal)} finished backtests")
+            else:
+                self.journal.clear()
+
+        self.resolution = resolution_schedule.resolution if resolution_schedule else None
+        if resolution_schedule is not None:
+            logger.info(f"Gene grid for generation {start_generation + 1}: {resolution_schedule.describe()}")
+
         if population is None:
+            self._seed_generation(0)
             # Calculate population size accounting for initial individuals
             population_size = self.settings.population_size - len(initial_individuals or [])
             population = self._create_population(population_size, initial_individuals)
 
-        num_parameters = len(self.parameters)
         checkpoint_frequency = getattr(self.settings, 'checkpoint_frequency', 0)
 
         # Check if diversity selection is enabled
         enable_diversity = getattr(self.settings, 'enable_diversity_selection', False)
-        diversity_weight = getattr(self.settings, 'diversity_selection_weight', 0.3)
         diversity_threshold = getattr(self.settings, 'diversity_threshold', 0.1)
+        novelty_threshold = getattr(self.settings, 'novelty_threshold', 0.0)
 
-        pool_processes = getattr(self.settings, 'pool_processes', 1)
-        pool = multiprocessing.Pool(processes=pool_processes) if pool_processes > 1 else None
+        owns_evaluator = evaluator is None
+        if owns_evaluator:
+            evaluator = create_evaluator_from_settings(self.settings)
 
         try:
             for gen in range(start_generation, self.settings.generations):
+                if self.stop_reason:
+                    logger.info(f"Checkpointed run had already stopped early ({self.stop_reason}); "
+                                f"start without --resume to search again")
+                    break
+                # A run resumed with its budget already spent stops at once.
+                if self.budget.exhausted():
+                    self.stop_reason = self.budget.exhausted()
+                    self.stopped_on_budget = True
+                    logger.info(f"Stopping before generation {gen+1}: {self.stop_reason}")
+                    break
                 logger.info(f"Generation {gen+1}")
+                self._seed_generation(gen + 1)
 
                 # Log population diversity
-                if enable_diversity:
-                    diversity = calculate_population_diversity(population.individuals)
+                diversity = None
+                if enable_diversity or mutation_control is not None or early_stopping.min_diversity > 0:
+                    diversity = calculate_population_diversity(population.individuals, self.random)
                     logger.info(f"Population diversity: {diversity:.4f}")
 
+                # Genomes within novelty_threshold of an archived evaluation
+                # are scored from their neighbours instead of backtested.
+                pending, estimated = self._skip_near_duplicates(population.individuals,
+                                                                novelty_threshold)
+                # Backtests that finished before a crash come from the journal.
+                to_run = self._replay_journal(pending, timerange)
+
+                # The last generation the budget allows is shrunk to fit.
+                allowed = self.budget.reserve(len(to_run))
+                if allowed < len(to_run):
+                    dropped = {id(ind) for ind in to_run[allowed:]}
+                    to_run = to_run[:allowed]
+                    pending = [ind for ind in pending if id(ind) not in dropped]
+                    population.individuals = [
+                        ind for ind in population.individuals if id(ind) not in dropped
+                    ]
+                    logger.info(f"Budget: generation {gen+1} shrunk to {allowed} backtests")
+
+                # Predict before evaluating so the surrogate can be scored on
+                # genomes it has not been trained on.
+                predicted = surrogate.predict(pending)[0] if surrogate else []
+
                 # Evaluate fitness (in parallel when pool_processes > 1)
-                eval_args = [
-                    (ind.genes, ind.trading_pairs, gen + 1, timerange, num_parameters)
-                    for ind in population.individuals
-                ]
-                try:
-                    if pool is not None:
-                        fitnesses = pool.starmap(run_backtest, eval_args)
-                    else:
-                        fitnesses = [run_backtest(*args) for args in eval_args]
-
-                    for ind, fit in zip(population.individuals, fitnesses):
-                        ind.fitness = fit if fit is not None else float('-inf')
-
-                except (OSError, multiprocessing.TimeoutError) as e:
-                    logger.error(f"Process error in generation {gen+1}: {str(e)}")
-                    for ind in population.individuals:
-                        ind.fitness = float('-inf')
-                except ValueError as e:
-                    logger.error(f"Value error in generation {gen+1}: {str(e)}")
-                    for ind in population.individuals:
-                        if ind.fitness is None:
-                            ind.fitness = float('-inf')
-                except Exception as e:
-                    logger.error(f"Unexpected error in generation {gen+1}: {type(e).__name__}: {str(e)}")
-                    # A failed evaluation must not leave individuals carrying
-                    # fitness inherited from a previous generation's genes.
-                    for ind in population.individuals:
-                        ind.fitness = float('-inf')
+                started = self.budget.clock()
+                evaluated = self._evaluate(to_run, gen, timerange, evaluator)
+                self.budget.record(len(to_run), self.budget.clock() - started, reserved=allowed)
+                if evaluated:
+                    self.archive.add(pending)
+                self.last_generation = list(population.individuals)
+
+                if surrogate is not None and evaluated:
+                    accuracy = surrogate.accuracy(pending, predicted)
+                    if accuracy:
+                        corr = accuracy['rank_correlation']
+                        logger.info(
+                            f"Surrogate accuracy in generation {gen+1}: "
+                            f"rank correlation {'n/a' if corr is None else f'{corr:.3f}'}, "
+                            f"MAE {accuracy['mae']:.4f} over {accuracy['n']} evaluations"
+                        )
+                    surrogate.add(pending)
+                    surrogate.fit(gen + 1)
 
                 # Filter out individuals with negative or None fitness
                 valid_individuals = [
@@ -235,51 +675,41 @@ class GeneticOptimizer(BaseOptimizer):
                         logger.warning(f"No valid individuals in generation {gen+1}. Terminating early.")
                         break
 
-                # Find the best individual before selection
-                best_individual = max(valid_individuals, key=lambda ind: ind.fitness)
-
-                # Select individuals for the next generation with diversity consideration
-                offspring = []
-                for i in range(self.settings.population_size):
-                    if enable_diversity and i > 0 and offspring:
-                        # Use diversity-aware selection
-                        reference = offspring[-1] if offspring else None
-                        selected = select_with_diversity(
-                            valid_individuals,
-                            self.settings.tournament_size,
-                            diversity_weight=diversity_weight,
-                            reference_individual=reference
-                        )
-                    else:
-                        selected = select_tournament(valid_individuals, self.settings.tournament_size)
-                    offspring.append(selected.copy())
-
-                # Elitism: preserve the best individual
-                if best_individual.fitness > offspring[0].fitness:
-                    offspring[0] = best_individual.copy()
-
-                # Apply crossover
-                for i in range(1, len(offspring) - 1, 2):
-                    if random.random() < self.settings.crossover_prob:
-                        offspring[i], offspring[i+1] = crossover(
-                            offspring[i],
-                            offspring[i+1],
-                            with_pair=self.settings.fix_pairs
-                        )
-                        offspring[i].after_genetic_operation(self.parameters)
-                        offspring[i+1].after_genetic_operation(self.parameters)
+                # Only backtested genomes enter the hall of fame; estimates never do.
+                self.hall_of_fame.update(pending)
 
-                # Apply mutation (skip elite)
-                for ind in offspring[1:]:
-                    mutate(ind, self.settings.mutation_prob)
-                    ind.after_genetic_operation(self.parameters)
+                # Find the best individual before selection
+                best_individual = self._generation_winner(valid_individuals, estimated)
+
+                # Elites come from the all-time archive, not just this generation.
+                elites = self.hall_of_fame.top(elite_size) or [best_individual]
+
+                mutation_rate = self.settings.mutation_prob
+                if mutation_control is not None:
+                    mutation_rate = mutation_control.update(best_individual.fitness, diversity)
+                    logger.info(f"Mutation rate for generation {gen+2}: {mutation_rate:.4f}")
+                if resolution_schedule is not None:
+                    self.resolution = resolution_schedule.update(gen + 1, best_individual.fitness)
+                    logger.info(f"Gene grid for generation {gen+2}: {resolution_schedule.describe()}")
+
+                offspring = self._breed(valid_individuals, elites,
+                                        self.settings.population_size, mutation_rate)
+                if surrogate is not None and surrogate.ready:
+                    offspring = self._screen_offspring(
+                        surrogate, offspring, valid_individuals, elites, mutation_rate
+                    )
+                if novelty_threshold > 0:
+                    self._remutate_near_duplicates(offspring[len(elites):], mutation_rate,
+                                                   novelty_threshold)
 
                 # Maintain diversity if it drops too low
                 if enable_diversity:
                     mutations = maintain_diversity(
-                        offspring[1:],  # Don't mutate elite
+                        offspring[len(elites):],  # Don't mutate elites
                         min_diversity=diversity_threshold,
-                        mutation_boost=self.settings.mutation_prob * 2
+                        mutation_boost=min(1.0, mutation_rate * 2),
+                        resolution=self.resolution,
+                        rng=self.random
                     )
                     if mutations > 0:
                         logger.info(f"Applied {mutations} diversity mutations")
@@ -305,14 +735,42 @@ class GeneticOptimizer(BaseOptimizer):
                 if bar:
                     logger.info(f"Generation {gen+1} {bar.summary()}")
 
-                if checkpoint_name and checkpoint_frequency and (gen + 1) % checkpoint_frequency == 0:
-                    self._save_checkpoint(checkpoint_name, gen + 1, population, best_individuals)
+                if early_stopping.enabled:
+                    self.stop_reason = early_stopping.check(
+                        self.best_individual.fitness, diversity, bar
+                    )
+                if self.budget.enabled:
+                    logger.info(f"Budget after generation {gen+1}: {self.budget.describe()}")
+                    if not self.stop_reason and self.budget.exhausted():
+                        self.stop_reason = self.budget.exhausted()
+                        self.stopped_on_budget = True
+
+                # A converged run always leaves a final checkpoint, whatever
+                # the checkpoint frequency.
+                periodic = checkpoint_frequency and (gen + 1) % checkpoint_frequency == 0
+                if checkpoint_name and (periodic or self.stop_reason):
+                    self._save_checkpoint(checkpoint_name, gen + 1, population, best_individuals, {
+                        'surrogate': surrogate.get_state() if surrogate else None,
+                        'mutation_control': mutation_control.get_state() if mutation_control else None,
+                        'early_stopping': early_stopping.get_state(),
+                        'hall_of_fame': self.hall_of_fame.top(),
+                        'archive': self.archive.get_state(),
+                        'resolution_schedule': (resolution_schedule.get_state()
+                                                if resolution_schedule else None),
+                        # Convergence only: a budget stop is resumable.
+                        'stop_reason': None if self.stopped_on_budget else self.stop_reason,
+                        'budget': self.budget.get_state(),
+                    })
+
+                if self.stop_reason:
+                    logger.info(f"Stopping early after generation {gen+1}: {self.stop_reason}")
+                    break
 
                 gc.collect()
         finally:
-            if pool is not None:
-                pool.terminate()
-                pool.join()
+            if owns_evaluator:
+                evaluator.close()
+            self._flush_checkpoints()
 
         return best_individuals
 
@@ -334,59 +792,109 @@ class GeneticOptimizer(BaseOptimizer):
         """
         # Create walk-forward validator
         validator = create_validator_from_settings(self.settings)
-        periods = validator.generate_periods()
+        end_date = datetime.now()
+        periods = validator.generate_periods(end_date)
 
         if not periods:
             logger.warning("No walk-forward periods generated. Running standard optimization.")
             return self.optimize(initial_individuals), {}
 
-        logger.info(f"Running walk-forward optimization with {len(periods)} periods")
-
-        all_results = []
-        fold_results = []
-
-        for period in periods:
-            logger.info(f"=== Fold {period.fold_number + 1}/{len(periods)} ===")
-            logger.info(f"Train: {period.train_timerange} ({period.train_weeks} weeks)")
-            logger.info(f"Test: {period.test_timerange} ({period.test_weeks} weeks)")
-
-            # Run optimization on training period
-            # Store original timerange
-            original_timerange = self.settings.backtest_timerange_weeks
-
-            # Run training
-            train_results = self._run_fold_optimization(
-                period.train_timerange,
-                initial_individuals,
-                f"fold{period.fold_number}_train"
-            )
-
-            if not train_results:
-                logger.warning(f"Fold {period.fold_number + 1} training failed")
-                continue
-
-            # Get best individual from training
-            best_train = max(train_results, key=lambda x: x[1].fitness)
-            train_fitness = best_train[1].fitness
-
-            # Validate on test period
-            test_fitness = self._evaluate_on_period(
-                best_train[1],
-                period.test_timerange
+        parallel_folds = max(1, min(getattr(self.settings, 'walk_forward_parallel_folds', 1), len(periods)))
+        warm_fraction = getattr(self.settings, 'walk_forward_warm_start', 0.0)
+        if warm_fraction > 0 and parallel_folds > 1:
+            logger.warning("walk_forward_warm_start needs each fold to finish before the next; "
+                           "running folds one at a time")
+            parallel_folds = 1
+
+        # With segment reuse, test candidates are backtested once over the
+        # whole data range and each window is scored from that trade list.
+        segments = None
+        if getattr(self.settings, 'walk_forward_segment_reuse', False):
+            segments = create_segment_store_from_settings(
+                self.settings, end_date - timedelta(weeks=validator.total_weeks), len(self.parameters)
             )
-
-            logger.info(f"Fold {period.fold_number + 1} - Train: {train_fitness:.4f}, Test: {test_fitness:.4f}")
-
-            fold_results.append({
-                'fold': period.fold_number,
-                'train_fitness': train_fitness,
-                'test_fitness': test_fitness,
-                'best_individual': best_train[1],
-                'train_period': period.train_timerange,
-                'test_period': period.test_timerange
-            })
-
-            all_results.extend(train_results)
+            logger.info(f"Scoring test windows from one backtest per candidate over {segments.timerange}")
+        cpcv_groups = getattr(self.settings, 'cpcv_groups', 0)
+        if cpcv_groups and segments is None:
+            logger.warning("cpcv_groups needs walk_forward_segment_reuse; skipping CPCV")
+
+        # One pool serves every fold's training and test backtests, so a
+        # fold's test runs while the next fold trains. One budget covers the
+        # whole run: folds that start after it runs out are skipped.
+        evaluator = create_evaluator_from_settings(self.settings)
+        budget = create_budget_from_settings(self.settings)
+        # More folds than workers only adds threads contending for them; an
+        # in-process evaluator has one worker, the calling thread.
+        if parallel_folds > evaluator.processes:
+            logger.warning(f"walk_forward_parallel_folds is capped at the {evaluator.processes} "
+                           f"pool_processes worker(s)")
+            parallel_folds = evaluator.processes
+        logger.info(
+            f"Running walk-forward optimization with {len(periods)} periods"
+            + (f", {parallel_folds} at a time" if parallel_folds > 1 else "")
+        )
+        try:
+            if parallel_folds == 1:
+                outcomes = []
+                optimizer, carried = self, []
+                fold_optimizers = []
+                for period in periods:
+                    fold_optimizers.append(optimizer)
+                    outcomes.append(optimizer._run_fold(
+                        period, len(periods), carried + list(initial_individuals or []),
+                        evaluator, segments, budget
+                    ))
+                    if warm_fraction > 0:
+                        carried = optimizer._warm_start_seeds(warm_fraction, len(initial_individuals or []))
+                        optimizer = self._warm_fold_optimizer()
+            else:
+                # Each fold gets its own optimizer (hall of fame, archive);
+                # their backtests queue on the shared pool and draw on the
+                # shared budget.
+                outcomes = [None] * len(periods)
+                fold_optimizers = [type(self)(self.settings, self.parameters, self.all_pairs)
+                                   for _ in periods]
+                with ThreadPoolExecutor(max_workers=parallel_folds) as executor:
+                    futures = {
+                        executor.submit(
+                            fold_optimizers[index]._run_fold,
+                            period, len(periods), initial_individuals, evaluator, segments, budget
+                        ): index
+                        for index, period in enumerate(periods)
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        index = futures[future]
+                        outcomes[index] = future.result()
+                        logger.info(f"Fold {periods[index].fold_number + 1} finished training "
+                                    f"({done}/{len(periods)})")
+
+            all_results = []
+            fold_results = []
+            for outcome in outcomes:
+                if outcome is None:
+                    continue
+                train_results, fold_result, test_handles = outcome
+                test_scores = [self._collect_on_period(handle, fold_result['test_period'])
+                               for handle in test_handles]
+                fold_result['test_fitness'] = test_scores[0]
+                if len(test_scores) > 1:
+                    self._summarize_finalist_tests(fold_result, test_scores)
+                logger.info(
+                    f"Fold {fold_result['fold'] + 1} - Train: {fold_result['train_fitness']:.4f}, "
+                    f"Test: {fold_result['test_fitness']:.4f}"
+                )
+                if segments is not None and cpcv_groups:
+                    fold_result['cpcv_fitness'] = self._cpcv_on_segments(
+                        fold_result['best_individual'], segments, evaluator
+                    )
+                fold_results.append(fold_result)
+                all_results.extend(train_results)
+        finally:
+            evaluator.close()
+        self._merge_fold_optimizers(fold_optimizers, outcomes)
+        self.budget = budget
+        if budget.enabled:
+            logger.info(f"Walk-forward budget: {budget.describe()}")
 
         # Calculate composite fitness
         composite_fitness = validator.calculate_composite_fitness(fold_results)
@@ -397,16 +905,149 @@ class GeneticOptimizer(BaseOptimizer):
             'num_folds': len(periods),
             'method': validator.method
         }
+        correlations = [fold['train_test_correlation'] for fold in fold_results
+                        if fold.get('train_test_correlation') is not None]
+        if correlations:
+            validation_results['train_test_correlation'] = sum(correlations) / len(correlations)
+            logger.info(f"Mean train/test rank correlation of finalists: "
+                        f"{validation_results['train_test_correlation']:.3f}")
 
         logger.info(f"Walk-forward composite fitness: {composite_fitness:.4f}")
 
         return all_results, validation_results
 
+    def _merge_fold_optimizers(self, fold_optimizers: List['GeneticOptimizer'],
+                               outcomes: List[Any]) -> None:
+        """
+        Leave this optimizer holding the walk-forward winners, however the
+        folds were run: the hall of fame of the latest fold that trained and
+        the best individual of any fold.
+        """
+        trained = [optimizer for optimizer, outcome in zip(fold_optimizers, outcomes)
+                   if outcome is not None]
+        if trained:
+            self.hall_of_fame = trained[-1].hall_of_fame
+        for optimizer in trained:
+            best = optimizer.best_individual
+            if best is not None and (self.best_individual is None
+                                     or best.fitness > self.best_individual.fitness):
+                self.best_individual = best
+
+    def _warm_start_seeds(self, fraction: float, reserved: int = 0) -> List[Individual]:
+        """
+        Best distinct genomes of the last evaluated generation, to seed the next fold.
+
+        Args:
+            fraction: Share of population_size to carry over
+            reserved: Population slots already taken by other seeds
+
+        Returns:
+            Copies with fitness cleared; they are re-backtested on the new window
+        """
+        count = min(math.ceil(fraction * self.settings.population_size),
+                    self.settings.population_size - reserved)
+        if count <= 0:
+            return []
+        ranked = sorted(
+            (ind for ind in self.last_generation if ind.fitness is not None),
+            key=lambda ind: ind.fitness, reverse=True
+        )
+        seeds, seen = [], set()
+        for ind in ranked:
+            key = (tuple(ind.genes), tuple(ind.trading_pairs))
+            if key in seen:
+                continue
+            seen.add(key)
+            seed = ind.copy()
+            seed.fitness = None
+            seeds.append(seed)
+            if len(seeds) >= count:
+                break
+        if seeds:
+            logger.info(f"Warm-starting the next fold with {len(seeds)} genomes from this one")
+        return seeds
+
+    def _warm_fold_optimizer(self) -> 'GeneticOptimizer':
+        """Optimizer for a warm-started fold, with walk_forward_warm_generations if set."""
+        generations = getattr(self.settings, 'walk_forward_warm_generations', None)
+        if not generations:
+            return self
+        settings = copy.copy(self.settings)
+        settings.generations = generations
+        return type(self)(settings, self.parameters, self.all_pairs)
+
+    def _run_fold(
+        self,
+        period: Any,
+        num_periods: int,
+        initial_individuals: List[Individual],
+        evaluator: PoolEvaluator,
+        segments: Optional[SegmentStore] = None,
+        budget: Optional[Budget] = None
+    ) -> Optional[Tuple[List[Tuple[int, Individual]], Dict[str, Any], List[Any]]]:
+        """
+        Train on one fold's window and submit the finalists' test backtests.
+
+        The winner is tested along with up to walk_forward_test_finalists - 1
+        more hall-of-fame genomes. With a SegmentStore each test is the
+        candidate's full-range backtest, shared with any other fold that
+        tests the same genome.
+
+        Returns:
+            (training results, fold summary, handles of the pending test
+            backtests with the winner's first), or None if training failed
+        """
+        logger.info(f"=== Fold {period.fold_number + 1}/{num_periods} ===")
+        logger.info(f"Train: {period.train_timerange} ({period.train_weeks} weeks)")
+        logger.info(f"Test: {period.test_timerange} ({period.test_weeks} weeks)")
+
+        # Run training
+        train_results = self._run_fold_optimization(
+            period.train_timerange,
+            initial_individuals,
+            f"fold{period.fold_number}_train",
+            evaluator,
+            budget
+        )
+
+        if not train_results:
+            if self.stopped_on_budget:
+                logger.warning(f"Fold {period.fold_number + 1} skipped: {self.stop_reason}")
+            else:
+                logger.warning(f"Fold {period.fold_number + 1} training failed")
+            return None
+
+        # Get best individual from training
+        best_train = max(train_results, key=lambda x: x[1].fitness)
+
+        # Validate on test period; collected once all folds have trained
+        finalists = self.get_finalists()
+        count = getattr(self.settings, 'walk_forward_test_finalists', 1)
+        tested = [best_train[1]] + [
+            ind for ind in finalists if genome_key(ind) != genome_key(best_train[1])
+        ][:count - 1]
+        test_handles = [
+            self._submit_on_period(ind, period.test_timerange, evaluator, segments)
+            for ind in tested
+        ]
+
+        return train_results, {
+            'fold': period.fold_number,
+            'train_fitness': best_train[1].fitness,
+            'best_individual': best_train[1],
+            'finalists': finalists,
+            'tested_finalists': tested,
+            'train_period': period.train_timerange,
+            'test_period': period.test_timerange
+        }, test_handles
+
     def _run_fold_optimization(
         self,
         timerange: str,
         initial_individuals: List[Individual],
-        fold_name: str
+        fold_name: str,
+        evaluator: Optional[PoolEvaluator] = None,
+        budget: Optional[Budget] = None
     ) -> List[Tuple[int, Individual]]:
         """Run optimization for a single fold on that fold's training window."""
         # Folds do not checkpoint: fold state is cheap to recompute and a shared
@@ -415,23 +1056,79 @@ class GeneticOptimizer(BaseOptimizer):
             initial_individuals,
             timerange=timerange,
             checkpoint_name=None,
+            evaluator=evaluator,
+            budget=budget,
         )
 
-    def _evaluate_on_period(self, individual: Individual, timerange: str) -> float:
-        """Evaluate an individual on a specific time period."""
+    def _submit_on_period(self, individual: Individual, timerange: str,
+                          evaluator: PoolEvaluator,
+                          segments: Optional[SegmentStore] = None) -> Any:
+        """Start a backtest of an individual on a specific time period."""
+        if segments is not None:
+            return segments.submit(evaluator, individual.genes, individual.trading_pairs, timerange)
+        return evaluator.submit(
+            run_backtest,
+            individual.genes,
+            individual.trading_pairs,
+            generation=0,
+            custom_timerange=timerange,
+            num_parameters=len(self.parameters)
+        )
+
+    def _collect_on_period(self, handle: Any, timerange: str) -> float:
+        """Wait for a backtest started by ``_submit_on_period`` and return its fitness."""
         try:
-            fitness = run_backtest(
-                individual.genes,
-                individual.trading_pairs,
-                generation=0,
-                custom_timerange=timerange,
-                num_parameters=len(self.parameters)
-            )
+            fitness = handle.get()
             return fitness if fitness is not None else float('-inf')
         except Exception as e:
             logger.error(f"Error evaluating on period {timerange}: {e}")
             return float('-inf')
 
+    def _summarize_finalist_tests(self, fold_result: Dict[str, Any], test_scores: List[float]) -> None:
+        """Record the finalists' test distribution and its rank agreement with training."""
+        train_scores = [ind.fitness for ind in fold_result['tested_finalists']]
+        fold_result['finalist_train_fitness'] = train_scores
+        fold_result['finalist_test_fitness'] = test_scores
+        fold_result['train_test_correlation'] = rank_correlation(train_scores, test_scores)
+
+        finite = sorted(score for score in test_scores if score != float('-inf'))
+        summary = f"{len(finite)}/{len(test_scores)} scored"
+        if finite:
+            summary += (f", test min {finite[0]:.4f}, median {finite[len(finite) // 2]:.4f}, "
+                        f"max {finite[-1]:.4f}")
+        if fold_result['train_test_correlation'] is not None:
+            summary += f", train/test rank correlation {fold_result['train_test_correlation']:.3f}"
+        logger.info(f"Fold {fold_result['fold'] + 1} finalists: {summary}")
+
+    def _cpcv_on_segments(self, individual: Individual, segments: SegmentStore,
+                          evaluator: PoolEvaluator) -> List[float]:
+        """Fitness on the test groups of every CPCV split, from one full-range backtest."""
+        groups = self.settings.cpcv_groups
+        test_groups = getattr(self.settings, 'cpcv_test_groups', 2)
+        try:
+            backtest = segments.backtest(evaluator, individual.genes, individual.trading_pairs)
+            scores = backtest.cpcv_fitness(groups, test_groups, len(self.parameters), segments.reset_equity)
+        except Exception as e:
+            logger.error(f"Error scoring CPCV splits: {e}")
+            return []
+        logger.info(
+            f"CPCV over {len(scores)} splits ({groups} groups, {test_groups} held out): "
+            f"mean {sum(scores) / len(scores):.4f}, worst {min(scores):.4f}"
+        )
+        return scores
+
+    def get_finalists(self, k: Optional[int] = None) -> List[Individual]:
+        """
+        Get the best distinct individuals of the last run, best first.
+
+        Args:
+            k: Maximum number of finalists; None returns the whole hall of fame
+
+        Returns:
+            List of Individuals from the hall of fame
+        """
+        return self.hall_of_fame.top(k)
+
     def get_best_individual(self) -> Individual:
         """
         Get the best individual found during optimization.
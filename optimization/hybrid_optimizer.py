@@ -0,0 +1,151 @@
+"""Two-phase search: GA exploration, then Optuna refinement.
+
+The GA covers a large, rugged space well but converges slowly once it has
+found the right region. TPE and CMA-ES refine a region efficiently but need
+many trials to find it on their own. ``HybridOptimizer`` runs the GA for
+``hybrid_ga_generations`` generations, then hands everything it evaluated to
+an Optuna study:
+
+  * every GA evaluation is added to the study as a completed trial
+    (``study.add_trials``), so TPE starts with a model instead of random
+    startup trials. The hall of fame's best genome is the CMA-ES start point
+  * both phases share one fitness cache, so Optuna trials that land on a
+    genome the GA already backtested cost nothing
+  * both phases backtest on one ``PoolEvaluator``; the Optuna phase runs
+    the ask/tell driver with constant-liar TPE on it
+
+The refinement study is kept in memory, so it never touches a stored
+``--optimizer optuna`` study, and a hybrid run cannot be resumed.
+"""
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+from genetic_algorithm.hall_of_fame import HallOfFame
+from genetic_algorithm.individual import Individual
+from optimization.base_optimizer import BaseOptimizer
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from optimization.genetic_optimizer import GeneticOptimizer
+from optimization.optuna_optimizer import OptunaOptimizer, cache_key
+from utils.logging_config import logger
+
+
+class HybridOptimizer(BaseOptimizer):
+    """GA for hybrid_ga_generations, then Optuna seeded with the GA's history."""
+
+    def __init__(self, settings: Any, parameters: List[Dict], all_pairs: List[str]):
+        """
+        Args:
+            settings: Settings object containing optimization configuration
+            parameters: List of parameter definitions for optimization
+            all_pairs: List of all available trading pairs
+        """
+        super().__init__(settings, parameters)
+        self.all_pairs = all_pairs
+        self.best_individual: Optional[Individual] = None
+        self.hall_of_fame = HallOfFame(getattr(settings, 'hall_of_fame_size', 10))
+        self.ga: Optional[GeneticOptimizer] = None
+        self.refiner: Optional[OptunaOptimizer] = None
+
+        # Default split: half the generations explore, the other half's
+        # worth of backtests refine
+        self.ga_generations = getattr(settings, 'hybrid_ga_generations', None) \
+            or max(1, settings.generations // 2)
+        self.ga_generations = min(self.ga_generations, settings.generations)
+        self.optuna_trials = getattr(settings, 'hybrid_optuna_trials', None) \
+            or max(1, settings.generations - self.ga_generations) * settings.population_size
+
+    def _ga_settings(self) -> Any:
+        settings = copy.copy(self.settings)
+        settings.generations = self.ga_generations
+        return settings
+
+    def _refiner_settings(self) -> Optional[Any]:
+        """Settings for the Optuna phase; None if the GA used up the budget."""
+        settings = copy.copy(self.settings)
+        settings.optuna_n_trials = self.optuna_trials
+        settings.optuna_storage = 'memory'
+        settings.optuna_ask_tell = True
+        settings.optuna_workers = 1
+        max_evaluations = getattr(self.settings, 'max_evaluations', None)
+        if max_evaluations is not None:
+            settings.max_evaluations = max_evaluations - self.ga.budget.evaluations
+            if settings.max_evaluations <= 0:
+                return None
+        max_runtime_minutes = getattr(self.settings, 'max_runtime_minutes', None)
+        if max_runtime_minutes:
+            settings.max_runtime_minutes = max_runtime_minutes - self.ga.budget.elapsed / 60
+            if settings.max_runtime_minutes <= 0:
+                return None
+        return settings
+
+    def optimize(self, initial_individuals: List[Individual] = None,
+                 evaluator: Optional[PoolEvaluator] = None) -> List[Tuple[int, Individual]]:
+        """
+        Run the GA phase, then the Optuna phase.
+
+        Args:
+            initial_individuals: Optional list of individuals seeding the GA
+            evaluator: Worker pool for both phases; None creates one with
+                pool_processes workers for this run only
+
+        Returns:
+            List of (generation, best individual): the GA's generations,
+            followed by one entry per population_size Optuna trials
+        """
+        owns_evaluator = evaluator is None
+        if owns_evaluator:
+            evaluator = create_evaluator_from_settings(self.settings)
+
+        try:
+            logger.info(f"Hybrid phase 1: {self.ga_generations} GA generations")
+            self.ga = GeneticOptimizer(self._ga_settings(), self.parameters, self.all_pairs)
+            ga_results = self.ga.optimize(initial_individuals, checkpoint_name=None,
+                                          evaluator=evaluator)
+            self.hall_of_fame.update(self.ga.hall_of_fame.top())
+
+            refiner_settings = self._refiner_settings()
+            if refiner_settings is None:
+                logger.info("Hybrid: budget used by the GA phase; skipping Optuna refinement")
+                return self._finish(ga_results, [])
+
+            history = list(self.ga.archive.entries)
+            self.refiner = OptunaOptimizer(refiner_settings, self.parameters, self.all_pairs)
+            self.refiner.fitness_cache = {
+                cache_key(genes, pairs): fitness for genes, pairs, fitness in history
+            }
+            best = self.ga.get_best_individual()
+            if best is not None:
+                self.refiner.cmaes_x0 = self.refiner.trial_params(best.genes, best.trading_pairs)
+
+            logger.info(f"Hybrid phase 2: {self.refiner.n_trials} Optuna trials "
+                        f"from {len(history)} GA evaluations")
+            optuna_results = self.refiner.optimize(evaluator=evaluator, history=history)
+            self.hall_of_fame.update([ind for _, ind in optuna_results])
+            return self._finish(ga_results, optuna_results)
+        finally:
+            if owns_evaluator:
+                evaluator.close()
+
+    def _finish(self, ga_results: List[Tuple[int, Individual]],
+                optuna_results: List[Tuple[int, Individual]]) -> List[Tuple[int, Individual]]:
+        """Number the Optuna blocks after the GA generations and pick the overall best."""
+        offset = max((gen for gen, _ in ga_results), default=0)
+        results = list(ga_results) + [
+            (offset + index + 1, ind) for index, (_, ind) in enumerate(optuna_results)
+        ]
+        candidates = [ind for _, ind in results if ind.fitness is not None]
+        self.best_individual = max(candidates, key=lambda ind: ind.fitness, default=None)
+        return results
+
+    def get_finalists(self, k: Optional[int] = None) -> List[Individual]:
+        """Best distinct genomes of both phases, best first."""
+        return self.hall_of_fame.top(k)
+
+    def get_best_individual(self) -> Individual:
+        """
+        Get the best individual found during optimization.
+
+        Returns:
+            The best Individual found
+        """
+        return self.best_individual
@@ -0,0 +1,138 @@
+"""Append-only journal of finished backtests.
+
+The generation checkpoint is written only between generations, so a crash
+late in a long generation loses every backtest that generation had already
+finished. The journal closes that gap. Each finished evaluation is
+appended as one JSON line and fsync'd before the next one is recorded. On
+``--resume`` the optimizer loads the checkpoint, then takes the fitness of
+any genome the journal already holds for the same timerange instead of
+backtesting it again. Only evaluations that had not finished are submitted.
+
+Entries are keyed by genome and timerange, not by generation. A resumed
+run regenerates the interrupted generation from the checkpoint, and
+whatever it contains that had finished is found. Each checkpoint covers
+everything before it. When one is queued the journal is rotated aside, and
+the rotated file is deleted once the checkpoint is safely on disk.
+"""
+import contextlib
+import json
+import os
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence
+
+from utils.logging_config import logger
+
+
+def _plain(value: Any) -> Any:
+    """JSON fallback for NumPy scalars in gene lists."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _key(genes: Sequence, trading_pairs: Sequence, timerange: Optional[str]) -> str:
+    return json.dumps([list(genes), list(trading_pairs), timerange], default=_plain)
+
+
+class EvaluationJournal:
+    """Fsync'd JSON-lines log of (genome, timerange) -> fitness.
+
+    ``record`` only appends to the file. ``load`` reads what an earlier,
+    interrupted invocation left behind, and ``take`` replays it.
+    """
+
+    def __init__(self, path: str, lock: Optional[ContextManager] = None):
+        """
+        Args:
+            path: Journal file; created on the first record
+            lock: Held while a line is appended, for journals that several
+                processes write to (e.g. a ``multiprocessing.Lock``)
+        """
+        self.path = path
+        self._lock = lock if lock is not None else contextlib.nullcontext()
+        self.rotated_path = path + '.prev'
+        self._entries: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(fitnesses) for fitnesses in self._entries.values())
+
+    def load(self) -> int:
+        """Read the entries written so far; returns how many were found.
+
+        A line cut short by the crash is skipped.
+        """
+        self._entries = {}
+        for entry in self.entries():
+            key = _key(entry['genes'], entry['trading_pairs'], entry['timerange'])
+            self._entries.setdefault(key, []).append(entry['fitness'])
+        return len(self)
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Stream the entries on disk, oldest first, one line at a time.
+
+        Unreadable lines are logged and skipped.
+        """
+        # A rotated file is still here if its checkpoint never made it to disk.
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        entry['fitness'] = float(entry['fitness'])
+                        _key(entry['genes'], entry['trading_pairs'], entry['timerange'])
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Skipping unreadable journal line in {path}")
+                        continue
+                    yield entry
+
+    def take(self, genes: Sequence, trading_pairs: Sequence,
+             timerange: Optional[str]) -> Optional[float]:
+        """Journaled fitness of a genome on ``timerange``, or None.
+
+        Each loaded entry is replayed once. Later evaluations of the same
+        genome, such as an elite carried into the next generation, are
+        backtested as they would have been without the crash.
+        """
+        fitnesses = self._entries.get(_key(genes, trading_pairs, timerange))
+        return fitnesses.pop(0) if fitnesses else None
+
+    def record(self, genes: Sequence, trading_pairs: Sequence, timerange: Optional[str],
+               fitness: float, generation: int) -> None:
+        """Append one finished evaluation and force it to disk (for the next resume)."""
+        line = json.dumps({
+            'generation': generation,
+            'genes': list(genes),
+            'trading_pairs': list(trading_pairs),
+            'timerange': timerange,
+            'fitness': fitness,
+        }, default=_plain)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock, open(self.path, 'a') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rotate(self) -> None:
+        """Move the entries so far aside while a checkpoint covering them is written."""
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.rotated_path):
+            # The previous checkpoint failed to write; keep its entries too.
+            with open(self.path, 'r') as src, open(self.rotated_path, 'a') as dst:
+                dst.write(src.read())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated_path)
+
+    def discard_rotated(self) -> None:
+        """Delete the rotated entries once their checkpoint is on disk."""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def clear(self) -> None:
+        """Drop every entry, on disk and in memory."""
+        self._entries = {}
+        for path in (self.path, self.rotated_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,316 @@
+"""NSGA-II multi-objective optimizer.
+
+``fitness_function`` folds profit, risk and trade statistics into one
+hand-weighted scalar, so every change of weights means a new search. This
+optimizer keeps the metrics vector that ``parse_backtest_results`` produces
+and ranks candidates by Pareto dominance over a configurable set of
+objectives instead. One run returns the whole trade-off front, and operating
+points can be picked from it afterwards.
+
+Candidates that ``fitness_function`` disqualifies (fitness <= 0) or whose
+backtest failed are infeasible: they rank behind every feasible front,
+ordered by their scalar fitness.
+"""
+import gc
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from optimization.base_optimizer import BaseOptimizer
+from genetic_algorithm.batch_operators import generation_seed
+from genetic_algorithm.individual import Individual
+from genetic_algorithm.population import Population
+from genetic_algorithm.operators import crossover, mutate
+from optimization.budget import create_budget_from_settings
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from strategy.backtest import run_backtest_metrics
+from utils.logging_config import logger
+
+
+DEFAULT_OBJECTIVES = ['total_profit_percent', 'sortino_ratio', '-max_drawdown']
+
+
+def parse_objectives(objectives: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Split objective specs into metric names and signs.
+
+    A leading ``-`` marks a metric to minimise; everything else is maximised.
+
+    Returns:
+        (metric names, array of +1/-1 signs)
+    """
+    names, signs = [], []
+    for spec in objectives:
+        minimise = spec.startswith('-')
+        names.append(spec[1:] if minimise else spec)
+        signs.append(-1.0 if minimise else 1.0)
+    return names, np.asarray(signs)
+
+
+def fast_non_dominated_sort(objectives: np.ndarray) -> List[np.ndarray]:
+    """
+    Partition points into Pareto fronts (all objectives maximised).
+
+    The dominance relation is computed for every pair at once with
+    broadcasting, then fronts are peeled off by decrementing domination
+    counts.
+
+    Args:
+        objectives: Array of shape (n, m)
+
+    Returns:
+        List of index arrays, best front first
+    """
+    values = np.asarray(objectives, dtype=float)
+    if len(values) == 0:
+        return []
+    left, right = values[:, None, :], values[None, :, :]
+    # dominates[i, j]: i is no worse than j everywhere and better somewhere
+    dominates = (left >= right).all(axis=2) & (left > right).any(axis=2)
+    counts = dominates.sum(axis=0)
+    remaining = np.ones(len(values), dtype=bool)
+
+    fronts = []
+    current = np.flatnonzero(counts == 0)
+    while current.size:
+        fronts.append(current)
+        remaining[current] = False
+        counts = counts - dominates[current].sum(axis=0)
+        current = np.flatnonzero(remaining & (counts == 0))
+    return fronts
+
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """
+    Crowding distance of each point within one front.
+
+    Boundary points of every objective get infinity so the extremes of the
+    front are always kept.
+    """
+    values = np.asarray(objectives, dtype=float)
+    n = len(values)
+    if n <= 2:
+        return np.full(n, np.inf)
+    order = np.argsort(values, axis=0)
+    ordered = np.take_along_axis(values, order, axis=0)
+    span = ordered[-1] - ordered[0]
+    span[span == 0] = 1.0
+
+    gaps = np.empty_like(ordered)
+    gaps[1:-1] = (ordered[2:] - ordered[:-2]) / span
+    gaps[[0, -1]] = np.inf
+    per_objective = np.empty_like(gaps)
+    np.put_along_axis(per_objective, order, gaps, axis=0)
+    return per_objective.sum(axis=1)
+
+
+class NSGA2Optimizer(BaseOptimizer):
+    """Pareto-ranking evolutionary optimizer over raw backtest metrics."""
+
+    def __init__(self, settings: Any, parameters: List[Dict], all_pairs: List[str]):
+        """
+        Initialize the NSGA-II optimizer.
+
+        Args:
+            settings: Settings object containing optimization configuration
+            parameters: List of parameter definitions for optimization
+            all_pairs: List of all available trading pairs
+        """
+        super().__init__(settings, parameters)
+        self.all_pairs = all_pairs
+        self.objective_specs = list(getattr(settings, 'nsga2_objectives', None) or DEFAULT_OBJECTIVES)
+        self.objective_names, self.objective_signs = parse_objectives(self.objective_specs)
+        self.best_individual: Optional[Individual] = None
+        self.pareto_front: List[Individual] = []
+        self.budget = create_budget_from_settings(settings)
+        # As in the GA: with ga_seed each generation's draws derive from
+        # (seed, generation), from this optimizer's own generator.
+        self.seed: Optional[int] = getattr(settings, 'ga_seed', None)
+        self.random = random.Random()
+
+    def _seed_generation(self, generation: int) -> None:
+        """Reseed this optimizer's generator for ``generation`` when a seed is set."""
+        if self.seed is not None:
+            self.random.seed(generation_seed(self.seed, generation))
+
+    def _objective_matrix(self, individuals: List[Individual]) -> np.ndarray:
+        """Metrics as an (n, m) array, signed so that larger is always better."""
+        rows = [[ind.metrics[name] for name in self.objective_names] for ind in individuals]
+        matrix = np.asarray(rows, dtype=float).reshape(len(individuals), len(self.objective_names))
+        return matrix * self.objective_signs
+
+    def _is_feasible(self, ind: Individual) -> bool:
+        metrics = ind.metrics or {}
+        return (ind.fitness is not None and ind.fitness > 0
+                and all(name in metrics for name in self.objective_names))
+
+    def _rank(self, individuals: List[Individual]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pareto rank and crowding distance for each individual.
+
+        Infeasible individuals share the rank after the last feasible front;
+        their scalar fitness stands in for crowding so the least bad of them
+        are preferred.
+        """
+        n = len(individuals)
+        ranks = np.zeros(n, dtype=int)
+        crowding = np.zeros(n)
+        feasible = np.array([self._is_feasible(ind) for ind in individuals], dtype=bool)
+        feasible_idx = np.flatnonzero(feasible)
+
+        fronts = fast_non_dominated_sort(self._objective_matrix([individuals[i] for i in feasible_idx]))
+        for rank, front in enumerate(fronts):
+            members = feasible_idx[front]
+            ranks[members] = rank
+            crowding[members] = crowding_distance(
+                self._objective_matrix([individuals[i] for i in members])
+            )
+
+        for i in np.flatnonzero(~feasible):
+            ranks[i] = len(fronts)
+            fitness = individuals[i].fitness
+            crowding[i] = fitness if fitness is not None else float('-inf')
+        return ranks, crowding
+
+    def _select(self, individuals: List[Individual], ranks: np.ndarray,
+                crowding: np.ndarray) -> Individual:
+        """Binary tournament on (rank, crowding distance)."""
+        a, b = self.random.sample(range(len(individuals)), 2) if len(individuals) > 1 else (0, 0)
+        if (ranks[a], -crowding[a]) <= (ranks[b], -crowding[b]):
+            return individuals[a]
+        return individuals[b]
+
+    def _breed(self, parents: List[Individual], size: int) -> List[Individual]:
+        """Produce ``size`` offspring by crowded tournament, crossover and mutation."""
+        ranks, crowding = self._rank(parents)
+        offspring = [self._select(parents, ranks, crowding).copy() for _ in range(size)]
+
+        for i in range(0, len(offspring) - 1, 2):
+            if self.random.random() < self.settings.crossover_prob:
+                offspring[i], offspring[i+1] = crossover(
+                    offspring[i],
+                    offspring[i+1],
+                    with_pair=self.settings.fix_pairs,
+                    rng=self.random
+                )
+
+        for ind in offspring:
+            mutate(ind, self.settings.mutation_prob, rng=self.random)
+            ind.after_genetic_operation(self.parameters)
+            ind.fitness = None
+            ind.metrics = None
+        return offspring
+
+    def _evaluate(self, individuals: List[Individual], gen: int,
+                  timerange: Optional[str], evaluator: PoolEvaluator) -> None:
+        """Backtest ``individuals`` and store fitness and metrics in place."""
+        eval_args = [
+            (ind.genes, ind.trading_pairs, gen + 1, timerange, len(self.parameters))
+            for ind in individuals
+        ]
+        started = self.budget.clock()
+        try:
+            results = evaluator.map(run_backtest_metrics, eval_args)
+        except Exception as e:
+            logger.error(f"Evaluation failed in generation {gen+1}: {type(e).__name__}: {str(e)}")
+            results = [None] * len(individuals)
+        self.budget.record(len(individuals), self.budget.clock() - started)
+
+        for ind, metrics in zip(individuals, results):
+            metrics = metrics or {'fitness': float('-inf')}
+            fitness = metrics.get('fitness')
+            ind.fitness = fitness if fitness is not None else float('-inf')
+            ind.metrics = metrics
+
+    def optimize(self, initial_individuals: List[Individual] = None,
+                 timerange: Optional[str] = None,
+                 evaluator: Optional[PoolEvaluator] = None) -> List[Tuple[int, Individual]]:
+        """
+        Run NSGA-II.
+
+        Args:
+            initial_individuals: Optional individuals to seed the population
+            timerange: Optional custom timerange for backtests
+            evaluator: Worker pool to backtest on; None creates one with
+                pool_processes workers for this run only
+
+        Returns:
+            List of (generation, individual with the best scalar fitness)
+            tuples, so the result is comparable with the other optimizers.
+            The Pareto front is available from ``get_pareto_front``.
+        """
+        population_size = self.settings.population_size
+        logger.info(
+            f"Starting NSGA-II optimization over objectives {self.objective_specs} "
+            f"with population {population_size}"
+        )
+        self._seed_generation(0)
+        population = Population.create_random(
+            size=population_size - len(initial_individuals or []),
+            parameters=self.parameters,
+            trading_pairs=self.all_pairs,
+            num_pairs=None if self.settings.fix_pairs else self.settings.num_pairs,
+            rng=self.random
+        ).individuals + list(initial_individuals or [])
+
+        owns_evaluator = evaluator is None
+        if owns_evaluator:
+            evaluator = create_evaluator_from_settings(self.settings)
+        best_individuals = []
+        self.budget = create_budget_from_settings(self.settings)
+        try:
+            self._evaluate(population, 0, timerange, evaluator)
+            for gen in range(self.settings.generations):
+                if gen > 0 and self.budget.exhausted():
+                    logger.info(f"Stopping before generation {gen + 1}: {self.budget.exhausted()}")
+                    break
+                logger.info(f"NSGA-II generation {gen + 1}")
+                if gen > 0:
+                    self._seed_generation(gen)
+                    # The last generation the budget allows breeds fewer offspring.
+                    brood_size = self.budget.allowance(population_size)
+                    if brood_size < population_size:
+                        logger.info(f"Budget: generation {gen + 1} shrunk to {brood_size} backtests")
+                    offspring = self._breed(population, brood_size)
+                    self._evaluate(offspring, gen, timerange, evaluator)
+                    combined = population + offspring
+                    ranks, crowding = self._rank(combined)
+                    # Whole fronts first, then the least crowded of the cut front.
+                    keep = np.lexsort((-crowding, ranks))[:population_size]
+                    population = [combined[i] for i in keep]
+
+                ranks, _ = self._rank(population)
+                self.pareto_front = [
+                    ind for ind, rank in zip(population, ranks)
+                    if rank == 0 and self._is_feasible(ind)
+                ]
+                best = max(population, key=lambda ind: ind.fitness)
+                if self.best_individual is None or best.fitness > self.best_individual.fitness:
+                    self.best_individual = best.copy()
+                best_individuals.append((gen + 1, best.copy()))
+                logger.info(
+                    f"Generation {gen + 1}: Pareto front of {len(self.pareto_front)}, "
+                    f"best scalar fitness {best.fitness:.4f}"
+                )
+                if self.budget.enabled:
+                    logger.info(f"Budget after generation {gen + 1}: {self.budget.describe()}")
+                gc.collect()
+        finally:
+            if owns_evaluator:
+                evaluator.close()
+
+        return best_individuals
+
+    def get_best_individual(self) -> Individual:
+        """
+        Get the individual with the best scalar fitness found during optimization.
+
+        Returns:
+            The best Individual found
+        """
+        return self.best_individual
+
+    def get_pareto_front(self) -> List[Individual]:
+        """Non-dominated feasible individuals of the final population."""
+        return [ind.copy() for ind in self.pareto_front]
@@ -2,20 +2,114 @@
 
 This module provides Optuna optimization as an alternative to genetic algorithms,
 which can be more efficient for large parameter spaces (Issue #13).
+
+Studies are kept in a SQLite database (or an Optuna journal file) under
+``checkpoint_dir``, named after a fingerprint of the search space, so an
+interrupted study can be continued with ``--resume``. Stored studies can
+also be shared by ``optuna_workers`` processes, each running its own
+``study.optimize`` loop; the parent then reads the results back from storage.
+
+With ``optuna_pruning`` each trial is backtested on growing windows
+(``optuna_fidelity_weeks``, then the full ``backtest_timerange_weeks``) and
+reports its fitness after each one, so the pruner can stop weak trials
+before they pay for the full backtest.
+
+``study.optimize`` with ``optuna_n_jobs`` threads samples every trial
+without knowing what the others are testing. With ``optuna_ask_tell`` the
+optimizer drives the study itself instead: it keeps one trial per
+``pool_processes`` worker in flight on the GA's worker pool, tells each
+result back as soon as it arrives, and samples with TPE's constant liar so
+that trials still running count as explored.
+
+Finished trials are not kept in memory. Each one is appended to a trial
+record next to the stored study, and only the best individual of each
+``population_size`` block of trials is kept as the run goes.
 """
+import hashlib
+import math
+import importlib.util
 import json
 import gc
-from typing import List, Tuple, Dict, Any, Optional
+import os
+from typing import List, Tuple, Dict, Any, Optional, Union
 import multiprocessing
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 
 import optuna
+from optuna.pruners import HyperbandPruner, MedianPruner, NopPruner
 from optuna.samplers import TPESampler, CmaEsSampler
 
 from optimization.base_optimizer import BaseOptimizer
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from optimization.journal import EvaluationJournal
+from optimization.surrogate import DISQUALIFIED_FITNESS
+from genetic_algorithm.encoding import decode_pairs, encode_pairs
 from genetic_algorithm.individual import Individual
 from strategy.backtest import run_backtest
 from utils.logging_config import logger
 
+STORAGE_TYPES = ('sqlite', 'journal', 'memory')
+
+
+def cache_key(genes: List[Any], trading_pairs: List[str]) -> Tuple:
+    """Key of a genome in a fitness cache; pair order and float noise are ignored."""
+    return (tuple(round(g, 10) if isinstance(g, float) else g for g in genes),
+            tuple(sorted(trading_pairs)))
+
+
+def _journal_storage(path: str) -> optuna.storages.BaseStorage:
+    """Optuna journal-file storage, across the Optuna 3 and 4 APIs."""
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # Optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return optuna.storages.JournalStorage(JournalFileBackend(path))
+
+
+def _optuna_worker(settings: Any, parameters: List[Dict], all_pairs: List[str],
+                   study_name: str, n_trials: int, reserved: Any, record_lock: Any) -> None:
+    """
+    Worker process: run trials on the stored study until the workers
+    together have reserved n_trials.
+
+    Each batch of trials is reserved on the shared ``reserved`` counter
+    before it is asked for, so the workers never start more than n_trials.
+    """
+    optimizer = OptunaOptimizer(settings, parameters, all_pairs)
+    optimizer.record = optimizer._open_record(study_name, lock=record_lock)
+    study = optuna.load_study(study_name=study_name,
+                              storage=optimizer._create_storage(study_name),
+                              sampler=optimizer._create_sampler(),
+                              pruner=optimizer._create_pruner())
+    deadline = time.time() + optimizer.timeout if optimizer.timeout else None
+    batch = max(1, getattr(settings, 'optuna_n_jobs', 1))
+    while deadline is None or time.time() < deadline:
+        with reserved.get_lock():
+            count = min(batch, n_trials - reserved.value)
+            if count <= 0:
+                return
+            reserved.value += count
+        optimizer._run_trials(study, count)
+
+
+@dataclass
+class _PendingTrial:
+    """A trial whose current rung is backtesting on the worker pool."""
+    trial: optuna.Trial
+    genes: List[Any]
+    trading_pairs: List[str]
+    rung: int = 0
+    rung_costs: List[List[float]] = field(default_factory=list)
+    started: float = 0.0
+    handle: Any = None
+
+    @property
+    def number(self) -> int:
+        return self.trial.number + 1
+
 
 class OptunaOptimizer(BaseOptimizer):
     """
@@ -37,32 +131,154 @@ class OptunaOptimizer(BaseOptimizer):
         super().__init__(settings, parameters)
         self.all_pairs = all_pairs
         self.best_individual: Optional[Individual] = None
-        self.best_individuals: List[Tuple[int, Individual]] = []
+        self.study: Optional[optuna.Study] = None
+        # Best individual of each population_size block of trials so far
+        self._generation_best: Dict[int, Individual] = {}
+        # Finished trials on disk, for a stored study
+        self.record: Optional[EvaluationJournal] = None
+        # optuna_n_jobs runs _objective on several threads
+        self._lock = threading.Lock()
+        # Fitness by cache_key(genes, trading_pairs), shared with another
+        # optimizer (see HybridOptimizer); None backtests every trial
+        self.fitness_cache: Optional[Dict[Tuple, float]] = None
+        # Starting point for CMA-ES, as trial parameters
+        self.cmaes_x0: Optional[Dict[str, Any]] = None
 
         # Get Optuna-specific settings with defaults
         self.n_trials = getattr(settings, 'optuna_n_trials', settings.generations * settings.population_size)
         self.sampler_type = getattr(settings, 'optuna_sampler', 'tpe')
         self.n_startup_trials = getattr(settings, 'optuna_n_startup_trials', 10)
         self.pruning_enabled = getattr(settings, 'optuna_pruning', False)
+        self.pruner_type = getattr(settings, 'optuna_pruner', 'median')
+        self.n_workers = max(1, getattr(settings, 'optuna_workers', 1))
+        self.ask_tell = getattr(settings, 'optuna_ask_tell', False)
+        self.storage_type = getattr(settings, 'optuna_storage', 'sqlite')
+        if self.storage_type not in STORAGE_TYPES:
+            raise ValueError(f"optuna_storage must be one of {STORAGE_TYPES}, got {self.storage_type!r}")
+
+        # Budget: max_evaluations caps the trial count, not the backtests (a
+        # trial runs one per fidelity rung it reaches); max_runtime_minutes
+        # stops starting new trials once the deadline has passed
+        max_evaluations = getattr(settings, 'max_evaluations', None)
+        if max_evaluations is not None:
+            self.n_trials = min(self.n_trials, max_evaluations)
+        max_runtime_minutes = getattr(settings, 'max_runtime_minutes', None)
+        self.timeout = max_runtime_minutes * 60 if max_runtime_minutes else None
+
+        # Multi-fidelity rungs in weeks; the last is the full backtest window
+        full_weeks = settings.backtest_timerange_weeks
+        self.fidelity_weeks = [full_weeks]
+        if self.pruning_enabled:
+            slices = getattr(settings, 'optuna_fidelity_weeks', [4, 12])
+            self.fidelity_weeks = sorted({w for w in slices if 0 < w < full_weeks}) + [full_weeks]
+        self.end_date = datetime.now()
 
     def _create_sampler(self) -> optuna.samplers.BaseSampler:
         """Create the appropriate sampler based on configuration."""
         if self.sampler_type == 'cmaes':
-            return CmaEsSampler(n_startup_trials=self.n_startup_trials)
+            x0 = None
+            if self.cmaes_x0 is not None:
+                # CMA-ES models numeric parameters only
+                numeric = (optuna.distributions.IntDistribution, optuna.distributions.FloatDistribution)
+                x0 = {name: value for name, value in self.cmaes_x0.items()
+                      if isinstance(self.distributions().get(name), numeric)}
+            return CmaEsSampler(x0=x0, n_startup_trials=self.n_startup_trials)
         else:  # default to TPE
-            return TPESampler(n_startup_trials=self.n_startup_trials)
-
-    def _suggest_parameters(self, trial: optuna.Trial) -> List[Any]:
+            # With trials in flight, pretend running ones scored badly so
+            # the next ones are sampled elsewhere
+            return TPESampler(n_startup_trials=self.n_startup_trials, constant_liar=self.ask_tell)
+
+    def _create_pruner(self) -> optuna.pruners.BasePruner:
+        """Pruner for the fidelity rungs; never prunes unless optuna_pruning is set."""
+        if not self.pruning_enabled or len(self.fidelity_weeks) < 2:
+            return NopPruner()
+        if self.pruner_type == 'hyperband':
+            return HyperbandPruner(min_resource=self.fidelity_weeks[0],
+                                   max_resource=self.fidelity_weeks[-1])
+        return MedianPruner(n_startup_trials=self.n_startup_trials)
+
+    def _fidelity_timerange(self, weeks: int) -> Optional[str]:
+        """Timerange of the most recent ``weeks``; None for the full window."""
+        if weeks == self.fidelity_weeks[-1]:
+            return None
+        start_date = self.end_date - timedelta(weeks=weeks)
+        return f"{start_date.strftime('%Y%m%d')}-{self.end_date.strftime('%Y%m%d')}"
+
+    def study_name(self) -> str:
         """
-        Suggest parameter values for a trial based on parameter definitions.
+        Name of the study: ``optuna_study_name`` if set, else derived from
+        the search space, so the same config always reopens the same study.
+        """
+        configured = getattr(self.settings, 'optuna_study_name', None)
+        if configured:
+            return configured
+        fingerprint = json.dumps({
+            'parameters': [[p.get('name'), p.get('type'), p.get('start'), p.get('end'),
+                            p.get('decimal_places'), p.get('options')] for p in self.parameters],
+            'pairs': list(self.all_pairs),
+            'fix_pairs': self.settings.fix_pairs,
+            'num_pairs': getattr(self.settings, 'num_pairs', None),
+            'sampler': self.sampler_type,
+            'pair_encoding': 'scores',
+            'backtest_timerange_weeks': getattr(self.settings, 'backtest_timerange_weeks', None),
+        }, sort_keys=True, default=str)
+        return f"genetrader_{hashlib.sha1(fingerprint.encode()).hexdigest()[:12]}"
+
+    def _study_path(self, study_name: str) -> str:
+        """Path of the study's files in checkpoint_dir, without extension."""
+        return os.path.abspath(os.path.join(self.settings.checkpoint_dir, f"optuna_{study_name}"))
+
+    def _open_record(self, study_name: str, lock: Any = None) -> Optional[EvaluationJournal]:
+        """
+        Trial record kept next to a stored study; None for in-memory studies.
 
-        Args:
-            trial: Optuna trial object
+        ``lock`` is shared by worker processes appending to the same record.
+        """
+        if self.storage_type == 'memory':
+            return None
+        return EvaluationJournal(f"{self._study_path(study_name)}.trials.jsonl", lock=lock)
+
+    def _create_storage(self, study_name: str) -> Optional[Union[str, optuna.storages.BaseStorage]]:
+        """Storage for the study in checkpoint_dir; None keeps it in memory."""
+        if self.storage_type == 'memory':
+            return None
+        os.makedirs(self.settings.checkpoint_dir, exist_ok=True)
+        path = self._study_path(study_name)
+        if self.storage_type == 'sqlite':
+            if importlib.util.find_spec('sqlalchemy') is not None:
+                return f"sqlite:///{path}.db"
+            logger.warning("optuna_storage 'sqlite' needs SQLAlchemy; using a journal file instead")
+        return _journal_storage(f"{path}.journal")
+
+    def _keep_if_best(self, generation: int, individual: Individual) -> None:
+        """Running maximum per generation and overall; call with the lock held."""
+        best = self._generation_best.get(generation)
+        if best is None or individual.fitness > best.fitness:
+            self._generation_best[generation] = individual
+        if self.best_individual is None or individual.fitness > self.best_individual.fitness:
+            self.best_individual = individual
+
+    def _generation_bests(self) -> List[Tuple[int, Individual]]:
+        """
+        Best individual of each population_size block of trial numbers.
 
-        Returns:
-            List of suggested parameter values
+        For a stored study the trial record is streamed from disk, so trials
+        from earlier invocations and from worker processes are included;
+        best_individual is reset to the best of them.
         """
-        genes = []
+        if self.record is not None:
+            with self._lock:
+                self._generation_best = {}
+                self.best_individual = None
+                for entry in self.record.entries():
+                    individual = Individual(entry['genes'], entry['trading_pairs'], self.parameters)
+                    individual.fitness = entry['fitness']
+                    self._keep_if_best(entry['generation'], individual)
+        return sorted(self._generation_best.items(), key=lambda item: item[0])
+
+    def _gene_distributions(self) -> List[Tuple[str, optuna.distributions.BaseDistribution]]:
+        """(name, distribution) of every gene, in gene order."""
+        distributions = []
         for i, param in enumerate(self.parameters):
             param_name = param.get('name', f'param_{i}')
 
@@ -71,25 +287,64 @@ class OptunaOptimizer(BaseOptimizer):
                     min_val = max(1, int(param['start']))
                 else:
                     min_val = int(param['start'])
-                value = trial.suggest_int(param_name, min_val, int(param['end']))
+                distribution = optuna.distributions.IntDistribution(min_val, int(param['end']))
 
             elif param['type'] == 'Decimal':
-                value = trial.suggest_float(
-                    param_name,
+                distribution = optuna.distributions.FloatDistribution(
                     param['start'],
                     param['end'],
                     step=10 ** (-param.get('decimal_places', 2))
                 )
 
             elif param['type'] == 'Categorical':
-                value = trial.suggest_categorical(param_name, param['options'])
+                distribution = optuna.distributions.CategoricalDistribution(param['options'])
 
             elif param['type'] == 'Boolean':
-                value = trial.suggest_categorical(param_name, [True, False])
+                distribution = optuna.distributions.CategoricalDistribution([True, False])
             else:
                 # Default to float
-                value = trial.suggest_float(param_name, param.get('start', 0), param.get('end', 1))
+                distribution = optuna.distributions.FloatDistribution(
+                    param.get('start', 0), param.get('end', 1))
+
+            distributions.append((param_name, distribution))
+        return distributions
+
+    def distributions(self) -> Dict[str, optuna.distributions.BaseDistribution]:
+        """Every parameter a trial suggests, genes and pair scores."""
+        distributions = dict(self._gene_distributions())
+        if not self.settings.fix_pairs:
+            for pair in self.all_pairs:
+                distributions[self._pair_param(pair)] = optuna.distributions.FloatDistribution(0.0, 1.0)
+        return distributions
+
+    def trial_params(self, genes: List[Any], trading_pairs: List[str]) -> Dict[str, Any]:
+        """Trial parameters that decode to ``genes`` and ``trading_pairs``."""
+        params = {name: gene for (name, _), gene in zip(self._gene_distributions(), genes)}
+        if not self.settings.fix_pairs:
+            scores = encode_pairs(trading_pairs, self.all_pairs)
+            for pair, score in zip(self.all_pairs, scores):
+                params[self._pair_param(pair)] = score
+        return params
+
+    def _suggest_parameters(self, trial: optuna.Trial) -> List[Any]:
+        """
+        Suggest parameter values for a trial based on parameter definitions.
 
+        Args:
+            trial: Optuna trial object
+
+        Returns:
+            List of suggested parameter values
+        """
+        genes = []
+        for param_name, distribution in self._gene_distributions():
+            if isinstance(distribution, optuna.distributions.IntDistribution):
+                value = trial.suggest_int(param_name, distribution.low, distribution.high)
+            elif isinstance(distribution, optuna.distributions.FloatDistribution):
+                value = trial.suggest_float(param_name, distribution.low, distribution.high,
+                                            step=distribution.step)
+            else:
+                value = trial.suggest_categorical(param_name, distribution.choices)
             genes.append(value)
 
         return genes
@@ -98,7 +353,10 @@ class OptunaOptimizer(BaseOptimizer):
         """
         Suggest trading pairs for a trial.
 
-        Uses O(1) set lookups instead of O(n) list filtering for efficiency.
+        Every pair gets a score in [0, 1] and the ``num_pairs`` highest are
+        traded. The search space is then the same for every trial, so the
+        sampler can model which pairs help, instead of a chain of
+        categorical choices whose options depend on the earlier picks.
 
         Args:
             trial: Optuna trial object
@@ -109,20 +367,86 @@ class OptunaOptimizer(BaseOptimizer):
         if self.settings.fix_pairs:
             return self.all_pairs
 
-        # For dynamic pair selection, use categorical suggestions
-        num_pairs = self.settings.num_pairs
-        selected_pairs: List[str] = []
-        selected_set: set = set()  # O(1) lookup instead of O(n) list filtering
-
-        for i in range(num_pairs):
-            # Use set difference for O(1) membership check
-            available = [p for p in self.all_pairs if p not in selected_set]
-            if available:
-                pair = trial.suggest_categorical(f'pair_{i}', available)
-                selected_pairs.append(pair)
-                selected_set.add(pair)
+        scores = [trial.suggest_float(self._pair_param(pair), 0.0, 1.0) for pair in self.all_pairs]
+        return decode_pairs(scores, self.all_pairs, self.settings.num_pairs)
+
+    @staticmethod
+    def _pair_param(pair: str) -> str:
+        """Name of the score parameter for ``pair``."""
+        return f"pair_score:{pair}"
+
+    def _backtest_args(self, genes: List[Any], trading_pairs: List[str],
+                       trial_number: int, rung: int) -> Tuple:
+        """Positional ``run_backtest`` arguments for one fidelity rung."""
+        weeks = self.fidelity_weeks[rung]
+        timerange = self._fidelity_timerange(weeks)
+        min_trades = None
+        if timerange is not None:
+            # The full window's trade floor, scaled to the rung, so a short
+            # window isn't disqualified just for being short
+            full_weeks = self.fidelity_weeks[-1]
+            min_trades = max(1, round(max(full_weeks // 2, 15) * weeks / full_weeks))
+        # num_parameters as the GA and DE pass it, so fitness is on one scale
+        return genes, trading_pairs, trial_number, timerange, len(self.parameters), min_trades
+
+    def _cached_fitness(self, genes: List[Any], trading_pairs: List[str]) -> Optional[float]:
+        """Fitness of a genome already in fitness_cache, or None."""
+        if self.fitness_cache is None:
+            return None
+        return self.fitness_cache.get(cache_key(genes, trading_pairs))
+
+    def _after_rung(self, trial: optuna.Trial, trial_number: int, rung: int, fitness: float,
+                    seconds: float, rung_costs: List[List[float]]) -> bool:
+        """
+        Record a finished rung and report it to the pruner.
 
-        return selected_pairs if selected_pairs else self.all_pairs[:num_pairs]
+        Returns:
+            True if the trial should be pruned instead of continuing
+        """
+        if not self.pruning_enabled:
+            return False
+        weeks = self.fidelity_weeks[rung]
+        rung_costs.append([weeks, seconds])
+        trial.set_user_attr('rung_costs', list(rung_costs))
+        # The full window has been paid for; never prune after it
+        if rung == len(self.fidelity_weeks) - 1:
+            return False
+        # Disqualification codes are labels, not scores; the full backtest decides
+        if fitness <= DISQUALIFIED_FITNESS:
+            logger.info(f"Trial {trial_number}: disqualified after {weeks} weeks, not reported")
+            return False
+        trial.report(fitness, step=weeks)
+        if trial.should_prune():
+            logger.info(f"Trial {trial_number}: pruned after {weeks} weeks "
+                        f"(fitness {fitness:.6f})")
+            return True
+        return False
+
+    def _complete_trial(self, trial: optuna.Trial, trial_number: int, genes: List[Any],
+                        trading_pairs: List[str], fitness: float) -> float:
+        """Store a finished trial's genome and track the best individual."""
+        # Stored with the trial so results can be rebuilt from storage
+        trial.set_user_attr('genes', genes)
+        trial.set_user_attr('trading_pairs', trading_pairs)
+
+        # Create individual and track if it's the best
+        individual = Individual(genes, trading_pairs, self.parameters)
+        individual.fitness = fitness
+        generation = trial.number // self.settings.population_size + 1
+
+        with self._lock:
+            if self.fitness_cache is not None:
+                self.fitness_cache[cache_key(genes, trading_pairs)] = fitness
+            self._keep_if_best(generation, individual)
+            if self.record is not None:
+                self.record.record(genes, trading_pairs, None, fitness, generation)
+
+        logger.info(f"Trial {trial_number}: Fitness = {fitness:.6f}")
+
+        # Cleanup
+        gc.collect()
+
+        return fitness
 
     def _objective(self, trial: optuna.Trial, trial_number: int) -> float:
         """
@@ -141,99 +465,282 @@ class OptunaOptimizer(BaseOptimizer):
         # Suggest trading pairs
         trading_pairs = self._suggest_trading_pairs(trial)
 
-        # Run backtest
-        try:
-            fitness = run_backtest(genes, trading_pairs, trial_number)
-
-            if fitness is None:
-                fitness = float('-inf')
-
-            # Create individual and track if it's the best
-            individual = Individual(genes, trading_pairs, self.parameters)
-            individual.fitness = fitness
-
-            # Update best individual
-            if self.best_individual is None or fitness > self.best_individual.fitness:
-                self.best_individual = individual
-
-            # Store this trial's best
-            self.best_individuals.append((trial_number, individual))
-
-            logger.info(f"Trial {trial_number}: Fitness = {fitness:.6f}")
-
-            # Cleanup
-            gc.collect()
-
-            return fitness
+        cached = self._cached_fitness(genes, trading_pairs)
+        if cached is not None:
+            logger.info(f"Trial {trial_number}: scored from cache")
+            return self._complete_trial(trial, trial_number, genes, trading_pairs, cached)
 
+        # Run backtest, rung by rung when pruning
+        try:
+            rung_costs: List[List[float]] = []
+            for rung in range(len(self.fidelity_weeks)):
+                started = time.time()
+                fitness = run_backtest(*self._backtest_args(genes, trading_pairs, trial_number, rung))
+                if fitness is None:
+                    fitness = float('-inf')
+                if self._after_rung(trial, trial_number, rung, fitness,
+                                    time.time() - started, rung_costs):
+                    raise optuna.TrialPruned()
+
+            return self._complete_trial(trial, trial_number, genes, trading_pairs, fitness)
+
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             logger.error(f"Error in trial {trial_number}: {str(e)}")
             return float('-inf')
 
-    def optimize(self, initial_individuals: List[Individual] = None) -> List[Tuple[int, Individual]]:
+    def optimize(self, initial_individuals: List[Individual] = None,
+                 resume: bool = False,
+                 evaluator: Optional[PoolEvaluator] = None,
+                 history: Optional[List[Tuple[List[Any], List[str], float]]] = None
+                 ) -> List[Tuple[int, Individual]]:
         """
         Run Optuna optimization.
 
         Args:
             initial_individuals: Optional list of initial individuals (used for warm start)
+            resume: Continue the stored study with the same name instead of
+                replacing it
+            evaluator: Worker pool for ``optuna_ask_tell``; None creates one
+                with ``pool_processes`` workers for this call
+            history: (genes, trading_pairs, fitness) evaluated elsewhere, added
+                to a new study as completed trials for the sampler to learn from
 
         Returns:
-            List of tuples containing (trial number, best individual)
+            List of tuples containing (generation, best individual), where a
+            generation is a block of population_size trials
         """
-        logger.info(f"Starting Optuna optimization with {self.n_trials} trials")
+        logger.info(f"Starting Optuna optimization with {self.n_trials} trials"
+                    + (f" within {self.timeout / 60:g} minutes" if self.timeout else ""))
         logger.info(f"Using sampler: {self.sampler_type}")
 
         # Create study
         sampler = self._create_sampler()
+        study_name = self.study_name()
+        storage = self._create_storage(study_name)
+        if storage is not None and not resume:
+            try:
+                optuna.delete_study(study_name=study_name, storage=storage)
+                logger.info(f"Replacing stored Optuna study {study_name}")
+            except KeyError:
+                pass
         study = optuna.create_study(
             direction='maximize',
             sampler=sampler,
-            study_name='genetrader_optimization'
+            pruner=self._create_pruner(),
+            study_name=study_name,
+            storage=storage,
+            load_if_exists=resume
         )
+        self.study = study
+        self.record = self._open_record(study_name)
+        if self.record is not None and not resume:
+            self.record.clear()
+
+        finished = 0
+        for trial in study.get_trials(deepcopy=False):
+            if trial.state == optuna.trial.TrialState.RUNNING:
+                # Interrupted by the crash; its backtest never reported back.
+                study.tell(trial.number, state=optuna.trial.TrialState.FAIL)
+            else:
+                finished += trial.state.is_finished()
+        if finished:
+            logger.info(f"Resuming Optuna study {study_name} after {finished} trials")
+        n_trials = max(0, self.n_trials - finished)
+
+        if history and not finished:
+            self._add_history(study, history)
 
         # If we have initial individuals, enqueue them as initial trials
-        if initial_individuals:
+        if initial_individuals and not finished:
             for ind in initial_individuals:
-                params = {}
-                for i, param in enumerate(self.parameters):
-                    param_name = param.get('name', f'param_{i}')
-                    params[param_name] = ind.genes[i]
-                study.enqueue_trial(params)
+                study.enqueue_trial(self.trial_params(ind.genes, ind.trading_pairs))
                 logger.info(f"Enqueued initial individual with fitness: {ind.fitness}")
 
+        if n_trials and self.ask_tell:
+            if self.n_workers > 1:
+                logger.warning("optuna_workers is ignored with optuna_ask_tell; "
+                               "trials run on the pool_processes workers")
+            self._run_batched(study, n_trials, evaluator)
+        elif n_trials and self.n_workers > 1 and storage is not None:
+            self._run_workers(study_name, finished)
+        elif n_trials:
+            if self.n_workers > 1:
+                logger.warning("optuna_workers needs a stored study; running in this process")
+            self._run_trials(study, n_trials)
+
+        # Filter to get best individuals per batch (similar to generations)
+        generation_bests = self._generation_bests()
+
+        # Log best result
+        if self.best_individual is not None:
+            logger.info(f"Best trial: {study.best_trial.number}")
+            logger.info(f"Best value: {study.best_value}")
+            logger.info(f"Best params: {study.best_params}")
+            if self.pruning_enabled:
+                stats = self.get_study_statistics(study)
+                logger.info(f"Pruned {stats['n_pruned_trials']} of {stats['n_trials']} trials "
+                            f"({stats['pruned_fraction']:.0%})")
+                for weeks, cost in stats['rung_costs'].items():
+                    logger.info(f"Rung {weeks} weeks: {cost['backtests']} backtests, "
+                                f"{cost['seconds']:.0f}s")
+
+        return generation_bests
+
+    def _add_history(self, study: optuna.Study,
+                     history: List[Tuple[List[Any], List[str], float]]) -> None:
+        """Add earlier evaluations to the study as completed trials."""
+        distributions = self.distributions()
+        trials = []
+        for genes, trading_pairs, fitness in history:
+            if fitness is None or math.isnan(fitness):
+                continue
+            params = self.trial_params(genes, trading_pairs)
+            try:
+                trials.append(optuna.trial.create_trial(
+                    params=params, distributions=distributions, value=fitness,
+                    user_attrs={'genes': list(genes), 'trading_pairs': list(trading_pairs)}
+                ))
+            except ValueError:
+                # Outside the search space, e.g. a gene from an older range
+                continue
+        study.add_trials(trials)
+        logger.info(f"Added {len(trials)} of {len(history)} earlier evaluations to the study")
+
+    def _run_trials(self, study: optuna.Study, n_trials: int,
+                    callbacks: Optional[List[Any]] = None) -> None:
+        """Run up to n_trials trials of ``study`` in this process."""
         # Run optimization with parallel evaluation if configured
         n_jobs = getattr(self.settings, 'optuna_n_jobs', 1)
 
-        # Create wrapper for objective that includes trial number
-        trial_counter = [0]
+        # Trial numbers come from storage, so they continue across resumes
+        # and stay unique across worker processes
         def objective_wrapper(trial):
-            trial_counter[0] += 1
-            return self._objective(trial, trial_counter[0])
+            return self._objective(trial, trial.number + 1)
 
         study.optimize(
             objective_wrapper,
-            n_trials=self.n_trials,
+            n_trials=n_trials,
+            timeout=self.timeout,
             n_jobs=n_jobs,
-            show_progress_bar=True
+            callbacks=callbacks,
+            show_progress_bar=self.n_workers == 1
         )
 
-        # Log best result
-        logger.info(f"Best trial: {study.best_trial.number}")
-        logger.info(f"Best value: {study.best_value}")
-        logger.info(f"Best params: {study.best_params}")
-
-        # Filter to get best individuals per batch (similar to generations)
-        batch_size = self.settings.population_size
-        generation_bests = []
-
-        for i in range(0, len(self.best_individuals), batch_size):
-            batch = self.best_individuals[i:i + batch_size]
-            if batch:
-                best_in_batch = max(batch, key=lambda x: x[1].fitness if x[1].fitness is not None else float('-inf'))
-                gen_num = (i // batch_size) + 1
-                generation_bests.append((gen_num, best_in_batch[1]))
+    def _run_batched(self, study: optuna.Study, n_trials: int,
+                     evaluator: Optional[PoolEvaluator] = None) -> None:
+        """
+        Ask/tell loop: keep one trial per pool worker in flight and tell each
+        result back as soon as its backtest finishes.
+        """
+        owns_evaluator = evaluator is None
+        if owns_evaluator:
+            evaluator = create_evaluator_from_settings(self.settings)
+        deadline = time.time() + self.timeout if self.timeout else None
+        in_flight: List[_PendingTrial] = []
+        asked = 0
+        try:
+            while True:
+                while (len(in_flight) < evaluator.processes and asked < n_trials
+                       and (deadline is None or time.time() < deadline)):
+                    trial = study.ask()
+                    asked += 1
+                    pending = _PendingTrial(trial, self._suggest_parameters(trial),
+                                            self._suggest_trading_pairs(trial))
+                    cached = self._cached_fitness(pending.genes, pending.trading_pairs)
+                    if cached is not None:
+                        logger.info(f"Trial {pending.number}: scored from cache")
+                        study.tell(trial, self._complete_trial(trial, pending.number, pending.genes,
+                                                               pending.trading_pairs, cached))
+                        continue
+                    self._submit_rung(pending, evaluator)
+                    in_flight.append(pending)
+                if not in_flight:
+                    break
+
+                finished = [pending for pending in in_flight if pending.handle.ready()]
+                if not finished:
+                    time.sleep(0.05)
+                    continue
+                for pending in finished:
+                    in_flight.remove(pending)
+                    if self._advance(study, pending, evaluator):
+                        in_flight.append(pending)
+        finally:
+            if owns_evaluator:
+                evaluator.close()
+
+    def _submit_rung(self, pending: _PendingTrial, evaluator: PoolEvaluator) -> None:
+        """Start the backtest of the pending trial's current rung."""
+        pending.started = time.time()
+        pending.handle = evaluator.submit(run_backtest, *self._backtest_args(
+            pending.genes, pending.trading_pairs, pending.number, pending.rung))
+
+    def _advance(self, study: optuna.Study, pending: _PendingTrial,
+                 evaluator: PoolEvaluator) -> bool:
+        """
+        Handle a finished rung: tell the study the outcome, or submit the
+        next rung.
 
-        return generation_bests if generation_bests else self.best_individuals
+        Returns:
+            True if the trial is still in flight
+        """
+        trial, trial_number = pending.trial, pending.number
+        try:
+            fitness = pending.handle.get()
+        except Exception as e:
+            logger.error(f"Error in trial {trial_number}: {str(e)}")
+            study.tell(trial, float('-inf'))
+            return False
+        if fitness is None:
+            fitness = float('-inf')
+
+        if self._after_rung(trial, trial_number, pending.rung, fitness,
+                            time.time() - pending.started, pending.rung_costs):
+            study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+            return False
+        if pending.rung < len(self.fidelity_weeks) - 1:
+            pending.rung += 1
+            self._submit_rung(pending, evaluator)
+            return True
+        study.tell(trial, self._complete_trial(trial, trial_number, pending.genes,
+                                               pending.trading_pairs, fitness))
+        return False
+
+    def _run_workers(self, study_name: str, finished: int = 0) -> None:
+        """
+        Run the study on optuna_workers processes until n_trials trials,
+        counting the ``finished`` ones already stored, have been run. Each
+        worker keeps its own bookkeeping; results are read back from
+        storage afterwards.
+        """
+        logger.info(f"Running Optuna study {study_name} on {self.n_workers} worker processes")
+        # Trials reserved so far, and the lock the workers append the record under
+        reserved = multiprocessing.Value('i', finished)
+        record_lock = multiprocessing.Lock()
+        workers = [
+            multiprocessing.Process(
+                target=_optuna_worker,
+                args=(self.settings, self.parameters, self.all_pairs, study_name, self.n_trials,
+                      reserved, record_lock),
+                name=f"optuna-worker-{index}"
+            )
+            for index in range(self.n_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+        failed = [worker.name for worker in workers if worker.exitcode]
+        if failed:
+            logger.error(f"Optuna workers exited with errors: {', '.join(failed)}")
 
     def get_best_individual(self) -> Individual:
         """
@@ -252,14 +759,29 @@ class OptunaOptimizer(BaseOptimizer):
             study: Optuna study object
 
         Returns:
-            Dictionary containing study statistics
+            Dictionary containing study statistics. ``rung_costs`` maps each
+            fidelity rung (weeks) to the backtests run on it and their total
+            seconds; ``pruned_fraction`` is the share of finished trials pruned.
         """
+        trials = study.trials
+        n_complete = len([t for t in trials if t.state == optuna.trial.TrialState.COMPLETE])
+        n_pruned = len([t for t in trials if t.state == optuna.trial.TrialState.PRUNED])
+
+        rung_costs: Dict[int, Dict[str, float]] = {}
+        for trial in trials:
+            for weeks, seconds in trial.user_attrs.get('rung_costs', []):
+                cost = rung_costs.setdefault(int(weeks), {'backtests': 0, 'seconds': 0.0})
+                cost['backtests'] += 1
+                cost['seconds'] += seconds
+
         return {
-            'n_trials': len(study.trials),
+            'n_trials': len(trials),
             'best_value': study.best_value,
             'best_params': study.best_params,
             'best_trial_number': study.best_trial.number,
-            'n_complete_trials': len([t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE]),
-            'n_pruned_trials': len([t for t in study.trials if t.state == optuna.trial.TrialState.PRUNED]),
-            'n_failed_trials': len([t for t in study.trials if t.state == optuna.trial.TrialState.FAIL]),
+            'n_complete_trials': n_complete,
+            'n_pruned_trials': n_pruned,
+            'n_failed_trials': len([t for t in trials if t.state == optuna.trial.TrialState.FAIL]),
+            'pruned_fraction': n_pruned / (n_complete + n_pruned) if n_complete + n_pruned else 0.0,
+            'rung_costs': dict(sorted(rung_costs.items())),
         }
@@ -0,0 +1,154 @@
+"""Surrogate fitness model for pre-screening offspring.
+
+Every backtest is a labelled example of (genes, pairs) -> fitness. A random
+forest trained on those examples is far too rough to replace a backtest, but
+it is good enough to rank a pool of freshly bred offspring so that only the
+most promising ones are sent to Freqtrade. The spread of the per-tree
+predictions serves as an uncertainty estimate, and ranking by
+``mean + uncertainty_weight * std`` keeps some budget for regions the model
+has not seen yet.
+
+scikit-learn is optional; without it the surrogate stays disabled.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from genetic_algorithm.batch_operators import generation_seed
+from genetic_algorithm.individual import Individual
+from genetic_algorithm.encoding import encode_genes, encode_pairs
+from utils.stats import rank_correlation
+
+try:
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    np = None
+    RandomForestRegressor = None
+    SKLEARN_AVAILABLE = False
+
+# fitness_function returns -1.0 .. -4.0 as disqualification codes and
+# run_backtest returns -inf for a failed backtest. Those codes are labels,
+# not magnitudes, so the model sees every rejected candidate as one floor.
+DISQUALIFIED_FITNESS = -1.0
+
+
+def _training_target(fitness: Optional[float]) -> float:
+    if fitness is None or not math.isfinite(fitness):
+        return DISQUALIFIED_FITNESS
+    return max(fitness, DISQUALIFIED_FITNESS)
+
+
+class SurrogateModel:
+    """Random-forest regressor from encoded genomes to fitness."""
+
+    def __init__(
+        self,
+        parameters: List[Dict[str, Any]],
+        all_pairs: Optional[List[str]] = None,
+        min_samples: int = 30,
+        uncertainty_weight: float = 1.0,
+        n_estimators: int = 100,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            parameters: Parameter definitions used to encode genes
+            all_pairs: Pairs to one-hot encode; None when pairs are fixed
+            min_samples: Evaluations required before the model is trusted
+            uncertainty_weight: Weight of the per-tree std in the screening score
+            n_estimators: Number of trees in the forest
+            seed: Run seed; with it each forest is seeded from the seed and
+                the generation it is fitted in
+        """
+        if not SKLEARN_AVAILABLE:
+            raise ImportError("scikit-learn is required for the surrogate model")
+        self.parameters = parameters
+        self.all_pairs = all_pairs
+        self.min_samples = min_samples
+        self.uncertainty_weight = uncertainty_weight
+        self.n_estimators = n_estimators
+        self.seed = seed
+        self.features: List[List[float]] = []
+        self.targets: List[float] = []
+        # Generation of the last fit, so a restored model refits the same forest
+        self.generation = 0
+        self._model = None
+
+    def _encode(self, individual: Individual) -> List[float]:
+        return (encode_genes(individual.genes, self.parameters)
+                + encode_pairs(individual.trading_pairs, self.all_pairs))
+
+    @property
+    def ready(self) -> bool:
+        """True once the model has been fitted on enough evaluations."""
+        return self._model is not None
+
+    def add(self, individuals: List[Individual]) -> None:
+        """Record evaluated individuals as training examples."""
+        for ind in individuals:
+            if ind.fitness is None:
+                continue
+            self.features.append(self._encode(ind))
+            self.targets.append(_training_target(ind.fitness))
+
+    def fit(self, generation: Optional[int] = None) -> bool:
+        """Refit on everything recorded so far; returns whether the model is ready.
+
+        Args:
+            generation: Generation the forest is fitted in; None refits for
+                the last one
+        """
+        if generation is not None:
+            self.generation = generation
+        if len(self.targets) < self.min_samples:
+            return False
+        random_state = None if self.seed is None else generation_seed(self.seed, self.generation)
+        model = RandomForestRegressor(n_estimators=self.n_estimators, min_samples_leaf=2,
+                                      random_state=random_state)
+        model.fit(np.asarray(self.features), np.asarray(self.targets))
+        self._model = model
+        return True
+
+    def predict(self, individuals: List[Individual]) -> Tuple[List[float], List[float]]:
+        """Predicted fitness and per-tree standard deviation for each individual."""
+        if not self.ready or not individuals:
+            return [], []
+        X = np.asarray([self._encode(ind) for ind in individuals])
+        per_tree = np.stack([tree.predict(X) for tree in self._model.estimators_])
+        return per_tree.mean(axis=0).tolist(), per_tree.std(axis=0).tolist()
+
+    def screen(self, candidates: List[Individual], keep: int) -> List[Individual]:
+        """Return the ``keep`` candidates with the best optimistic prediction."""
+        if not self.ready or len(candidates) <= keep:
+            return candidates[:keep]
+        means, stds = self.predict(candidates)
+        scores = [m + self.uncertainty_weight * s for m, s in zip(means, stds)]
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in order[:keep]]
+
+    def accuracy(self, individuals: List[Individual], predicted: List[float]) -> Optional[Dict[str, float]]:
+        """Compare earlier predictions against the fitness actually measured.
+
+        Returns rank correlation (what screening depends on) and mean absolute
+        error, or None when there is nothing to compare.
+        """
+        actual = [_training_target(ind.fitness) for ind in individuals]
+        if not predicted or len(predicted) != len(actual):
+            return None
+        mae = sum(abs(p - a) for p, a in zip(predicted, actual)) / len(actual)
+        return {
+            'rank_correlation': rank_correlation(predicted, actual),
+            'mae': mae,
+            'n': len(actual),
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """Training data for checkpoints; the forest itself is refitted on load."""
+        return {'features': self.features, 'targets': self.targets,
+                'generation': self.generation}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.features = list(state.get('features', []))
+        self.targets = list(state.get('targets', []))
+        self.fit(state.get('generation', 0))
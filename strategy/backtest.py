@@ -3,13 +3,15 @@ import json
 import os
 import time
 import random
+import shutil
 import subprocess
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from config.settings import settings
 from utils.logging_config import logger
 from strategy.evaluation import parse_backtest_results, fitness_function
 from strategy.gen_template import generate_dynamic_template
+from strategy.segments import load_exported_trades
 from string import Template
 
 
@@ -74,7 +76,8 @@ def _cleanup_backtest_artifacts(*paths: str) -> None:
 
 
 def run_backtest(genes: list, trading_pairs: list, generation: int,
-                 custom_timerange: str = None, num_parameters: int = 0) -> float:
+                 custom_timerange: str = None, num_parameters: int = 0,
+                 min_trades: int = None) -> float:
     """
     Run a backtest for a strategy with given parameters.
 
@@ -84,10 +87,48 @@ def run_backtest(genes: list, trading_pairs: list, generation: int,
         generation: Current generation number
         custom_timerange: Optional custom timerange (for walk-forward validation)
         num_parameters: Number of parameters (for complexity penalty)
+        min_trades: Trade count below which the strategy is disqualified;
+            None derives it from the length of the timerange
 
     Returns:
         Fitness score for the strategy
     """
+    return run_backtest_metrics(
+        genes, trading_pairs, generation, custom_timerange, num_parameters,
+        min_trades=min_trades
+    )['fitness']
+
+
+def run_backtest_trades(genes: list, trading_pairs: list, timerange: str,
+                        num_parameters: int = 0) -> Dict[str, Any]:
+    """
+    Backtest once over ``timerange`` and keep the individual trades.
+
+    Used by ``strategy.segments`` to score many windows from one run.
+
+    Returns:
+        ``run_backtest_metrics`` output with ``trades``, ``starting_balance``,
+        ``timeframe`` and ``strategy_name`` added
+    """
+    return run_backtest_metrics(
+        genes, trading_pairs, 0, timerange, num_parameters, export_trades=True
+    )
+
+
+def run_backtest_metrics(genes: list, trading_pairs: list, generation: int,
+                         custom_timerange: str = None, num_parameters: int = 0,
+                         export_trades: bool = False,
+                         min_trades: int = None) -> Dict[str, Any]:
+    """
+    Run a backtest and keep the raw metrics next to the scalar fitness.
+
+    Takes the same arguments as ``run_backtest``, plus ``export_trades`` to
+    have freqtrade export the trade list as well.
+
+    Returns:
+        The metrics from ``parse_backtest_results`` plus a ``fitness`` key.
+        A backtest that failed outright returns only ``fitness`` (-inf).
+    """
     timestamp = int(time.time())
     random_id = random.randint(1000, 9999)
     strategy_name = f"GeneTrader_gen{generation}_{timestamp}_{random_id}"
@@ -152,6 +193,13 @@ def run_backtest(genes: list, trading_pairs: list, generation: int,
         "--enable-protections",
         "--cache", "none"
     ]
+    export_dir = None
+    if export_trades:
+        # A directory makes freqtrade name the result file itself, so the
+        # loader just picks up whatever it wrote there.
+        export_dir = os.path.join(settings.results_dir, f"trades_{strategy_name}")
+        os.makedirs(export_dir, exist_ok=True)
+        cmd_args += ["--export", "trades", "--export-filename", export_dir]
 
     backtest_succeeded = False
     for attempt in range(settings.max_retries):
@@ -190,15 +238,24 @@ def run_backtest(genes: list, trading_pairs: list, generation: int,
             f"{generation} (strategy {strategy_name})"
         )
         _cleanup_backtest_artifacts(strategy_file, config_file_name)
-        return float('-inf')
+        if export_dir:
+            shutil.rmtree(export_dir, ignore_errors=True)
+        return {'fitness': float('-inf')}
 
     try:
         parsed_result = parse_backtest_results(output_file)
+        if export_dir:
+            trades, starting_balance = load_exported_trades(export_dir)
+            parsed_result.update(trades=trades, starting_balance=starting_balance,
+                                 timeframe=timeframe, strategy_name=strategy_name)
     finally:
         _cleanup_backtest_artifacts(strategy_file, config_file_name)
+        if export_dir:
+            shutil.rmtree(export_dir, ignore_errors=True)
 
     if parsed_result['total_trades'] == 0:
-        return float('-inf')  # Heavily penalize strategies that don't trade
+        # Heavily penalize strategies that don't trade
+        return dict(parsed_result, fitness=float('-inf'))
 
     # Calculate backtest weeks for fitness function
     backtest_weeks = settings.backtest_timerange_weeks
@@ -213,10 +270,12 @@ def run_backtest(genes: list, trading_pairs: list, generation: int,
         except (ValueError, IndexError):
             pass  # Use default if parsing fails
 
-    return fitness_function(
+    fitness = fitness_function(
         parsed_result, generation, strategy_name, timeframe,
-        num_parameters=num_parameters, backtest_weeks=backtest_weeks
+        num_parameters=num_parameters, backtest_weeks=backtest_weeks,
+        min_trades=min_trades
     )
+    return dict(parsed_result, fitness=fitness)
 
 if __name__ == "__main__":
     # 测试 render_strategy 函数
@@ -180,7 +180,8 @@ def parse_backtest_results(file_path: str) -> Dict[str, Any]:
 def fitness_function(parsed_result: Dict[str, Any], generation: int,
                      strategy_name: str, timeframe: str,
                      num_parameters: int = 0,
-                     backtest_weeks: int = 30) -> float:
+                     backtest_weeks: int = 30,
+                     min_trades: Optional[int] = None) -> float:
     """Calculate fitness score for a trading strategy based on backtest results.
 
     This fitness function is designed to PREVENT OVERFITTING by:
@@ -197,6 +198,7 @@ def fitness_function(parsed_result: Dict[str, Any], generation: int,
         timeframe: Trading timeframe (e.g., "1h", "4h")
         num_parameters: Number of strategy parameters (for complexity penalty)
         backtest_weeks: Number of weeks in backtest period
+        min_trades: Minimum trade count; None derives it from backtest_weeks
 
     Returns:
         Fitness score as a float (higher is better, negative = disqualified)
@@ -223,7 +225,8 @@ def fitness_function(parsed_result: Dict[str, Any], generation: int,
     min_win_rate = getattr(settings, 'min_win_rate', 0.30)
 
     # 1. Minimum trade count for statistical significance
-    min_trades = max(backtest_weeks // 2, 15)
+    if min_trades is None:
+        min_trades = max(backtest_weeks // 2, 15)
     if total_trades < min_trades:
         logger.warning(f"Strategy {strategy_name}: Insufficient trades ({total_trades} < {min_trades})")
         return -1.0
@@ -0,0 +1,377 @@
+"""Segment-level reuse of one full-range backtest.
+
+Walk-forward folds and combinatorial purged cross-validation (CPCV) score a
+candidate on many windows of the same history. Running freqtrade once per
+window repeats the expensive part (loading candles, computing indicators)
+every time. A candidate can instead be backtested once over the whole
+``total_data_weeks`` range with its trades exported. Each trade is tagged
+with the weekly segment it opened and closed in, and any window (or union of
+windows) is then scored by slicing that trade list.
+
+A trade counts towards a selection of segments only if it opened and closed
+inside it. Trades straddling a boundary are dropped, which is the trade-level
+equivalent of purging. Metrics use the same keys and units as
+``parse_backtest_results``, so ``fitness_function`` scores a slice exactly as
+it scores a backtest. With ``reset_equity`` every slice starts from the
+starting balance, as a separate backtest would. Without it the slice starts
+from the balance the full run had reached, and drawdown counts from the
+highest balance seen before the slice.
+
+Slices are not identical to separate backtests: the indicators are already
+warmed up at a window's start, and protections carry state across windows.
+"""
+import glob
+import itertools
+import json
+import math
+import os
+import statistics
+import threading
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from strategy.evaluation import fitness_function
+from utils.logging_config import logger
+
+
+@dataclass
+class Trade:
+    """One closed trade from a freqtrade export, tagged with its segments."""
+    pair: str
+    open_time: datetime
+    close_time: datetime
+    profit_ratio: float
+    profit_abs: float
+    duration_minutes: float
+    open_segment: int = 0
+    close_segment: int = 0
+
+
+def _parse_time(trade: Dict[str, Any], field: str) -> datetime:
+    """Naive UTC datetime of a trade's open or close, from timestamp or date string."""
+    timestamp = trade.get(f'{field}_timestamp')
+    if timestamp is not None:
+        return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).replace(tzinfo=None)
+    moment = datetime.fromisoformat(str(trade[f'{field}_date']))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _trade_from_export(trade: Dict[str, Any]) -> Trade:
+    open_time = _parse_time(trade, 'open')
+    close_time = _parse_time(trade, 'close')
+    duration = trade.get('trade_duration')
+    if duration is None:
+        duration = (close_time - open_time).total_seconds() / 60
+    return Trade(
+        pair=trade.get('pair', ''),
+        open_time=open_time,
+        close_time=close_time,
+        profit_ratio=float(trade.get('profit_ratio', 0.0)),
+        profit_abs=float(trade.get('profit_abs', 0.0)),
+        duration_minutes=float(duration),
+    )
+
+
+def _read_export(path: str) -> Dict[str, Any]:
+    """Read a freqtrade result file; newer versions wrap the JSON in a zip."""
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            names = [name for name in archive.namelist()
+                     if name.endswith('.json') and not name.endswith(('_config.json', '_market_change.json'))]
+            if not names:
+                return {}
+            with archive.open(names[0]) as f:
+                return json.load(f)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_exported_trades(export_dir: str) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+    """
+    Load the trade list of a ``--export trades`` run.
+
+    Args:
+        export_dir: Directory passed to freqtrade as ``--export-filename``
+
+    Returns:
+        (raw trade dicts, starting balance); ([], None) if nothing was exported
+    """
+    candidates = [
+        path for path in glob.glob(os.path.join(export_dir, 'backtest-result-*'))
+        if path.endswith(('.json', '.zip')) and not path.endswith('.meta.json')
+    ]
+    if not candidates:
+        logger.warning(f"No exported trades found in {export_dir}")
+        return [], None
+    try:
+        data = _read_export(max(candidates, key=os.path.getmtime))
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        logger.error(f"Could not read exported trades in {export_dir}: {e}")
+        return [], None
+    for result in data.get('strategy', {}).values():
+        return result.get('trades', []), result.get('starting_balance')
+    return [], None
+
+
+def combinatorial_splits(n_groups: int, n_test_groups: int) -> List[Tuple[int, ...]]:
+    """
+    Test-group selections of combinatorial purged cross-validation.
+
+    Args:
+        n_groups: Contiguous groups the history is cut into
+        n_test_groups: Groups held out for testing in each split
+
+    Returns:
+        Every combination of ``n_test_groups`` group indices, in order
+    """
+    if not 0 < n_test_groups < n_groups:
+        raise ValueError(
+            f"n_test_groups ({n_test_groups}) must be between 1 and n_groups - 1 ({n_groups - 1})"
+        )
+    return list(itertools.combinations(range(n_groups), n_test_groups))
+
+
+def group_segments(total_segments: int, n_groups: int) -> List[range]:
+    """Cut ``total_segments`` weeks into ``n_groups`` contiguous, near-equal groups."""
+    if not 0 < n_groups <= total_segments:
+        raise ValueError(f"Cannot cut {total_segments} weeks into {n_groups} groups")
+    size, extra = divmod(total_segments, n_groups)
+    groups, start = [], 0
+    for index in range(n_groups):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(range(start, end))
+        start = end
+    return groups
+
+
+class SegmentedBacktest:
+    """Trades of one full-range backtest, scored on any selection of weeks."""
+
+    def __init__(
+        self,
+        trades: Iterable[Dict[str, Any]],
+        start: datetime,
+        total_weeks: int,
+        starting_balance: Optional[float] = None,
+        timeframe: str = '',
+        strategy_name: str = ''
+    ):
+        """
+        Args:
+            trades: Raw trade dicts as exported by freqtrade
+            start: Start of the backtested range (start of week segment 0)
+            total_weeks: Length of the backtested range in weeks
+            starting_balance: Wallet at the start; defaults to 1000
+            timeframe: Timeframe of the run, for the fitness log
+            strategy_name: Strategy name of the run, for the fitness log
+        """
+        self.start = start
+        self.total_weeks = total_weeks
+        self.starting_balance = starting_balance or 1000.0
+        self.timeframe = timeframe
+        self.strategy_name = strategy_name
+        self.trades = sorted((_trade_from_export(t) for t in trades), key=lambda t: t.close_time)
+        for trade in self.trades:
+            trade.open_segment = self.segment_of(trade.open_time)
+            trade.close_segment = self.segment_of(trade.close_time)
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], start: datetime, total_weeks: int) -> 'SegmentedBacktest':
+        """Build from the dict returned by ``run_backtest_trades``."""
+        return cls(
+            result.get('trades', []), start, total_weeks,
+            starting_balance=result.get('starting_balance'),
+            timeframe=result.get('timeframe', ''),
+            strategy_name=result.get('strategy_name', ''),
+        )
+
+    def segment_of(self, moment: datetime) -> int:
+        return int((moment - self.start) // timedelta(weeks=1))
+
+    def segments_for(self, timerange: str) -> range:
+        """Week segments covered by a ``YYYYMMDD-YYYYMMDD`` timerange."""
+        start_text, _, end_text = timerange.partition('-')
+        first = self.segment_of(datetime.strptime(start_text, '%Y%m%d'))
+        last = self.segment_of(datetime.strptime(end_text, '%Y%m%d')) if end_text else self.total_weeks
+        return range(max(0, first), min(self.total_weeks, last))
+
+    def metrics(self, segments: Iterable[int], reset_equity: bool = True) -> Dict[str, Any]:
+        """
+        Metrics of the trades that opened and closed inside ``segments``.
+
+        Args:
+            segments: Week segment indices to score
+            reset_equity: Start from the starting balance rather than from the
+                balance the full run had reached
+
+        Returns:
+            Dict with the keys of ``parse_backtest_results``
+        """
+        selected = set(segments)
+        first = min(selected) if selected else 0
+        balance = self.starting_balance
+        peak = balance
+        if not reset_equity:
+            for trade in self.trades:
+                if trade.close_segment >= first:
+                    break
+                balance += trade.profit_abs
+                peak = max(peak, balance)
+
+        base = balance
+        trades = [t for t in self.trades
+                  if t.open_segment in selected and t.close_segment in selected]
+        max_drawdown = 0.0
+        for trade in trades:
+            balance += trade.profit_abs
+            peak = max(peak, balance)
+            if peak > 0:
+                max_drawdown = max(max_drawdown, (peak - balance) / peak)
+
+        wins = [t for t in trades if t.profit_abs > 0]
+        gross_profit = sum(t.profit_abs for t in wins)
+        gross_loss = -sum(t.profit_abs for t in trades if t.profit_abs < 0)
+        if gross_loss > 0:
+            profit_factor = gross_profit / gross_loss
+        else:
+            profit_factor = float('inf') if gross_profit > 0 else 0.0
+
+        # Sharpe and Sortino as freqtrade reports them: per-trade returns on
+        # the starting balance, annualised over the days of the period.
+        days = max(1, len(selected) * 7)
+        returns = [t.profit_abs / base for t in trades] if base > 0 else []
+        expected = sum(returns) / days
+        up_stdev = statistics.pstdev(returns) if len(returns) > 1 else 0.0
+        losses = [r for r in returns if r < 0]
+        down_stdev = statistics.pstdev(losses) if len(losses) > 1 else 0.0
+
+        total_profit = balance - base
+        return {
+            'total_profit_usdt': total_profit,
+            'total_profit_percent': total_profit / base if base > 0 else 0.0,
+            'win_rate': len(wins) / len(trades) if trades else 0.0,
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': expected / up_stdev * math.sqrt(365) if up_stdev else 0.0,
+            'sortino_ratio': expected / down_stdev * math.sqrt(365) if down_stdev else 0.0,
+            'profit_factor': profit_factor,
+            'avg_profit': (sum(t.profit_ratio for t in trades) / len(trades) * 100) if trades else 0.0,
+            'total_trades': len(trades),
+            'daily_avg_trades': len(trades) / days,
+            'avg_trade_duration': (sum(t.duration_minutes for t in wins) / len(wins)) if wins else 0,
+        }
+
+    def fitness(self, segments: Iterable[int], num_parameters: int = 0,
+                reset_equity: bool = True) -> float:
+        """Score a selection of segments with ``fitness_function``."""
+        segments = list(segments)
+        parsed = self.metrics(segments, reset_equity)
+        if parsed['total_trades'] == 0:
+            return float('-inf')
+        return fitness_function(
+            parsed, 0, self.strategy_name, self.timeframe,
+            num_parameters=num_parameters, backtest_weeks=max(1, len(segments))
+        )
+
+    def cpcv_fitness(self, n_groups: int, n_test_groups: int, num_parameters: int = 0,
+                     reset_equity: bool = True) -> List[float]:
+        """Fitness on the test groups of every combinatorial split, in split order."""
+        groups = group_segments(self.total_weeks, n_groups)
+        return [
+            self.fitness([week for g in test for week in groups[g]], num_parameters, reset_equity)
+            for test in combinatorial_splits(n_groups, n_test_groups)
+        ]
+
+
+class _WindowHandle:
+    """Pending full-range backtest, resolved to the fitness on one window."""
+
+    def __init__(self, store: 'SegmentStore', key: Tuple, timerange: str):
+        self._store = store
+        self._key = key
+        self._timerange = timerange
+
+    def get(self, timeout: Optional[float] = None) -> float:
+        backtest = self._store.resolve(self._key, timeout)
+        return backtest.fitness(
+            backtest.segments_for(self._timerange),
+            self._store.num_parameters, self._store.reset_equity
+        )
+
+
+class SegmentStore:
+    """One full-range backtest per distinct candidate, shared by every window."""
+
+    def __init__(self, start: datetime, total_weeks: int, num_parameters: int = 0,
+                 reset_equity: bool = True):
+        """
+        Args:
+            start: Start of the data range; truncated to midnight like timeranges
+            total_weeks: Length of the data range in weeks
+            num_parameters: Passed on to ``fitness_function``
+            reset_equity: Start every window from the starting balance
+        """
+        self.start = datetime.combine(start.date(), time())
+        self.total_weeks = total_weeks
+        self.num_parameters = num_parameters
+        self.reset_equity = reset_equity
+        self._pending: Dict[Tuple, Any] = {}
+        self._resolved: Dict[Tuple, SegmentedBacktest] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timerange(self) -> str:
+        end = self.start + timedelta(weeks=self.total_weeks)
+        return f"{self.start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
+
+    def submit(self, evaluator: Any, genes: Sequence, trading_pairs: Sequence,
+               timerange: str) -> _WindowHandle:
+        """
+        Queue the candidate's full-range backtest unless it already ran.
+
+        Returns:
+            Handle whose ``get()`` waits for the backtest and returns the
+            fitness on ``timerange``
+        """
+        from strategy.backtest import run_backtest_trades
+
+        key = (tuple(genes), tuple(trading_pairs))
+        with self._lock:
+            if key not in self._pending and key not in self._resolved:
+                self._pending[key] = evaluator.submit(
+                    run_backtest_trades, list(genes), list(trading_pairs),
+                    self.timerange, self.num_parameters
+                )
+        return _WindowHandle(self, key, timerange)
+
+    def resolve(self, key: Tuple, timeout: Optional[float] = None) -> SegmentedBacktest:
+        """Wait for a submitted candidate and return its segmented trades."""
+        with self._lock:
+            backtest = self._resolved.get(key)
+            handle = self._pending.get(key)
+        if backtest is not None:
+            return backtest
+        backtest = SegmentedBacktest.from_result(handle.get(timeout), self.start, self.total_weeks)
+        with self._lock:
+            self._resolved[key] = backtest
+            self._pending.pop(key, None)
+        return backtest
+
+    def backtest(self, evaluator: Any, genes: Sequence, trading_pairs: Sequence) -> SegmentedBacktest:
+        """Segmented trades of a candidate, backtesting it first if needed."""
+        handle = self.submit(evaluator, genes, trading_pairs, self.timerange)
+        return self.resolve(handle._key)
+
+
+def create_segment_store_from_settings(settings: Any, start: datetime,
+                                       num_parameters: int = 0) -> SegmentStore:
+    """Create a SegmentStore over total_data_weeks from ``start``."""
+    return SegmentStore(
+        start,
+        getattr(settings, 'total_data_weeks', 52),
+        num_parameters=num_parameters,
+        reset_equity=getattr(settings, 'walk_forward_equity_reset', True),
+    )
@@ -0,0 +1,85 @@
+"""Unit tests for genetic_algorithm/adaptive_mutation.py."""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from genetic_algorithm.adaptive_mutation import AdaptiveMutationRate
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+class TestAdaptiveMutationRate(unittest.TestCase):
+    def controller(self, **overrides):
+        options = dict(base_rate=0.1, max_rate=0.4, diversity_threshold=0.1,
+                       patience=2, step=2.0)
+        options.update(overrides)
+        return AdaptiveMutationRate(**options)
+
+    def test_rate_rises_while_fitness_stalls(self):
+        control = self.controller()
+        rates = [control.update(1.0, diversity=0.5) for _ in range(5)]
+        self.assertEqual(rates[0], 0.1)
+        self.assertEqual(rates[1], 0.1)   # one stalled generation is within patience
+        self.assertEqual(rates[2], 0.2)
+        self.assertEqual(rates[-1], 0.4)  # capped at max_rate
+
+    def test_rate_decays_when_progress_resumes(self):
+        control = self.controller()
+        for _ in range(4):
+            control.update(1.0, diversity=0.5)
+        self.assertEqual(control.rate, 0.4)
+        self.assertEqual(control.update(2.0, diversity=0.5), 0.2)
+        self.assertEqual(control.update(3.0, diversity=0.5), 0.1)
+        self.assertEqual(control.update(4.0, diversity=0.5), 0.1)  # never below base
+
+    def test_collapsed_diversity_raises_rate_immediately(self):
+        control = self.controller()
+        control.update(1.0, diversity=0.5)
+        self.assertEqual(control.update(2.0, diversity=0.01), 0.2)
+
+    def test_max_below_base_keeps_rate_fixed(self):
+        control = self.controller(max_rate=0.05)
+        for _ in range(5):
+            self.assertEqual(control.update(1.0, diversity=0.0), 0.1)
+
+    def test_state_round_trip(self):
+        control = self.controller()
+        for _ in range(3):
+            control.update(1.0)
+        restored = self.controller()
+        restored.set_state(control.get_state())
+        self.assertEqual(restored.rate, control.rate)
+        self.assertEqual(restored.stalled_generations, control.stalled_generations)
+
+
+class TestGeneticOptimizerMutationRate(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_rates(self, **overrides):
+        settings = make_settings(self.temp_dir, generations=5, **overrides)
+        rates = []
+
+        def recording_mutate(individual, rate, resolution=None, rng=None):
+            rates.append(rate)
+
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0), \
+                patch('optimization.genetic_optimizer.mutate', side_effect=recording_mutate):
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(checkpoint_name=None)
+        return rates
+
+    def test_plateau_drives_rate_toward_max(self):
+        rates = self.run_rates()
+        self.assertEqual(rates[0], 0.2)
+        self.assertAlmostEqual(max(rates), 0.4)
+
+    def test_disabled_controller_uses_fixed_rate(self):
+        self.assertEqual(set(self.run_rates(adaptive_mutation=False)), {0.2})
+
+
+if __name__ == '__main__':
+    unittest.main()
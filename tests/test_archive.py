@@ -0,0 +1,143 @@
+"""Unit tests for genetic_algorithm/archive.py and novelty-driven evaluation."""
+import math
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from genetic_algorithm import archive as archive_module
+from genetic_algorithm.archive import EvaluationArchive
+from genetic_algorithm.individual import Individual
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def _individual(genes, fitness=None, pairs=None):
+    ind = Individual(list(genes), list(pairs or PAIRS[:2]), PARAMETERS)
+    ind.fitness = fitness
+    return ind
+
+
+class TestEvaluationArchive(unittest.TestCase):
+    def test_empty_archive_is_infinitely_far(self):
+        archive = EvaluationArchive(PARAMETERS)
+        self.assertEqual(archive.distance(_individual([20, 70])), float('inf'))
+        self.assertEqual(archive.estimate(_individual([20, 70])), float('-inf'))
+
+    def test_distance_is_rms_fraction_of_range(self):
+        archive = EvaluationArchive(PARAMETERS)
+        archive.add([_individual([10, 60], 1.0)])
+        # Both genes moved by their full range: distance 1.
+        self.assertAlmostEqual(archive.distance(_individual([40, 90])), 1.0)
+        # One of two genes moved by its full range: sqrt(1/2).
+        self.assertAlmostEqual(archive.distance(_individual([40, 60])), math.sqrt(0.5))
+
+    def test_exact_match_returns_archived_fitness(self):
+        archive = EvaluationArchive(PARAMETERS)
+        archive.add([_individual([20, 70], 1.5), _individual([30, 80], 0.5)])
+        self.assertEqual(archive.estimate(_individual([20, 70])), 1.5)
+
+    def test_estimate_weights_closer_neighbours_more(self):
+        archive = EvaluationArchive(PARAMETERS)
+        archive.add([_individual([10, 60], 0.0), _individual([40, 90], 1.0)])
+        estimate = archive.estimate(_individual([37, 87]), k=2)
+        self.assertGreater(estimate, 0.5)
+        self.assertLess(estimate, 1.0)
+
+    def test_unscored_individuals_are_not_archived(self):
+        archive = EvaluationArchive(PARAMETERS)
+        archive.add([_individual([20, 70], None)])
+        self.assertEqual(len(archive), 0)
+
+    def test_pairs_count_when_not_fixed(self):
+        archive = EvaluationArchive(PARAMETERS, all_pairs=PAIRS)
+        archive.add([_individual([20, 70], 1.0, pairs=['BTC/USDT', 'ETH/USDT'])])
+        other = _individual([20, 70], pairs=['BTC/USDT', 'SOL/USDT'])
+        self.assertGreater(archive.distance(other), 0.0)
+
+    def test_brute_force_matches_kd_tree(self):
+        individuals = [_individual([10 + i, 60 + 2 * i], i / 10) for i in range(15)]
+        query = _individual([17, 75])
+        with_tree = EvaluationArchive(PARAMETERS)
+        with_tree.add(individuals)
+        with patch.object(archive_module, 'SCIPY_AVAILABLE', False):
+            brute = EvaluationArchive(PARAMETERS)
+            brute.add(individuals)
+            expected = brute.neighbours(query, k=3)
+        for (d1, f1), (d2, f2) in zip(with_tree.neighbours(query, k=3), expected):
+            self.assertAlmostEqual(d1, d2)
+            self.assertEqual(f1, f2)
+
+    def test_state_round_trip(self):
+        archive = EvaluationArchive(PARAMETERS)
+        archive.add([_individual([20, 70], 1.5)])
+        restored = EvaluationArchive(PARAMETERS)
+        restored.set_state(archive.get_state())
+        self.assertEqual(len(restored), 1)
+        self.assertEqual(restored.estimate(_individual([20, 70])), 1.5)
+
+
+class TestNoveltyEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, **overrides):
+        settings = make_settings(self.temp_dir, population_size=6, generations=4, **overrides)
+        seen = []
+
+        def scored(genes, pairs, generation, timerange, num_parameters):
+            seen.append((generation, tuple(genes)))
+            return genes[0] / 40
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+            results = optimizer.optimize(checkpoint_name=None)
+        return optimizer, results, seen
+
+    def test_disabled_backtests_every_individual(self):
+        _, _, seen = self._run()
+        self.assertEqual(len(seen), 6 * 4)
+
+    def test_exact_duplicates_are_not_backtested_twice(self):
+        optimizer, results, seen = self._run(novelty_threshold=1e-6, novelty_max_retries=0)
+        # Twins bred in the same generation are both new; a genome evaluated
+        # in an earlier generation must not be backtested again.
+        first_seen = {}
+        for generation, genes in seen:
+            self.assertEqual(first_seen.setdefault(genes, generation), generation)
+        self.assertLess(len(seen), 6 * 4)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(len(optimizer.archive), len(seen))
+
+    def test_estimates_never_win_a_generation(self):
+        optimizer = GeneticOptimizer(make_settings(self.temp_dir, novelty_threshold=0.3),
+                                     PARAMETERS, PAIRS)
+        measured = _individual([20, 70], 0.5)
+        estimated = _individual([21, 70], 0.9)
+        optimizer.hall_of_fame.update([measured])
+
+        winner = optimizer._generation_winner([estimated, measured], [estimated])
+        self.assertIs(winner, measured)
+
+        # With only estimates left, the best backtest so far stands.
+        winner = optimizer._generation_winner([estimated], [estimated])
+        self.assertEqual((winner.genes, winner.fitness), ([20, 70], 0.5))
+
+    def test_archive_is_checkpointed(self):
+        settings = make_settings(self.temp_dir, generations=2, novelty_threshold=0.05)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=lambda genes, *a: 1.0):
+            optimizer.optimize(checkpoint_name='novelty')
+
+        settings.generations = 3
+        resumed = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=lambda genes, *a: 1.0):
+            resumed.optimize(resume=True, checkpoint_name='novelty')
+        self.assertGreaterEqual(len(resumed.archive), len(optimizer.archive))
+
+
+if __name__ == '__main__':
+    unittest.main()
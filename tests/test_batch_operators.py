@@ -0,0 +1,188 @@
+"""Unit tests for genetic_algorithm/batch_operators.py and seeded GA runs."""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from genetic_algorithm.batch_operators import (
+    generation_rng, genes_to_array, array_to_genes, draw_crossed, batch_crossover,
+    batch_crossover_pairs, batch_mutate
+)
+from genetic_algorithm.individual import Individual
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MIXED = [
+    {'name': 'rsi', 'type': 'Int', 'start': 10, 'end': 40},
+    {'name': 'width', 'type': 'Decimal', 'start': 0.0, 'end': 1.0, 'decimal_places': 2},
+    {'name': 'use_ema', 'type': 'Boolean'},
+    {'name': 'mode', 'type': 'Categorical', 'options': ['fast', 'slow', 'mid']},
+]
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        ind = Individual([25, 0.37, True, 'mid'], [], MIXED)
+        matrix = genes_to_array([ind], MIXED)
+        self.assertEqual(matrix.tolist(), [[25.0, 0.37, 1.0, 2.0]])
+        self.assertEqual(array_to_genes(matrix[0], MIXED), [25, 0.37, True, 'mid'])
+
+
+class TestBatchCrossover(unittest.TestCase):
+    def setUp(self):
+        self.genes = np.array([[1, 2, 3, 4], [5, 6, 7, 8], [9, 9, 9, 9]], dtype=float)
+
+    def test_single_point_swaps_a_tail(self):
+        children = batch_crossover(self.genes, generation_rng(1, 0), 1.0)
+        first, second = children[0].tolist(), children[1].tolist()
+        cut = next(i for i in range(4) if first[i] != self.genes[0, i])
+        self.assertEqual(first, [1, 2, 3, 4][:cut] + [5, 6, 7, 8][cut:])
+        self.assertEqual(second, [5, 6, 7, 8][:cut] + [1, 2, 3, 4][cut:])
+        self.assertEqual(children[2].tolist(), [9, 9, 9, 9])
+
+    def test_uniform_keeps_each_column_pair(self):
+        children = batch_crossover(self.genes, generation_rng(1, 0), 1.0, method='uniform')
+        for col in range(4):
+            self.assertEqual(sorted(children[:2, col]), sorted(self.genes[:2, col]))
+
+    def test_zero_probability_is_identity(self):
+        children = batch_crossover(self.genes, generation_rng(1, 0), 0.0)
+        np.testing.assert_array_equal(children, self.genes)
+
+    def test_pairs_recombined_for_crossed_rows_only(self):
+        rng = generation_rng(1, 0)
+        crossed = np.array([True, False])
+        pairs = [['A', 'B'], ['C'], ['D', 'E'], ['F']]
+        children = batch_crossover_pairs(pairs, crossed, rng)
+        self.assertEqual([len(p) for p in children], [2, 1, 2, 1])
+        self.assertTrue(set(children[0]) | set(children[1]) <= {'A', 'B', 'C'})
+        self.assertEqual(len(set(children[0])), 2)
+        self.assertEqual(children[2:], pairs[2:])
+
+    def test_single_gene_rows_are_never_crossed(self):
+        self.assertFalse(draw_crossed(4, 1, generation_rng(1, 0), 1.0).any())
+
+
+class TestBatchMutate(unittest.TestCase):
+    def test_values_stay_valid(self):
+        genes = genes_to_array([Individual([25, 0.5, False, 'fast'], [], MIXED)] * 200, MIXED)
+        mutated = batch_mutate(genes, MIXED, generation_rng(3, 1), 1.0)
+        self.assertTrue(((mutated[:, 0] >= 10) & (mutated[:, 0] <= 40)).all())
+        self.assertTrue(((mutated[:, 1] >= 0) & (mutated[:, 1] <= 1)).all())
+        self.assertTrue((mutated[:, 2] == 1).all())
+        self.assertTrue(set(mutated[:, 3]) <= {0, 1, 2})
+
+    def test_grid_mutation_always_moves(self):
+        genes = np.full((100, 1), 0.5)
+        mutated = batch_mutate(genes, MIXED[1:2], generation_rng(3, 1), 1.0, resolution=0.25)
+        self.assertTrue(set(np.round(mutated[:, 0], 6)) <= {0.0, 0.25, 0.75, 1.0})
+
+    def test_same_seed_same_result(self):
+        genes = genes_to_array([Individual([25, 0.5, False, 'fast'], [], MIXED)] * 10, MIXED)
+        a = batch_mutate(genes, MIXED, generation_rng(7, 4), 0.5)
+        b = batch_mutate(genes, MIXED, generation_rng(7, 4), 0.5)
+        np.testing.assert_array_equal(a, b)
+
+
+class TestSeededRuns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, settings, **kwargs):
+        seen = []
+
+        def scored(genes, pairs, generation, timerange, num_parameters):
+            seen.append((generation, tuple(genes)))
+            return genes[0] + genes[1] / 100
+
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(**kwargs)
+        return seen
+
+    def _assert_resume_replays(self, **overrides):
+        settings = make_settings(self.temp_dir, population_size=6, generations=4,
+                                 ga_seed=42, **overrides)
+        uninterrupted = self._run(settings, checkpoint_name=None)
+
+        settings.generations = 2
+        self._run(settings, checkpoint_name='seeded')
+        settings.generations = 4
+        resumed = self._run(settings, resume=True, checkpoint_name='seeded')
+
+        self.assertEqual([g for g in uninterrupted if g[0] == 4], [g for g in resumed if g[0] == 4])
+
+    def test_seeded_resume_replays_exactly(self):
+        self._assert_resume_replays()
+
+    def test_seeded_batch_resume_replays_exactly(self):
+        self._assert_resume_replays(batch_operators=True, crossover_method='uniform')
+
+    def test_batch_operators_cross_pairs_like_scalar_path(self):
+        pairs = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT']
+        parents = [frozenset(pairs[:2]), frozenset(pairs[2:])]
+        seeds = [Individual([20 + i, 70 + i], sorted(parents[i % 2]), PARAMETERS) for i in range(6)]
+        for batch in (False, True):
+            with self.subTest(batch_operators=batch):
+                settings = make_settings(self.temp_dir, population_size=6, generations=4,
+                                         crossover_prob=1.0, batch_operators=batch, ga_seed=3)
+                seen = []
+
+                def scored(genes, trading_pairs, *args):
+                    seen.append(frozenset(trading_pairs))
+                    return 1.0
+
+                with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+                    GeneticOptimizer(settings, PARAMETERS, pairs).optimize(
+                        initial_individuals=seeds, checkpoint_name=None)
+                self.assertTrue(set(seen) - set(parents), 'pairs were never recombined')
+
+    def test_seeded_scalar_run_ignores_hash_seed(self):
+        """Genomes of a seeded run must not depend on PYTHONHASHSEED."""
+        script = (
+            "from unittest.mock import patch\n"
+            "from optimization.genetic_optimizer import GeneticOptimizer\n"
+            "from genetic_algorithm.individual import Individual\n"
+            "from tests.test_ga_core import make_settings, PARAMETERS\n"
+            "pairs = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT']\n"
+            "seeds = [Individual([20 + i, 70 + i], pairs[i % 2 * 2:][:2], PARAMETERS)\n"
+            "         for i in range(6)]\n"
+            "settings = make_settings('unused', population_size=6, generations=4,\n"
+            "                         crossover_prob=1.0, ga_seed=3)\n"
+            "seen = []\n"
+            "def scored(genes, trading_pairs, *args):\n"
+            "    seen.append((tuple(genes), tuple(trading_pairs)))\n"
+            "    return float(genes[0])\n"
+            "with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):\n"
+            "    GeneticOptimizer(settings, PARAMETERS, pairs).optimize(\n"
+            "        initial_individuals=seeds, checkpoint_name=None)\n"
+            "print(seen)\n"
+        )
+        outputs = []
+        for hash_seed in ('0', '1'):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            result = subprocess.run([sys.executable, '-c', script], env=env, cwd=PROJECT_ROOT,
+                                    capture_output=True, text=True, check=True)
+            outputs.append(result.stdout.splitlines()[-1])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_batch_operators_run(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=3, batch_operators=True)
+        seen = self._run(settings, checkpoint_name=None)
+        self.assertEqual(len(seen), 18)
+        for _, (buy, sell) in seen:
+            self.assertTrue(10 <= buy <= 40 and 60 <= sell <= 90)
+            self.assertIsInstance(buy, int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Unit tests for optimization/budget.py and budget-limited optimizer runs."""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from optimization.budget import Budget
+from optimization.de_optimizer import DEOptimizer
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, threaded_evaluator, PARAMETERS, PAIRS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBudget(unittest.TestCase):
+    def test_unlimited_by_default(self):
+        budget = Budget()
+        budget.record(10_000, 1.0)
+        self.assertFalse(budget.enabled)
+        self.assertEqual(budget.allowance(50), 50)
+        self.assertIsNone(budget.exhausted())
+
+    def test_evaluation_limit(self):
+        budget = Budget(max_evaluations=10)
+        budget.record(8)
+        self.assertEqual(budget.allowance(5), 2)
+        budget.record(2)
+        self.assertIn('10 backtests', budget.exhausted())
+
+    def test_runtime_limit_uses_observed_speed(self):
+        clock = FakeClock()
+        budget = Budget(max_runtime_minutes=1, clock=clock)
+        # Nothing measured yet: no basis for shrinking.
+        self.assertEqual(budget.allowance(100), 100)
+        clock.now = 40.0
+        budget.record(10, 40.0)
+        self.assertEqual(budget.allowance(10), 5)
+        clock.now = 57.0
+        self.assertIn('runtime limit', budget.exhausted())
+
+    def test_reservations_count_against_the_limit(self):
+        budget = Budget(max_evaluations=10)
+        self.assertEqual(budget.reserve(6), 6)
+        self.assertEqual(budget.reserve(6), 4)
+        self.assertEqual(budget.allowance(1), 0)
+        budget.record(6, reserved=6)
+        budget.record(4, reserved=4)
+        self.assertEqual(budget.reserved, 0)
+        self.assertIsNotNone(budget.exhausted())
+
+    def test_describe(self):
+        budget = Budget(max_evaluations=500, max_runtime_minutes=60, clock=FakeClock())
+        budget.record(37)
+        self.assertEqual(budget.describe(), "37/500 backtests, 0.0/60 min")
+
+
+class TestBudgetedRuns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_ga_shrinks_last_generation_and_keeps_checkpoint(self):
+        settings = make_settings(self.temp_dir, population_size=4, generations=6,
+                                 max_evaluations=10, checkpoint_frequency=0)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0) as backtest, \
+                self.assertLogs('utils.logging_config', level='INFO') as logs:
+            results = optimizer.optimize(checkpoint_name='budget')
+
+        self.assertEqual(backtest.call_count, 10)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(optimizer.stopped_on_budget)
+        self.assertIn('evaluation budget', optimizer.stop_reason)
+        self.assertIn('shrunk to 2 backtests', '\n'.join(logs.output))
+        self.assertTrue(os.path.exists(optimizer._checkpoint_path('budget')))
+
+        # Resuming with a larger budget continues from generation 4.
+        settings.max_evaluations = 14
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0) as backtest:
+            results = GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(
+                resume=True, checkpoint_name='budget')
+        self.assertEqual(backtest.call_count, 4)
+        self.assertEqual(results[-1][0], 4)
+
+    def test_ga_runtime_limit(self):
+        clock = FakeClock()
+        settings = make_settings(self.temp_dir, population_size=4, generations=10)
+
+        def slow(*args):
+            clock.now += 10.0
+            return 1.0
+
+        with patch('optimization.genetic_optimizer.create_budget_from_settings',
+                   return_value=Budget(max_runtime_minutes=1, clock=clock)), \
+                patch('optimization.genetic_optimizer.run_backtest', side_effect=slow) as backtest:
+            optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+            optimizer.optimize(checkpoint_name=None)
+
+        # 10s per backtest: 4 + 2 fit in the minute.
+        self.assertEqual(backtest.call_count, 6)
+        self.assertLessEqual(clock.now, 60.0)
+        self.assertTrue(optimizer.stopped_on_budget)
+
+    def test_walk_forward_folds_share_one_budget(self):
+        for parallel_folds in (1, 3):
+            with self.subTest(parallel_folds=parallel_folds):
+                settings = make_settings(
+                    self.temp_dir, population_size=4, generations=2, max_evaluations=10,
+                    enable_walk_forward=True, walk_forward_train_weeks=8,
+                    walk_forward_test_weeks=2, walk_forward_min_train_weeks=4,
+                    total_data_weeks=16, walk_forward_parallel_folds=parallel_folds,
+                    pool_processes=parallel_folds,
+                )
+                training = []
+
+                def backtest(genes, pairs, generation, timerange, num_parameters):
+                    if generation:
+                        training.append(timerange)
+                    return 1.0
+
+                optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+                with patch('optimization.genetic_optimizer.run_backtest', side_effect=backtest), \
+                        patch('optimization.genetic_optimizer.create_evaluator_from_settings',
+                              side_effect=threaded_evaluator):
+                    _, validation = optimizer.optimize_with_walk_forward()
+
+                # Without sharing, every fold would get ten backtests of its own.
+                self.assertGreater(validation['num_folds'], 2)
+                self.assertEqual(len(training), 10)
+                self.assertEqual(optimizer.budget.evaluations, 10)
+                self.assertLess(len(validation['fold_results']), validation['num_folds'])
+
+    def test_de_respects_evaluation_budget(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=20,
+                                 max_evaluations=15, ga_seed=3)
+        optimizer = DEOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.de_optimizer.run_backtest',
+                   side_effect=lambda genes, *args: float(genes[0])) as backtest:
+            optimizer.optimize(checkpoint_name='de_budget')
+        self.assertEqual(backtest.call_count, 15)
+        self.assertTrue(optimizer.stopped_on_budget)
+        self.assertTrue(os.path.exists(optimizer._checkpoint_path('de_budget')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Unit tests for optimization/checkpoint.py and the GA's checkpoint files."""
+import gzip
+import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from genetic_algorithm.individual import Individual
+from optimization.checkpoint import (
+    CHECKPOINT_VERSION, CheckpointCodec, CheckpointWriter, read_document, write_document
+)
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def individual(genes, pairs, fitness):
+    ind = Individual(list(genes), list(pairs), PARAMETERS)
+    ind.fitness = fitness
+    return ind
+
+
+class TestCheckpointCodec(unittest.TestCase):
+    def setUp(self):
+        self.codec = CheckpointCodec(PARAMETERS)
+        self.population = [individual([20, 70], PAIRS[:2], 1.5),
+                           individual([np.int64(30), 80], PAIRS[1:], float('-inf'))]
+        self.state = {
+            'next_generation': 3,
+            'individuals': self.population,
+            'best_individuals': [(1, self.population[0]), (2, self.population[1])],
+            'overall_best': self.population[0],
+            'hall_of_fame': [self.population[0]],
+            'random_state': random.getstate(),
+            'archive': {'entries': [([20, 70], PAIRS[:2], 1.5)]},
+            'surrogate': None,
+        }
+
+    def round_trip(self):
+        return self.codec.decode(json.loads(json.dumps(self.codec.encode(self.state))))
+
+    def test_round_trip(self):
+        state = self.round_trip()
+        self.assertEqual(state['next_generation'], 3)
+        self.assertEqual([ind.genes for ind in state['individuals']], [[20, 70], [30, 80]])
+        self.assertEqual(state['individuals'][1].trading_pairs, PAIRS[1:])
+        self.assertEqual(state['individuals'][1].fitness, float('-inf'))
+        self.assertEqual([gen for gen, _ in state['best_individuals']], [1, 2])
+        self.assertEqual(state['overall_best'].fitness, 1.5)
+        self.assertEqual(state['random_state'], random.getstate())
+        self.assertEqual(state['archive']['entries'], [[[20, 70], PAIRS[:2], 1.5]])
+        self.assertIsNone(state['surrogate'])
+
+    def test_schema_and_pairs_are_stored_once(self):
+        document = self.codec.encode(self.state)
+        self.assertEqual(document['version'], CHECKPOINT_VERSION)
+        self.assertEqual(sorted(document['pairs']), sorted(PAIRS))
+        self.assertEqual(document['state']['individuals']['pairs'], [[0, 1], [1, 2]])
+        for ind in self.round_trip()['individuals']:
+            self.assertIs(ind.param_types, PARAMETERS)
+
+    def test_encoded_state_is_a_snapshot(self):
+        document = self.codec.encode(self.state)
+        self.population[0].genes[0] = 99
+        self.assertEqual(document['state']['individuals']['genes'][0], [20, 70])
+
+    def test_rejects_newer_format_and_other_parameters(self):
+        document = self.codec.encode(self.state)
+        with self.assertRaises(ValueError):
+            self.codec.decode(dict(document, version=CHECKPOINT_VERSION + 1))
+        with self.assertRaises(ValueError):
+            CheckpointCodec(PARAMETERS[:1]).decode(document)
+        with self.assertRaises(ValueError):
+            self.codec.decode({'state': {}})
+
+
+class TestCheckpointFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_compressed_and_plain_documents(self):
+        for name in ('run.json.gz', 'run.json'):
+            path = os.path.join(self.temp_dir, name)
+            write_document(path, {'version': 1, 'values': [1.5, float('-inf')]})
+            self.assertEqual(read_document(path)['values'], [1.5, float('-inf')])
+            self.assertFalse(os.path.exists(path + '.tmp'))
+        with gzip.open(os.path.join(self.temp_dir, 'run.json.gz'), 'rt') as f:
+            self.assertEqual(json.load(f)['version'], 1)
+
+    def test_writer_runs_callback_after_write(self):
+        path = os.path.join(self.temp_dir, 'run.json.gz')
+        written = []
+        writer = CheckpointWriter()
+        writer.submit(path, {'state': {'next_generation': 1}},
+                      on_written=lambda: written.append(os.path.exists(path)))
+        writer.close()
+        self.assertEqual(written, [True])
+
+    def test_ga_resumes_from_versioned_checkpoint(self):
+        settings = make_settings(self.temp_dir, generations=2, ga_seed=5)
+        with patch('optimization.genetic_optimizer.run_backtest',
+                   side_effect=lambda genes, *args: float(genes[0])):
+            full = GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(checkpoint_name=None)
+
+            settings.generations = 1
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(checkpoint_name='seeded')
+            optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+            path = optimizer._checkpoint_path('seeded')
+            self.assertTrue(path.endswith('.json.gz'))
+            self.assertEqual(read_document(path)['version'], CHECKPOINT_VERSION)
+
+            settings.generations = 2
+            resumed = GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(
+                resume=True, checkpoint_name='seeded')
+
+        self.assertEqual([(gen, ind.genes) for gen, ind in resumed],
+                         [(gen, ind.genes) for gen, ind in full])
+
+    def test_legacy_pickle_checkpoint_still_resumes(self):
+        settings = make_settings(self.temp_dir, generations=3)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        population = [Individual.create_random(PARAMETERS, PAIRS, 2)
+                      for _ in range(settings.population_size)]
+        os.makedirs(settings.checkpoint_dir, exist_ok=True)
+        with open(optimizer._legacy_checkpoint_path('ga_checkpoint'), 'wb') as f:
+            pickle.dump({
+                'next_generation': 2, 'individuals': population, 'best_individuals': [],
+                'overall_best': None, 'seed': None, 'random_state': random.getstate(),
+                'population_size': settings.population_size, 'generations': 3,
+            }, f)
+
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0) as backtest:
+            results = optimizer.optimize(resume=True)
+        self.assertEqual(backtest.call_count, settings.population_size)
+        self.assertEqual([gen for gen, _ in results], [3])
+
+        optimizer.clear_checkpoint()
+        self.assertFalse(os.path.exists(optimizer._legacy_checkpoint_path('ga_checkpoint')))
+        self.assertFalse(os.path.exists(optimizer._checkpoint_path('ga_checkpoint')))
+
+
+if __name__ == '__main__':
+    unittest.main()
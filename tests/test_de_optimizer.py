@@ -0,0 +1,180 @@
+"""Unit tests for optimization/de_optimizer.py and the gene decoding it uses."""
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from genetic_algorithm.encoding import encode_genes, decode_genes, decode_pairs
+from genetic_algorithm.individual import Individual
+from optimization.checkpoint import CHECKPOINT_FORMAT, read_document
+from optimization.de_optimizer import CMAES, DEOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+MIXED = [
+    {'name': 'rsi', 'type': 'Int', 'start': 10, 'end': 40},
+    {'name': 'width', 'type': 'Decimal', 'start': 0.0, 'end': 1.0, 'decimal_places': 2},
+    {'name': 'use_ema', 'type': 'Boolean'},
+    {'name': 'mode', 'type': 'Categorical', 'options': ['fast', 'slow', 'mid']},
+]
+
+
+def peaked(genes, pairs, generation, timerange, num_parameters):
+    """Smooth fitness with its maximum at buy_rsi=31, sell_rsi=67."""
+    return 100.0 - (genes[0] - 31) ** 2 - (genes[1] - 67) ** 2
+
+
+class TestDecoding(unittest.TestCase):
+    def test_round_trip(self):
+        genes = [25, 0.37, True, 'mid']
+        self.assertEqual(decode_genes(encode_genes(genes, MIXED), MIXED), genes)
+
+    def test_decoded_values_are_valid(self):
+        for x in (-0.3, 0.0, 0.26, 0.49, 0.5, 1.0, 1.7):
+            rsi, width, use_ema, mode = decode_genes([x] * 4, MIXED)
+            self.assertIsInstance(rsi, int)
+            self.assertTrue(10 <= rsi <= 40 and 0.0 <= width <= 1.0)
+            self.assertIsInstance(use_ema, bool)
+            self.assertIn(mode, MIXED[3]['options'])
+
+    def test_decode_pairs_takes_highest_scores(self):
+        self.assertEqual(decode_pairs([0.1, 0.9, 0.5], PAIRS, 2), [PAIRS[1], PAIRS[2]])
+
+
+class TestCMAES(unittest.TestCase):
+    def test_converges_on_quadratic(self):
+        es = CMAES(dim=3, population_size=10, sigma=0.3)
+        rng = np.random.default_rng(0)
+        target = np.array([0.2, 0.7, 0.4])
+        for _ in range(60):
+            candidates = es.ask(rng)
+            es.tell(candidates, -((candidates - target) ** 2).sum(axis=1))
+        np.testing.assert_allclose(es.mean, target, atol=0.02)
+
+
+class TestDEOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _optimize(self, settings, side_effect=peaked, **kwargs):
+        optimizer = DEOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.de_optimizer.run_backtest', side_effect=side_effect) as backtest:
+            history = optimizer.optimize(**kwargs)
+        return optimizer, history, backtest
+
+    def test_each_strategy_finds_the_peak(self):
+        for strategy in ('rand1bin', 'best1bin', 'cmaes'):
+            with self.subTest(strategy=strategy):
+                settings = make_settings(self.temp_dir, population_size=10, generations=25,
+                                         de_strategy=strategy, ga_seed=1)
+                optimizer, history, _ = self._optimize(settings, checkpoint_name=None)
+                self.assertEqual(len(history), 25)
+                self.assertGreaterEqual(optimizer.get_best_individual().fitness, 98.0)
+
+    def test_history_records_each_generations_winner(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=6,
+                                 de_strategy='cmaes', ga_seed=4)
+        optimizer = DEOptimizer(settings, PARAMETERS, PAIRS)
+        generations = []
+        evaluate = optimizer._evaluate
+
+        def recording(*args):
+            individuals, fitness = evaluate(*args)
+            generations.append(max(fitness))
+            return individuals, fitness
+
+        with patch.object(optimizer, '_evaluate', side_effect=recording), \
+                patch('optimization.de_optimizer.run_backtest', side_effect=peaked):
+            history = optimizer.optimize(checkpoint_name=None)
+
+        self.assertEqual([ind.fitness for _, ind in history], generations)
+        self.assertEqual(optimizer.get_best_individual().fitness, max(generations))
+
+    def test_duplicate_genomes_are_backtested_once(self):
+        settings = make_settings(self.temp_dir, population_size=10, generations=15, ga_seed=2)
+        optimizer, _, backtest = self._optimize(settings, checkpoint_name=None)
+        genomes = [tuple(call.args[0]) for call in backtest.call_args_list]
+        self.assertEqual(len(genomes), len(set(genomes)))
+        self.assertEqual(optimizer.backtests, len(genomes))
+        self.assertLess(len(genomes), 10 * 15)
+
+    def test_searched_pairs_have_num_pairs(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=3,
+                                 fix_pairs=False, num_pairs=2)
+        seen = []
+
+        def record(genes, pairs, *args):
+            seen.append(pairs)
+            return 1.0
+
+        self._optimize(settings, side_effect=record, checkpoint_name=None)
+        self.assertTrue(seen)
+        self.assertTrue(all(len(pairs) == 2 and set(pairs) <= set(PAIRS) for pairs in seen))
+
+    def test_seed_individuals_are_evaluated_first(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=1)
+        seed = Individual([31, 67], PAIRS.copy(), PARAMETERS)
+        optimizer, _, backtest = self._optimize(settings, initial_individuals=[seed],
+                                                checkpoint_name=None)
+        self.assertEqual(backtest.call_args_list[0].args[0], [31, 67])
+        self.assertEqual(optimizer.get_best_individual().fitness, 100.0)
+
+    def test_seeded_resume_replays_exactly(self):
+        for strategy in ('rand1bin', 'cmaes'):
+            with self.subTest(strategy=strategy):
+                settings = make_settings(self.temp_dir, population_size=6, generations=4,
+                                         de_strategy=strategy, ga_seed=7, checkpoint_frequency=1)
+                _, uninterrupted, _ = self._optimize(settings, checkpoint_name=None)
+
+                settings.generations = 2
+                self._optimize(settings, checkpoint_name='de')
+                settings.generations = 4
+                _, resumed, _ = self._optimize(settings, resume=True, checkpoint_name='de')
+
+                self.assertEqual([(g, ind.genes) for g, ind in uninterrupted],
+                                 [(g, ind.genes) for g, ind in resumed])
+
+    def test_checkpoint_is_a_versioned_document(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=2,
+                                 de_strategy='cmaes', ga_seed=7, checkpoint_frequency=1)
+        optimizer, _, _ = self._optimize(settings, checkpoint_name='de')
+        document = read_document(optimizer._checkpoint_path('de'))
+        self.assertEqual(document['format'], CHECKPOINT_FORMAT)
+        self.assertEqual(document['state']['strategy'], 'cmaes')
+
+        settings.generations = 3
+        state = DEOptimizer(settings, PARAMETERS, PAIRS)._load_checkpoint('de')
+        self.assertEqual(state['cmaes']['cov'].shape, (2, 2))
+        self.assertEqual(state['cache'], optimizer.cache)
+
+    def test_legacy_pickle_checkpoint_still_resumes(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=2, ga_seed=7,
+                                 checkpoint_frequency=1)
+        optimizer, _, _ = self._optimize(settings, checkpoint_name='de')
+        settings.generations = 4
+        state = optimizer._load_checkpoint('de')
+        os.remove(optimizer._checkpoint_path('de'))
+        with open(optimizer._legacy_checkpoint_path('de'), 'wb') as f:
+            pickle.dump(state, f)
+
+        _, resumed, _ = self._optimize(settings, resume=True, checkpoint_name='de')
+        self.assertEqual([gen for gen, _ in resumed], [1, 2, 3, 4])
+
+        optimizer.clear_checkpoint('de')
+        self.assertFalse(os.path.exists(optimizer._legacy_checkpoint_path('de')))
+        self.assertFalse(os.path.exists(optimizer._checkpoint_path('de')))
+
+    def test_unknown_strategy_rejected(self):
+        settings = make_settings(self.temp_dir, de_strategy='nelder_mead')
+        with self.assertRaises(ValueError):
+            DEOptimizer(settings, PARAMETERS, PAIRS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Unit tests for optimization/early_stopping.py and the GA stop hook."""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from optimization.early_stopping import EarlyStopping
+from optimization.genetic_optimizer import GeneticOptimizer
+from strategy.selection_bar import from_fitnesses
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+class TestEarlyStopping(unittest.TestCase):
+    def test_disabled_by_default(self):
+        stopper = EarlyStopping()
+        self.assertFalse(stopper.enabled)
+        for _ in range(10):
+            self.assertIsNone(stopper.check(1.0, diversity=0.0))
+
+    def test_patience_counts_generations_without_improvement(self):
+        stopper = EarlyStopping(patience=2, min_delta=0.01)
+        self.assertIsNone(stopper.check(1.0))
+        self.assertIsNone(stopper.check(1.005))  # below min_delta: stalled 1
+        self.assertIsNone(stopper.check(1.5))    # real improvement resets
+        self.assertIsNone(stopper.check(1.5))
+        self.assertIn('no improvement', stopper.check(1.5))
+
+    def test_diversity_floor(self):
+        stopper = EarlyStopping(min_diversity=0.05)
+        self.assertIsNone(stopper.check(1.0, diversity=0.2))
+        self.assertIsNone(stopper.check(1.0, diversity=None))
+        self.assertIn('diversity', stopper.check(1.0, diversity=0.01))
+
+    def test_selection_bar_margin(self):
+        bar = from_fitnesses([0.1, 0.11, 0.12, 0.9])
+        self.assertIsNotNone(EarlyStopping(bar_margin=bar.edge).check(1.0, bar=bar))
+        self.assertIsNone(EarlyStopping(bar_margin=bar.edge + 1).check(1.0, bar=bar))
+
+
+class TestGeneticOptimizerEarlyStop(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_plateau_ends_run_with_final_checkpoint(self):
+        # checkpoint_frequency=100 never fires on its own within 10 generations.
+        settings = make_settings(self.temp_dir, generations=10, checkpoint_frequency=100,
+                                 early_stop_patience=2)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0):
+            results = optimizer.optimize()
+
+        self.assertEqual(len(results), 3)
+        self.assertIn('no improvement', optimizer.stop_reason)
+        state = optimizer._load_checkpoint('ga_checkpoint')
+        self.assertEqual(state['next_generation'], 3)
+        self.assertEqual(state['stop_reason'], optimizer.stop_reason)
+
+        # Resuming sees the run has converged and breeds nothing more.
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0) as backtest:
+            resumed = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+            again = resumed.optimize(resume=True)
+        backtest.assert_not_called()
+        self.assertEqual([gen for gen, _ in again], [1, 2, 3])
+        self.assertEqual(resumed.stop_reason, optimizer.stop_reason)
+
+    def test_without_criteria_all_generations_run(self):
+        settings = make_settings(self.temp_dir, generations=6)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0):
+            results = optimizer.optimize(checkpoint_name=None)
+        self.assertEqual(len(results), 6)
+        self.assertIsNone(optimizer.stop_reason)
+
+
+if __name__ == '__main__':
+    unittest.main()
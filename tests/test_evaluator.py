@@ -0,0 +1,130 @@
+"""Unit tests for optimization/evaluator.py and the shared walk-forward pool."""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from optimization.de_optimizer import DEOptimizer
+from optimization.evaluator import PoolEvaluator, create_evaluator_from_settings
+from optimization.genetic_optimizer import GeneticOptimizer
+from optimization.nsga2_optimizer import NSGA2Optimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def add(a, b):
+    return a + b
+
+
+def fail():
+    raise ValueError('backtest crashed')
+
+
+class TestPoolEvaluator(unittest.TestCase):
+    def test_in_process_map_and_submit(self):
+        with PoolEvaluator(1) as evaluator:
+            self.assertEqual(evaluator.map(add, [(1, 2), (3, 4)]), [3, 7])
+            self.assertEqual(evaluator.submit(add, 5, b=6).get(), 11)
+
+    def test_map_unordered_keeps_positions(self):
+        for processes in (1, 2):
+            with PoolEvaluator(processes) as evaluator:
+                results = dict(evaluator.map_unordered(add, [(1, 2), (3, 4), (5, 6)]))
+            self.assertEqual(results, {0: 3, 1: 7, 2: 11})
+
+    def test_in_process_submit_raises_on_get(self):
+        handle = PoolEvaluator(1).submit(fail)
+        with self.assertRaises(ValueError):
+            handle.get()
+
+    def test_worker_pool(self):
+        with PoolEvaluator(2) as evaluator:
+            self.assertEqual(evaluator.map(add, [(1, 2), (3, 4)]), [3, 7])
+            self.assertEqual(evaluator.submit(add, 5, 6).get(timeout=30), 11)
+
+
+class TestSharedWalkForwardPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_evaluator_serves_training_and_tests(self):
+        settings = make_settings(
+            self.temp_dir, generations=2, enable_walk_forward=True,
+            walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+            walk_forward_min_train_weeks=4, total_data_weeks=16,
+        )
+        created = []
+
+        def tracking(settings):
+            evaluator = create_evaluator_from_settings(settings)
+            created.append(evaluator)
+            return evaluator
+
+        seen = []
+
+        def scored(genes, pairs, generation=0, custom_timerange=None, num_parameters=0):
+            seen.append((generation, custom_timerange))
+            return 2.0 if generation else 1.0
+
+        with patch('optimization.genetic_optimizer.create_evaluator_from_settings', side_effect=tracking), \
+                patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+            _, validation = GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize_with_walk_forward()
+
+        self.assertEqual(len(created), 1)
+        folds = validation['fold_results']
+        self.assertGreater(len(folds), 1)
+        test_windows = {timerange for generation, timerange in seen if generation == 0}
+        self.assertEqual(test_windows, {fold['test_period'] for fold in folds})
+        self.assertTrue(all(fold['test_fitness'] == 1.0 for fold in folds))
+
+
+class TestEvaluatorPassedToOptimizers(unittest.TestCase):
+    """DE and NSGA-II backtest on a caller's pool and leave it open."""
+
+    class Counting(PoolEvaluator):
+        def __init__(self):
+            super().__init__(1)
+            self.batches = 0
+            self.closed = False
+
+        def map(self, func, args_list):
+            self.batches += 1
+            return super().map(func, args_list)
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = make_settings(self.temp_dir, population_size=4, generations=3,
+                                      pool_processes=4, nsga2_objectives=['total_profit_percent'])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def check(self, optimizer, target, side_effect):
+        evaluator = self.Counting()
+        with patch('optimization.evaluator.multiprocessing.Pool') as pool, \
+                patch(target, side_effect=side_effect):
+            optimizer.optimize(evaluator=evaluator)
+        pool.assert_not_called()
+        self.assertEqual(evaluator.batches, 3)
+        self.assertFalse(evaluator.closed)
+
+    def test_de(self):
+        self.check(DEOptimizer(self.settings, PARAMETERS, PAIRS),
+                   'optimization.de_optimizer.run_backtest',
+                   lambda genes, *args: float(genes[0]))
+
+    def test_nsga2(self):
+        self.check(NSGA2Optimizer(self.settings, PARAMETERS, PAIRS),
+                   'optimization.nsga2_optimizer.run_backtest_metrics',
+                   lambda genes, *args: {'fitness': float(genes[0]),
+                                         'total_profit_percent': float(genes[0])})
+
+
+if __name__ == '__main__':
+    unittest.main()
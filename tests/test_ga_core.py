@@ -12,11 +12,14 @@ walk-forward folds silently evaluating the same recent window.
 import os
 import shutil
 import tempfile
+import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
 from genetic_algorithm.individual import Individual
+from optimization.evaluator import PoolEvaluator
 from optimization.genetic_optimizer import GeneticOptimizer
 
 PARAMETERS = [
@@ -41,6 +44,16 @@ def make_settings(tmpdir, **overrides):
     return SimpleNamespace(**base)
 
 
+def threaded_evaluator(settings):
+    """
+    In-process evaluator that claims ``pool_processes`` workers, so parallel
+    folds run as threads against the patched run_backtest.
+    """
+    evaluator = PoolEvaluator(1)
+    evaluator.processes = settings.pool_processes
+    return evaluator
+
+
 class GACoreTestCase(unittest.TestCase):
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
@@ -221,6 +234,120 @@ class TestWalkForwardWiring(GACoreTestCase):
 
         self.assertFalse(os.path.exists(optimizer._checkpoint_path('ga_checkpoint')))
 
+    def test_parallel_folds_overlap_and_report_in_order(self):
+        for pool_processes, overlap in ((3, True), (1, False)):
+            with self.subTest(pool_processes=pool_processes):
+                settings = make_settings(
+                    self.temp_dir, generations=2, enable_walk_forward=True,
+                    walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+                    walk_forward_min_train_weeks=4, total_data_weeks=16,
+                    walk_forward_parallel_folds=3, pool_processes=pool_processes,
+                )
+                lock = threading.Lock()
+                running = {'now': 0, 'max': 0}
+
+                def overlapping(genes, pairs, generation, timerange, num_parameters):
+                    with lock:
+                        running['now'] += 1
+                        running['max'] = max(running['max'], running['now'])
+                    time.sleep(0.01)
+                    with lock:
+                        running['now'] -= 1
+                    return genes[0] + genes[1] / 100
+
+                optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+                with patch('optimization.genetic_optimizer.run_backtest', side_effect=overlapping), \
+                        patch('optimization.genetic_optimizer.create_evaluator_from_settings',
+                              side_effect=threaded_evaluator):
+                    _, validation = optimizer.optimize_with_walk_forward()
+
+                folds = [fold['fold'] for fold in validation['fold_results']]
+                self.assertEqual(folds, sorted(folds))
+                self.assertEqual(len(folds), validation['num_folds'])
+                # Folds overlap only when there are workers for them
+                self.assertEqual(running['max'] > 1, overlap)
+
+                # The winners end up on the optimizer that was called
+                best = max((fold['best_individual'] for fold in validation['fold_results']),
+                           key=lambda ind: ind.fitness)
+                self.assertEqual(optimizer.get_best_individual().fitness, best.fitness)
+                self.assertEqual([ind.genes for ind in optimizer.get_finalists()],
+                                 [ind.genes for ind in validation['fold_results'][-1]['finalists']])
+
+    def test_seeded_parallel_folds_match_sequential_folds(self):
+        def run(parallel_folds):
+            settings = make_settings(
+                self.temp_dir, population_size=6, generations=3, enable_walk_forward=True,
+                walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+                walk_forward_min_train_weeks=4, total_data_weeks=16,
+                walk_forward_parallel_folds=parallel_folds, ga_seed=11,
+                enable_diversity_selection=True, pool_processes=3,
+            )
+            seen = []
+
+            def scored(genes, pairs, generation, timerange, num_parameters):
+                time.sleep(0.001)
+                seen.append((timerange, generation, tuple(genes)))
+                return genes[0] + genes[1] / 100
+
+            with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored), \
+                    patch('optimization.genetic_optimizer.create_evaluator_from_settings',
+                          side_effect=threaded_evaluator):
+                GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize_with_walk_forward()
+            return sorted(seen)
+
+        self.assertEqual(run(3), run(1))
+
+    def test_warm_start_seeds_next_fold_and_shortens_it(self):
+        settings = make_settings(
+            self.temp_dir, population_size=6, generations=3, enable_walk_forward=True,
+            walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+            walk_forward_min_train_weeks=4, total_data_weeks=16,
+            walk_forward_warm_start=0.5, walk_forward_warm_generations=1,
+        )
+        seen = []
+
+        def scored(genes, pairs, generation=0, custom_timerange=None, num_parameters=0):
+            seen.append((custom_timerange, generation, tuple(genes)))
+            return float(genes[0])
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+            _, validation = optimizer.optimize_with_walk_forward()
+
+        folds = validation['fold_results']
+        self.assertGreater(len(folds), 1)
+        first, second = folds[0]['train_period'], folds[1]['train_period']
+        self.assertEqual(max(gen for tr, gen, _ in seen if tr == first), 3)
+        self.assertEqual({gen for tr, gen, _ in seen if tr == second}, {1})
+
+        # The best of fold 1's last generation (fitness = buy_rsi) is carried over.
+        best_last = max(g[0] for tr, gen, g in seen if tr == first and gen == 3)
+        self.assertIn(best_last, {g[0] for tr, gen, g in seen if tr == second})
+
+    def test_top_finalists_are_tested_and_rank_correlated(self):
+        settings = make_settings(
+            self.temp_dir, population_size=6, generations=2, enable_walk_forward=True,
+            walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+            walk_forward_min_train_weeks=4, total_data_weeks=16,
+            walk_forward_test_finalists=3,
+        )
+
+        def reversed_out_of_sample(genes, pairs, generation=0, custom_timerange=None, num_parameters=0):
+            score = genes[0] + genes[1] / 100
+            return score if generation else -score
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=reversed_out_of_sample):
+            _, validation = optimizer.optimize_with_walk_forward()
+
+        for fold in validation['fold_results']:
+            self.assertEqual(len(fold['finalist_test_fitness']), 3)
+            self.assertEqual(fold['test_fitness'], fold['finalist_test_fitness'][0])
+            self.assertEqual(fold['finalist_train_fitness'][0], fold['train_fitness'])
+            self.assertAlmostEqual(fold['train_test_correlation'], -1.0)
+        self.assertAlmostEqual(validation['train_test_correlation'], -1.0)
+
 
 class TestSeedingAndBest(GACoreTestCase):
     def test_initial_individuals_are_seeded(self):
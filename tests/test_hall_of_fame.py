@@ -0,0 +1,98 @@
+"""Unit tests for genetic_algorithm/hall_of_fame.py and top-k elitism."""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from genetic_algorithm.individual import Individual
+from genetic_algorithm.hall_of_fame import HallOfFame, genome_key
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def _individual(genes, fitness, pairs=None):
+    ind = Individual(list(genes), list(pairs or PAIRS), PARAMETERS)
+    ind.fitness = fitness
+    return ind
+
+
+class TestHallOfFame(unittest.TestCase):
+    def test_keeps_top_k_best_first(self):
+        hof = HallOfFame(maxsize=3)
+        hof.update([_individual([b, 70], fitness=b / 10) for b in (11, 15, 12, 19, 13)])
+        self.assertEqual([ind.fitness for ind in hof.top()], [1.9, 1.5, 1.3])
+        self.assertEqual(len(hof), 3)
+
+    def test_deduplicates_by_genome(self):
+        hof = HallOfFame(maxsize=5)
+        inserted = hof.update([_individual([20, 70], 1.0), _individual([20, 70], 1.0)])
+        self.assertEqual(inserted, 1)
+        self.assertEqual(len(hof), 1)
+
+    def test_pair_order_does_not_change_genome(self):
+        a = _individual([20, 70], 1.0, pairs=['BTC/USDT', 'ETH/USDT'])
+        b = _individual([20, 70], 1.0, pairs=['ETH/USDT', 'BTC/USDT'])
+        self.assertEqual(genome_key(a), genome_key(b))
+
+    def test_evicted_genome_can_re_enter(self):
+        hof = HallOfFame(maxsize=1)
+        weak = _individual([20, 70], 1.0)
+        hof.update([weak, _individual([21, 70], 2.0)])
+        self.assertNotIn(weak, hof)
+        hof.update([_individual([22, 70], 3.0), _individual([20, 70], 5.0)])
+        self.assertEqual(hof.top()[0].genes, [20, 70])
+
+    def test_ignores_unscored_individuals(self):
+        hof = HallOfFame(maxsize=3)
+        hof.update([_individual([20, 70], None), _individual([21, 70], float('-inf'))])
+        self.assertEqual(len(hof), 0)
+
+    def test_archive_holds_copies(self):
+        hof = HallOfFame(maxsize=3)
+        ind = _individual([20, 70], 1.0)
+        hof.update([ind])
+        ind.genes[0] = 39
+        self.assertEqual(hof.top()[0].genes, [20, 70])
+
+
+class TestTopKElitism(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_elites_survive_into_next_generation(self):
+        settings = make_settings(self.temp_dir, population_size=6, generations=2,
+                                 elite_size=2, hall_of_fame_size=5)
+        seen = []
+
+        def scored(genes, pairs, generation, timerange, num_parameters):
+            seen.append((generation, list(genes)))
+            return genes[0] / 40
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored):
+            optimizer.optimize(checkpoint_name=None)
+
+        distinct = {tuple(g) for gen, g in seen if gen == 1}
+        first = sorted(distinct, key=lambda g: g[0], reverse=True)
+        second = [tuple(g) for gen, g in seen if gen == 2]
+        self.assertEqual([g[0] for g in second[:2]], [g[0] for g in first[:2]])
+
+    def test_finalists_come_from_hall_of_fame(self):
+        settings = make_settings(self.temp_dir, hall_of_fame_size=3)
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest',
+                   side_effect=lambda genes, *a: genes[0] / 40):
+            optimizer.optimize(checkpoint_name=None)
+
+        finalists = optimizer.get_finalists()
+        self.assertLessEqual(len(finalists), 3)
+        fitnesses = [ind.fitness for ind in finalists]
+        self.assertEqual(fitnesses, sorted(fitnesses, reverse=True))
+        self.assertEqual(finalists[0].fitness, optimizer.get_best_individual().fitness)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for optimization/hybrid_optimizer.py."""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import optuna
+
+from optimization.evaluator import PoolEvaluator
+from optimization.hybrid_optimizer import HybridOptimizer
+from optimization.optuna_optimizer import cache_key
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+class CountingEvaluator(PoolEvaluator):
+    """In-process evaluator that counts how each phase uses it."""
+
+    def __init__(self):
+        super().__init__(1)
+        self.batches = 0
+        self.submits = 0
+        self.closed = False
+
+    def map_unordered(self, func, args_list):
+        self.batches += 1
+        return super().map_unordered(func, args_list)
+
+    def submit(self, func, *args, **kwargs):
+        self.submits += 1
+        return super().submit(func, *args, **kwargs)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class TestHybridOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = make_settings(self.temp_dir, generations=4, optuna_n_startup_trials=2,
+                                      hall_of_fame_size=5)
+        self.ga_genomes = []
+        self.optuna_genomes = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_hybrid(self, evaluator=None):
+        def ga_backtest(genes, pairs, *args):
+            self.ga_genomes.append(cache_key(genes, pairs))
+            return float(genes[0] + genes[1])
+
+        def optuna_backtest(genes, pairs, *args):
+            self.optuna_genomes.append(cache_key(genes, pairs))
+            return float(genes[0] + genes[1])
+
+        optimizer = HybridOptimizer(self.settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=ga_backtest), \
+                patch('optimization.optuna_optimizer.run_backtest', side_effect=optuna_backtest):
+            results = optimizer.optimize(evaluator=evaluator)
+        return optimizer, results
+
+    def test_optuna_refines_from_ga_history(self):
+        evaluator = CountingEvaluator()
+        optimizer, results = self.run_hybrid(evaluator)
+
+        # Two GA generations, then two blocks of Optuna trials.
+        self.assertEqual(optimizer.ga_generations, 2)
+        self.assertEqual(optimizer.optuna_trials, 8)
+        self.assertEqual([gen for gen, _ in results], [1, 2, 3, 4])
+
+        history = optimizer.ga.archive.entries
+        study = optimizer.refiner.study
+        self.assertEqual(len(study.trials), len(history) + 8)
+        self.assertEqual([t.value for t in study.trials[:len(history)]],
+                         [fitness for _, _, fitness in history])
+
+        # Genomes the GA backtested are scored from the shared cache.
+        self.assertFalse(set(self.optuna_genomes) & set(self.ga_genomes))
+        self.assertEqual(len(self.optuna_genomes), len(set(self.optuna_genomes)))
+
+        # One pool for both phases, left open for the caller.
+        self.assertEqual(evaluator.batches, 2)
+        self.assertEqual(evaluator.submits, len(self.optuna_genomes))
+        self.assertFalse(evaluator.closed)
+
+        best = optimizer.get_best_individual()
+        self.assertEqual(best.fitness, max(ind.fitness for _, ind in results))
+        self.assertIs(optimizer.get_finalists(1)[0].fitness, best.fitness)
+
+    def test_budget_covers_both_phases(self):
+        self.settings.max_evaluations = 10
+        optimizer, results = self.run_hybrid()
+        self.assertEqual(len(self.ga_genomes), 8)
+        refined = len(optimizer.refiner.study.trials) - len(optimizer.ga.archive.entries)
+        self.assertGreater(refined, 0)
+        self.assertLessEqual(refined, 2)
+
+        self.settings.max_evaluations = 8
+        self.ga_genomes = []
+        optimizer, results = self.run_hybrid()
+        self.assertIsNone(optimizer.refiner)
+        self.assertEqual([gen for gen, _ in results], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Unit tests for optimization/journal.py and mid-generation resume."""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from genetic_algorithm.individual import Individual
+from optimization.genetic_optimizer import GeneticOptimizer
+from optimization.journal import EvaluationJournal
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed mid-generation."""
+
+
+class TestEvaluationJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'run.journal.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_record_load_take(self):
+        EvaluationJournal(self.path).record([np.int64(20), 70.5], PAIRS, '20240101-20240301', 1.5, 3)
+        journal = EvaluationJournal(self.path)
+        self.assertEqual(journal.load(), 1)
+        self.assertIsNone(journal.take([20, 70.5], PAIRS, None))
+        self.assertEqual(journal.take([20, 70.5], PAIRS, '20240101-20240301'), 1.5)
+        # Replayed once only.
+        self.assertIsNone(journal.take([20, 70.5], PAIRS, '20240101-20240301'))
+
+    def test_torn_last_line_is_skipped(self):
+        journal = EvaluationJournal(self.path)
+        journal.record([20, 70], PAIRS, None, float('-inf'), 1)
+        with open(self.path, 'a') as f:
+            f.write('{"generation": 1, "genes": [3')
+        with self.assertLogs('utils.logging_config', level='WARNING'):
+            self.assertEqual(journal.load(), 1)
+        self.assertEqual(journal.take([20, 70], PAIRS, None), float('-inf'))
+
+    def test_rotated_entries_survive_until_discarded(self):
+        journal = EvaluationJournal(self.path)
+        journal.record([20, 70], PAIRS, None, 1.0, 1)
+        journal.rotate()
+        journal.record([30, 80], PAIRS, None, 2.0, 2)
+        self.assertEqual(journal.load(), 2)
+        journal.discard_rotated()
+        self.assertEqual(journal.load(), 1)
+        self.assertEqual(journal.take([30, 80], PAIRS, None), 2.0)
+
+    def test_record_appends_under_the_lock(self):
+        lock = threading.Lock()
+        journal = EvaluationJournal(self.path, lock=lock)
+        with lock:
+            writer = threading.Thread(target=journal.record, args=([20, 70], PAIRS, None, 1.0, 1))
+            writer.start()
+            writer.join(0.1)
+            # Blocked until the lock is released
+            self.assertFalse(os.path.exists(self.path))
+        writer.join()
+        self.assertEqual(journal.load(), 1)
+
+    def test_clear(self):
+        journal = EvaluationJournal(self.path)
+        journal.record([20, 70], PAIRS, None, 1.0, 1)
+        journal.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(journal.load(), 0)
+
+
+class TestMidGenerationResume(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resume_replays_finished_backtests(self):
+        settings = make_settings(self.temp_dir, population_size=4, generations=3,
+                                 checkpoint_frequency=1)
+        calls = []
+
+        def crash_on_seventh(genes, *args):
+            calls.append(genes)
+            if len(calls) == 7:
+                raise Crash()
+            return float(genes[0])
+
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=crash_on_seventh):
+            with self.assertRaises(Crash):
+                GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(checkpoint_name='journal')
+
+        # Generation 1 is checkpointed; two of generation 2's backtests finished.
+        with open(os.path.join(settings.checkpoint_dir, 'journal.journal.jsonl')) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        with patch('optimization.genetic_optimizer.run_backtest',
+                   side_effect=lambda genes, *args: float(genes[0])) as backtest, \
+                self.assertLogs('utils.logging_config', level='INFO') as logs:
+            optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+            results = optimizer.optimize(resume=True, checkpoint_name='journal')
+
+        self.assertIn('Replayed 2 backtests from the evaluation journal', '\n'.join(logs.output))
+        self.assertEqual(backtest.call_count, 2 + 4)
+        self.assertEqual([gen for gen, _ in results], [1, 2, 3])
+
+        optimizer.clear_checkpoint('journal')
+        self.assertEqual(os.listdir(settings.checkpoint_dir), [])
+
+    def test_fresh_run_discards_old_journal(self):
+        settings = make_settings(self.temp_dir, population_size=4, generations=1)
+        seed = Individual.create_random(PARAMETERS, PAIRS, 2)
+        path = os.path.join(settings.checkpoint_dir, 'journal.journal.jsonl')
+        EvaluationJournal(path).record(seed.genes, seed.trading_pairs, None, 99.0, 1)
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0) as backtest:
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(
+                initial_individuals=[seed], checkpoint_name='journal')
+        self.assertEqual(backtest.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Unit tests for optimization/nsga2_optimizer.py."""
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from genetic_algorithm.individual import Individual
+from optimization.nsga2_optimizer import (
+    NSGA2Optimizer, fast_non_dominated_sort, crowding_distance, parse_objectives
+)
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def _metrics(genes, *args):
+    """Profit rises with buy_rsi, drawdown rises with it too: a real trade-off."""
+    buy, sell = genes
+    return {
+        'fitness': 0.5,
+        'total_profit_percent': buy / 40,
+        'max_drawdown': buy / 100 + (90 - sell) / 1000,
+        'sortino_ratio': 1.0,
+    }
+
+
+class TestNonDominatedSort(unittest.TestCase):
+    def test_fronts(self):
+        points = np.array([[1, 5], [2, 4], [1, 4], [0, 0], [3, 1]])
+        fronts = fast_non_dominated_sort(points)
+        self.assertEqual(sorted(fronts[0].tolist()), [0, 1, 4])
+        self.assertEqual(fronts[1].tolist(), [2])
+        self.assertEqual(fronts[2].tolist(), [3])
+
+    def test_duplicates_share_a_front(self):
+        fronts = fast_non_dominated_sort(np.array([[1, 1], [1, 1]]))
+        self.assertEqual(len(fronts), 1)
+
+    def test_empty(self):
+        self.assertEqual(fast_non_dominated_sort(np.empty((0, 2))), [])
+
+    def test_crowding_keeps_extremes(self):
+        distance = crowding_distance(np.array([[0, 4], [1, 3], [3, 1], [4, 0]]))
+        self.assertTrue(np.isinf(distance[0]) and np.isinf(distance[3]))
+        self.assertAlmostEqual(distance[1], 3 / 4 + 3 / 4)
+        self.assertAlmostEqual(distance[2], 3 / 4 + 3 / 4)
+
+    def test_parse_objectives(self):
+        names, signs = parse_objectives(['total_profit_percent', '-max_drawdown'])
+        self.assertEqual(names, ['total_profit_percent', 'max_drawdown'])
+        self.assertEqual(signs.tolist(), [1.0, -1.0])
+
+
+class TestNSGA2Optimizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = make_settings(
+            self.temp_dir, population_size=8, generations=3,
+            nsga2_objectives=['total_profit_percent', '-max_drawdown'],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pareto_front_is_non_dominated(self):
+        optimizer = NSGA2Optimizer(self.settings, PARAMETERS, PAIRS)
+        with patch('optimization.nsga2_optimizer.run_backtest_metrics', side_effect=_metrics):
+            results = optimizer.optimize()
+
+        self.assertEqual([gen for gen, _ in results], [1, 2, 3])
+        front = optimizer.get_pareto_front()
+        self.assertTrue(front)
+        points = np.array([[ind.metrics['total_profit_percent'], -ind.metrics['max_drawdown']]
+                           for ind in front])
+        self.assertEqual(len(fast_non_dominated_sort(points)), 1)
+
+    def test_disqualified_rank_behind_feasible(self):
+        optimizer = NSGA2Optimizer(self.settings, PARAMETERS, PAIRS)
+        good = Individual([20, 70], list(PAIRS), PARAMETERS)
+        good.fitness, good.metrics = 0.1, _metrics([10, 60])
+        bad = Individual([40, 90], list(PAIRS), PARAMETERS)
+        bad.fitness, bad.metrics = -2.0, _metrics([40, 90])
+        failed = Individual([30, 80], list(PAIRS), PARAMETERS)
+        failed.fitness, failed.metrics = float('-inf'), {'fitness': float('-inf')}
+
+        ranks, crowding = optimizer._rank([bad, good, failed])
+        self.assertEqual(ranks.tolist(), [1, 0, 1])
+        self.assertGreater(crowding[0], crowding[2])
+
+    def test_seeded_runs_repeat(self):
+        self.settings.ga_seed = 5
+
+        def run(global_seed):
+            seen = []
+
+            def recorded(genes, *args):
+                seen.append(tuple(genes))
+                return _metrics(genes)
+
+            # The global generator must not leak into a seeded run.
+            random.seed(global_seed)
+            optimizer = NSGA2Optimizer(self.settings, PARAMETERS, PAIRS)
+            with patch('optimization.nsga2_optimizer.run_backtest_metrics', side_effect=recorded):
+                optimizer.optimize()
+            return seen
+
+        self.assertEqual(run(1), run(2))
+
+    def test_no_feasible_candidates_gives_empty_front(self):
+        optimizer = NSGA2Optimizer(self.settings, PARAMETERS, PAIRS)
+        with patch('optimization.nsga2_optimizer.run_backtest_metrics',
+                   return_value={'fitness': float('-inf')}):
+            results = optimizer.optimize()
+        self.assertEqual(len(results), 3)
+        self.assertEqual(optimizer.get_pareto_front(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
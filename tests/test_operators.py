@@ -1,4 +1,5 @@
 """Unit tests for genetic algorithm operators."""
+import random
 import unittest
 from genetic_algorithm.individual import Individual
 from genetic_algorithm.operators import crossover, mutate, select_tournament
@@ -39,6 +40,17 @@ class TestCrossover(unittest.TestCase):
         self.assertTrue(len(child1.trading_pairs) > 0)
         self.assertTrue(len(child2.trading_pairs) > 0)
 
+    def test_crossover_pairs_follow_parent_order(self):
+        """Pair recombination depends on the rng alone, not on set order."""
+        child1, child2 = crossover(self.parent1, self.parent2, rng=random.Random(3))
+
+        rng = random.Random(3)
+        rng.randint(1, 2)
+        expected = ['BTC/USDT', 'ETH/USDT', 'XRP/USDT', 'SOL/USDT']
+        rng.shuffle(expected)
+        self.assertEqual(child1.trading_pairs, expected[:2])
+        self.assertEqual(child2.trading_pairs, expected[:2])
+
     def test_crossover_without_pairs(self):
         """Test crossover without trading pair crossover."""
         child1, child2 = crossover(self.parent1, self.parent2, with_pair=False)
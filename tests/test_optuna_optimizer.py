@@ -0,0 +1,280 @@
+"""Unit tests for optimization/optuna_optimizer.py storage and resume."""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import optuna
+
+from genetic_algorithm.individual import Individual
+from optimization.evaluator import PoolEvaluator
+from optimization.optuna_optimizer import OptunaOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+class Crash(BaseException):
+    """Stands in for the process being killed mid-trial."""
+
+
+class TestOptunaStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def settings(self, **overrides):
+        base = dict(optuna_n_trials=6, optuna_n_startup_trials=2, population_size=3)
+        base.update(overrides)
+        return make_settings(self.temp_dir, **base)
+
+    def test_study_name_follows_search_space(self):
+        settings = self.settings()
+        name = OptunaOptimizer(settings, PARAMETERS, PAIRS).study_name()
+        self.assertEqual(OptunaOptimizer(settings, PARAMETERS, PAIRS).study_name(), name)
+        self.assertTrue(name.startswith('genetrader_'))
+
+        widened = [dict(PARAMETERS[0], end=50), PARAMETERS[1]]
+        self.assertNotEqual(OptunaOptimizer(settings, widened, PAIRS).study_name(), name)
+
+        settings.optuna_study_name = 'mine'
+        self.assertEqual(OptunaOptimizer(settings, PARAMETERS, PAIRS).study_name(), 'mine')
+
+    def test_resume_continues_stored_study(self):
+        for storage in ('sqlite', 'journal'):
+            with self.subTest(storage=storage):
+                settings = self.settings(optuna_storage=storage, optuna_study_name=storage)
+                calls = []
+
+                def crash_on_fifth(genes, pairs, trial_number, *args):
+                    calls.append(trial_number)
+                    if len(calls) == 5:
+                        raise Crash()
+                    return float(genes[0])
+
+                with patch('optimization.optuna_optimizer.run_backtest', side_effect=crash_on_fifth):
+                    with self.assertRaises(Crash):
+                        OptunaOptimizer(settings, PARAMETERS, PAIRS).optimize()
+                self.assertEqual(calls, [1, 2, 3, 4, 5])
+
+                with patch('optimization.optuna_optimizer.run_backtest',
+                           side_effect=lambda genes, *args: float(genes[0])) as backtest:
+                    optimizer = OptunaOptimizer(settings, PARAMETERS, PAIRS)
+                    results = optimizer.optimize(resume=True)
+
+                # Four trials finished, the interrupted one is marked failed.
+                self.assertEqual([call.args[2] for call in backtest.call_args_list], [6, 7])
+                self.assertEqual([gen for gen, _ in results], [1, 2, 3])
+                stored = max((ind for _, ind in results), key=lambda ind: ind.fitness)
+                self.assertIs(optimizer.get_best_individual(), stored)
+                self.assertEqual(stored.fitness, float(stored.genes[0]))
+                self.assertEqual(stored.trading_pairs, PAIRS)
+
+    def test_fresh_run_replaces_stored_study(self):
+        settings = self.settings(optuna_n_trials=3)
+        with patch('optimization.optuna_optimizer.run_backtest', return_value=1.0):
+            OptunaOptimizer(settings, PARAMETERS, PAIRS).optimize()
+        with patch('optimization.optuna_optimizer.run_backtest', return_value=2.0) as backtest:
+            results = OptunaOptimizer(settings, PARAMETERS, PAIRS).optimize()
+        self.assertEqual(backtest.call_count, 3)
+        self.assertEqual([(gen, ind.fitness) for gen, ind in results], [(1, 2.0)])
+
+    def test_worker_processes_share_the_study(self):
+        settings = self.settings(optuna_n_trials=8, optuna_storage='journal', optuna_workers=2)
+        pid_dir = os.path.join(self.temp_dir, 'pids')
+        os.makedirs(pid_dir)
+
+        def backtest(genes, pairs, trial_number, *args):
+            open(os.path.join(pid_dir, f"{trial_number}-{os.getpid()}"), 'w').close()
+            return float(genes[0])
+
+        with patch('optimization.optuna_optimizer.run_backtest', side_effect=backtest):
+            optimizer = OptunaOptimizer(settings, PARAMETERS, PAIRS)
+            results = optimizer.optimize()
+
+        runs = [name.split('-') for name in os.listdir(pid_dir)]
+        trial_numbers = sorted(int(number) for number, _ in runs)
+        self.assertEqual(len(set(trial_numbers)), len(trial_numbers))
+        # Trials are reserved before they are asked for: no overshoot.
+        self.assertEqual(len(trial_numbers), 8)
+        self.assertNotIn(str(os.getpid()), {pid for _, pid in runs})
+
+        self.assertEqual(len(results), (len(trial_numbers) + 2) // 3)
+        # Every worker's trials made it into the shared record, one line each
+        self.assertEqual(sum(1 for _ in optimizer.record.entries()), 8)
+        best = optimizer.get_best_individual()
+        self.assertEqual(best.fitness, max(ind.fitness for _, ind in results))
+        self.assertEqual(best.fitness, float(best.genes[0]))
+
+    def test_trials_are_streamed_to_the_record(self):
+        settings = self.settings(optuna_n_trials=7)
+        with patch('optimization.optuna_optimizer.run_backtest',
+                   side_effect=lambda genes, *args: float(genes[0])):
+            optimizer = OptunaOptimizer(settings, PARAMETERS, PAIRS)
+            results = optimizer.optimize()
+
+        entries = list(optimizer.record.entries())
+        self.assertEqual([entry['generation'] for entry in entries], [1, 1, 1, 2, 2, 2, 3])
+        expected = {}
+        for trial in optimizer.study.trials:
+            generation = trial.number // 3 + 1
+            expected[generation] = max(expected.get(generation, float('-inf')), trial.value)
+        self.assertEqual([(gen, ind.fitness) for gen, ind in results], sorted(expected.items()))
+        self.assertEqual(len(optimizer._generation_best), 3)
+
+    def test_memory_storage_writes_nothing(self):
+        settings = self.settings(optuna_n_trials=2, optuna_storage='memory')
+        with patch('optimization.optuna_optimizer.run_backtest', return_value=1.0):
+            results = OptunaOptimizer(settings, PARAMETERS, PAIRS).optimize(resume=True)
+        self.assertEqual(len(results), 1)
+        self.assertFalse(os.path.exists(settings.checkpoint_dir))
+
+
+class TestOptunaPairEncoding(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pairs_decoded_from_fixed_scores(self):
+        settings = make_settings(self.temp_dir, optuna_n_trials=5, optuna_n_startup_trials=2,
+                                 optuna_storage='memory', fix_pairs=False, num_pairs=2)
+        seed = Individual([25, 75], [PAIRS[0], PAIRS[2]], PARAMETERS)
+        seed.fitness = 1.0
+        chosen = []
+
+        def backtest(genes, pairs, trial_number, *args):
+            chosen.append(pairs)
+            return float(genes[0])
+
+        optimizer = OptunaOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.optuna_optimizer.run_backtest', side_effect=backtest):
+            optimizer.optimize(initial_individuals=[seed])
+
+        self.assertEqual(chosen[0], [PAIRS[0], PAIRS[2]])
+        for pairs in chosen:
+            self.assertEqual(len(pairs), 2)
+            self.assertEqual(pairs, [pair for pair in PAIRS if pair in pairs])
+        distributions = [trial.distributions for trial in optimizer.study.trials]
+        self.assertTrue(all(d == distributions[0] for d in distributions))
+        self.assertEqual(sorted(distributions[0]),
+                         sorted(['buy_rsi', 'sell_rsi'] + [f"pair_score:{pair}" for pair in PAIRS]))
+
+
+class TestOptunaAskTell(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = make_settings(
+            self.temp_dir, optuna_n_trials=7, optuna_n_startup_trials=2, population_size=4,
+            optuna_storage='memory', optuna_ask_tell=True
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_keeps_one_trial_per_worker_in_flight(self):
+        optimizer = OptunaOptimizer(self.settings, PARAMETERS, PAIRS)
+        running = []
+
+        def backtest(genes, pairs, trial_number, *args):
+            running.append(len(optimizer.study.get_trials(
+                deepcopy=False, states=(optuna.trial.TrialState.RUNNING,))))
+            if trial_number == 5:
+                raise RuntimeError("freqtrade failed")
+            return float(genes[0])
+
+        # In-process evaluator posing as a three-worker pool
+        evaluator = PoolEvaluator(1)
+        evaluator.processes = 3
+        with patch('optimization.optuna_optimizer.run_backtest', side_effect=backtest), \
+                self.assertLogs('utils.logging_config', level='ERROR'):
+            results = optimizer.optimize(evaluator=evaluator)
+
+        self.assertEqual(len(running), 7)
+        self.assertEqual(max(running), 3)
+        trials = optimizer.study.trials
+        self.assertTrue(all(t.state == optuna.trial.TrialState.COMPLETE for t in trials))
+        self.assertEqual(trials[4].value, float('-inf'))
+        self.assertEqual([gen for gen, _ in results], [1, 2])
+        self.assertEqual(optimizer.get_best_individual().fitness,
+                         max(float(t.params['buy_rsi']) for t in trials if t.number != 4))
+
+
+class TestOptunaPruning(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = make_settings(
+            self.temp_dir, optuna_n_trials=12, optuna_n_startup_trials=3, population_size=4,
+            optuna_storage='memory', optuna_pruning=True, backtest_timerange_weeks=26
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_trials_run_on_growing_windows(self):
+        optimizer = OptunaOptimizer(self.settings, PARAMETERS, PAIRS)
+        self.assertEqual(optimizer.fidelity_weeks, [4, 12, 26])
+        start, end = optimizer._fidelity_timerange(4).split('-')
+        self.assertEqual((datetime.strptime(end, '%Y%m%d') - datetime.strptime(start, '%Y%m%d')).days, 28)
+        self.assertIsNone(optimizer._fidelity_timerange(26))
+
+        self.settings.optuna_pruning = False
+        self.assertEqual(OptunaOptimizer(self.settings, PARAMETERS, PAIRS).fidelity_weeks, [26])
+
+    def test_weak_trials_are_pruned_before_the_full_backtest(self):
+        for ask_tell in (False, True):
+            with self.subTest(ask_tell=ask_tell):
+                self.settings.optuna_ask_tell = ask_tell
+                self.check_pruning()
+
+    def check_pruning(self):
+        calls = []
+
+        # Every trial after the three startup trials is worse than all before it.
+        def backtest(genes, pairs, trial_number, timerange, num_parameters, min_trades):
+            calls.append((trial_number, timerange))
+            return 100.0 - trial_number
+
+        optimizer = OptunaOptimizer(self.settings, PARAMETERS, PAIRS)
+        with patch('optimization.optuna_optimizer.run_backtest', side_effect=backtest):
+            results = optimizer.optimize()
+
+        self.assertEqual([number for number, timerange in calls if timerange is None], [1, 2, 3])
+        self.assertEqual([number for number, _ in calls[9:]], list(range(4, 13)))
+        self.assertEqual([(gen, ind.fitness) for gen, ind in results], [(1, 99.0)])
+
+        stats = optimizer.get_study_statistics(optimizer.study)
+        self.assertEqual(stats['n_pruned_trials'], 9)
+        self.assertEqual(stats['pruned_fraction'], 0.75)
+        self.assertEqual({weeks: cost['backtests'] for weeks, cost in stats['rung_costs'].items()},
+                         {4: 12, 12: 3, 26: 3})
+
+    def test_disqualified_rungs_are_not_reported(self):
+        floors = {}
+
+        # Short windows disqualify every trial after the startup ones; the
+        # pruner must not read those codes as terrible scores.
+        def backtest(genes, pairs, trial_number, timerange, num_parameters, min_trades):
+            floors[timerange] = min_trades
+            if timerange is not None and trial_number > 3:
+                return -1.0
+            return 100.0 - trial_number
+
+        optimizer = OptunaOptimizer(self.settings, PARAMETERS, PAIRS)
+        with patch('optimization.optuna_optimizer.run_backtest', side_effect=backtest):
+            optimizer.optimize()
+
+        stats = optimizer.get_study_statistics(optimizer.study)
+        self.assertEqual(stats['n_pruned_trials'], 0)
+        self.assertEqual(stats['rung_costs'][26]['backtests'], 12)
+        # The full window's floor of 15 trades, scaled to each rung
+        self.assertEqual(sorted(floors.values(), key=str), [2, 7, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Unit tests for the coarse-to-fine gene resolution schedule."""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from genetic_algorithm.individual import Individual, grid_step, snap_to_grid
+from genetic_algorithm.operators import mutate
+from genetic_algorithm.resolution import ResolutionSchedule
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+DECIMAL = {'name': 'bb_width', 'type': 'Decimal', 'start': 0.0, 'end': 1.0,
+           'decimal_places': 3, 'optimize': True}
+
+
+class TestGrid(unittest.TestCase):
+    def test_grid_step_respects_declared_precision(self):
+        self.assertAlmostEqual(grid_step(DECIMAL, 0.1), 0.1)
+        self.assertIsNone(grid_step(DECIMAL, 0.0005))
+        self.assertEqual(grid_step(PARAMETERS[0], 0.2), 6)
+        self.assertIsNone(grid_step(PARAMETERS[0], 0.01))
+        self.assertIsNone(grid_step(DECIMAL, None))
+
+    def test_snap_stays_in_range(self):
+        param = {'type': 'Decimal', 'start': 0.0, 'end': 1.0, 'decimal_places': 2}
+        self.assertAlmostEqual(snap_to_grid(0.34, param, 0.3), 0.3)
+        self.assertAlmostEqual(snap_to_grid(0.99, param, 0.3), 0.9)
+
+    def test_constrain_genes_snaps_then_rounds(self):
+        ind = Individual([0.1234], [], [DECIMAL])
+        ind.constrain_genes([DECIMAL], resolution=0.05)
+        self.assertEqual(ind.genes, [0.1])
+        ind = Individual([0.1234], [], [DECIMAL])
+        ind.constrain_genes([DECIMAL])
+        self.assertEqual(ind.genes, [0.123])
+
+    def test_mutation_moves_at_least_one_step(self):
+        for _ in range(50):
+            ind = Individual([0.5], [], [DECIMAL])
+            mutate(ind, 1.0, resolution=0.25)
+            self.assertIn(ind.genes[0], (0.0, 0.25, 0.75, 1.0))
+
+
+class TestResolutionSchedule(unittest.TestCase):
+    def test_refines_on_plateau(self):
+        schedule = ResolutionSchedule(initial=0.1, factor=2.0, patience=2)
+        schedule.update(1, 1.0)
+        self.assertAlmostEqual(schedule.resolution, 0.1)
+        schedule.update(2, 1.0)
+        schedule.update(3, 1.0)
+        self.assertAlmostEqual(schedule.resolution, 0.05)
+
+    def test_reaches_declared_precision_on_time(self):
+        schedule = ResolutionSchedule(initial=0.1, patience=100, full_precision_at=5)
+        for gen in range(1, 5):
+            schedule.update(gen, float(gen))
+            self.assertIsNotNone(schedule.resolution)
+        schedule.update(5, 5.0)
+        self.assertIsNone(schedule.resolution)
+        self.assertEqual(schedule.describe(), "declared precision")
+
+    def test_state_round_trip(self):
+        schedule = ResolutionSchedule(initial=0.1, patience=1)
+        schedule.update(1, 1.0)
+        schedule.update(2, 1.0)
+        restored = ResolutionSchedule(initial=0.1, patience=1)
+        restored.set_state(schedule.get_state())
+        self.assertEqual(restored.resolution, schedule.resolution)
+
+    def test_factor_must_shrink_the_grid(self):
+        for factor in (1.0, 0.5):
+            with self.assertRaises(ValueError):
+                ResolutionSchedule(initial=0.1, factor=factor)
+
+
+class TestResolutionInGA(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_first_generation_is_on_the_grid_and_grid_is_logged(self):
+        settings = make_settings(self.temp_dir, population_size=8, generations=4,
+                                 resolution_initial=0.2, resolution_full_precision_at=1.0)
+        seen = []
+
+        def scored(genes, pairs, generation, timerange, num_parameters):
+            seen.append((generation, list(genes)))
+            return 1.0
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored), \
+                self.assertLogs('utils.logging_config', level='INFO') as logs:
+            optimizer.optimize(checkpoint_name=None)
+
+        for generation, (buy, sell) in seen:
+            if generation == 1:
+                self.assertEqual((buy - 10) % 6, 0)
+                self.assertEqual((sell - 60) % 6, 0)
+        grid_logs = [line for line in logs.output if 'Gene grid for generation' in line]
+        self.assertTrue(any('20.00% of range' in line for line in grid_logs))
+        self.assertTrue(any('declared precision' in line for line in grid_logs))
+
+    def test_resume_keeps_schedule_position(self):
+        settings = make_settings(self.temp_dir, generations=2, resolution_initial=0.2,
+                                 resolution_patience=1, resolution_full_precision_at=0.0)
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0):
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(checkpoint_name='grid')
+
+        # One flat generation refined the grid once; resuming must not restart it.
+        settings.generations = 3
+        with patch('optimization.genetic_optimizer.run_backtest', return_value=1.0), \
+                self.assertLogs('utils.logging_config', level='INFO') as logs:
+            GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize(resume=True, checkpoint_name='grid')
+        self.assertIn('Gene grid for generation 3: 10.00% of range', '\n'.join(logs.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Unit tests for genetic_algorithm/seeding.py."""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from genetic_algorithm.seeding import load_seed_individuals, repair_genes
+from tests.test_ga_core import PARAMETERS, PAIRS
+
+STRATEGY = """
+class GeneTrader_gen3_1_1(IStrategy):
+    buy_rsi = IntParameter(10.0, 40.0, default=25, space='buy', optimize=True)
+    sell_rsi = IntParameter(60.0, 90.0, default=88, space='sell', optimize=True)
+"""
+
+
+class TestRepairGenes(unittest.TestCase):
+    def test_positional_genes_are_clipped_into_range(self):
+        self.assertEqual(repair_genes([5, 95], PARAMETERS), [10, 90])
+
+    def test_genes_matched_by_name(self):
+        self.assertEqual(repair_genes({'sell_rsi': 80, 'buy_rsi': 20}, PARAMETERS), [20, 80])
+
+    def test_missing_gene_takes_default(self):
+        self.assertEqual(repair_genes({'buy_rsi': 20, 'old_param': 3}, PARAMETERS), [20, 70])
+
+    def test_foreign_schema_is_dropped(self):
+        self.assertIsNone(repair_genes({'other': 1, 'another': 2}, PARAMETERS))
+        self.assertIsNone(repair_genes([1, 2, 3], PARAMETERS))
+
+    def test_invalid_categorical_falls_back_to_default(self):
+        params = [{'name': 'mode', 'type': 'Categorical', 'options': ['a', 'b'], 'default': 'b'}]
+        self.assertEqual(repair_genes({'mode': 'gone'}, params), ['b'])
+
+
+class TestLoadSeedIndividuals(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_loads_all_sources_best_first(self):
+        self._write('best/best_individual_gen1.json',
+                    {'fitness': 0.5, 'genes': [20, 70], 'trading_pairs': ['BTC/USDT']})
+        self._write('best/finalists.json', [
+            {'rank': 1, 'fitness': 0.9, 'genes': [30, 80], 'param_names': ['buy_rsi', 'sell_rsi'],
+             'trading_pairs': ['ETH/USDT']},
+        ])
+        self._write('daily/20240101/gen3/GeneTrader_gen3_1_1.py', STRATEGY)
+        self._write('daily/20240101/gen3/config.json',
+                    {'exchange': {'pair_whitelist': ['SOL/USDT', 'DELISTED/USDT']}})
+
+        seeds = load_seed_individuals([self.temp_dir], PARAMETERS, PAIRS, num_pairs=2, limit=10)
+        self.assertEqual([ind.genes for ind in seeds], [[30, 80], [20, 70], [25, 88]])
+        self.assertTrue(all(ind.fitness is None for ind in seeds))
+        self.assertEqual(seeds[0].trading_pairs[0], 'ETH/USDT')
+        self.assertEqual(seeds[2].trading_pairs[0], 'SOL/USDT')
+        self.assertTrue(all(len(ind.trading_pairs) == 2 for ind in seeds))
+        self.assertTrue(all(set(ind.trading_pairs) <= set(PAIRS) for ind in seeds))
+
+    def test_limit_and_deduplication(self):
+        for gen in range(3):
+            self._write(f'best_individual_gen{gen}.json',
+                        {'fitness': gen, 'genes': [20, 70], 'trading_pairs': []})
+        self._write('best_individual_gen9.json', {'fitness': -1, 'genes': [21, 70], 'trading_pairs': []})
+        seeds = load_seed_individuals([self.temp_dir], PARAMETERS, PAIRS, num_pairs=None, limit=5)
+        self.assertEqual([ind.genes for ind in seeds], [[20, 70], [21, 70]])
+        self.assertEqual(seeds[0].trading_pairs, PAIRS)
+
+        seeds = load_seed_individuals([self.temp_dir], PARAMETERS, PAIRS, num_pairs=None, limit=1)
+        self.assertEqual(len(seeds), 1)
+
+    def test_missing_path_is_skipped(self):
+        seeds = load_seed_individuals([os.path.join(self.temp_dir, 'nope')],
+                                      PARAMETERS, PAIRS, num_pairs=None, limit=5)
+        self.assertEqual(seeds, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""Unit tests for strategy/segments.py and segment reuse in walk-forward runs."""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from optimization.evaluator import PoolEvaluator
+from optimization.genetic_optimizer import GeneticOptimizer
+from strategy.segments import (
+    SegmentedBacktest, SegmentStore, combinatorial_splits, group_segments, load_exported_trades
+)
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+START = datetime(2024, 1, 1)
+
+
+def trade(open_day, close_day, profit_abs, start=START):
+    return {
+        'pair': 'BTC/USDT',
+        'open_date': (start + timedelta(days=open_day)).isoformat() + '+00:00',
+        'close_date': (start + timedelta(days=close_day)).isoformat() + '+00:00',
+        'profit_abs': profit_abs,
+        'profit_ratio': profit_abs / 100,
+        'trade_duration': (close_day - open_day) * 24 * 60,
+    }
+
+
+class TestSegmentedBacktest(unittest.TestCase):
+    def setUp(self):
+        self.backtest = SegmentedBacktest([
+            trade(0, 1, 100),     # week 0
+            trade(2, 3, -50),     # week 0
+            trade(6, 8, 30),      # straddles weeks 0 and 1
+            trade(8, 9, 40),      # week 1
+            trade(15, 16, -20),   # week 2
+        ], START, total_weeks=4, starting_balance=1000)
+
+    def test_trades_are_tagged_by_week(self):
+        self.assertEqual(
+            [(t.open_segment, t.close_segment) for t in self.backtest.trades],
+            [(0, 0), (0, 0), (0, 1), (1, 1), (2, 2)]
+        )
+
+    def test_window_metrics(self):
+        metrics = self.backtest.metrics([0])
+        self.assertEqual(metrics['total_trades'], 2)
+        self.assertAlmostEqual(metrics['total_profit_usdt'], 50)
+        self.assertAlmostEqual(metrics['total_profit_percent'], 0.05)
+        self.assertAlmostEqual(metrics['win_rate'], 0.5)
+        self.assertAlmostEqual(metrics['profit_factor'], 2.0)
+        self.assertAlmostEqual(metrics['max_drawdown'], 50 / 1100)
+        self.assertAlmostEqual(metrics['daily_avg_trades'], 2 / 7)
+
+    def test_boundary_trade_counts_only_when_both_weeks_are_selected(self):
+        self.assertEqual(self.backtest.metrics([1])['total_trades'], 1)
+        self.assertEqual(self.backtest.metrics([0, 1])['total_trades'], 4)
+
+    def test_equity_carried_over_without_reset(self):
+        carried = self.backtest.metrics([2], reset_equity=False)
+        # Balance entering week 2 is 1000 + 100 - 50 + 30 + 40 = 1120, the peak.
+        self.assertAlmostEqual(carried['total_profit_percent'], -20 / 1120)
+        self.assertAlmostEqual(carried['max_drawdown'], 20 / 1120)
+        reset = self.backtest.metrics([2])
+        self.assertAlmostEqual(reset['total_profit_percent'], -0.02)
+
+    def test_segments_for_timerange(self):
+        self.assertEqual(self.backtest.segments_for('20240108-20240122'), range(1, 3))
+        self.assertEqual(self.backtest.segments_for('20240115-'), range(2, 4))
+
+    def test_empty_window_scores_minus_infinity(self):
+        self.assertEqual(self.backtest.fitness([3]), float('-inf'))
+
+    def test_cpcv_scores_every_split(self):
+        with patch('strategy.segments.fitness_function',
+                   side_effect=lambda parsed, *args, **kwargs: parsed['total_trades']):
+            scores = self.backtest.cpcv_fitness(4, 2)
+        # Splits in order: (0,1) (0,2) (0,3) (1,2) (1,3) (2,3)
+        self.assertEqual(scores, [4, 3, 2, 2, 1, 1])
+
+
+class TestSplits(unittest.TestCase):
+    def test_combinatorial_splits(self):
+        splits = combinatorial_splits(6, 2)
+        self.assertEqual(len(splits), 15)
+        self.assertEqual(splits[0], (0, 1))
+        with self.assertRaises(ValueError):
+            combinatorial_splits(3, 3)
+
+    def test_group_segments(self):
+        self.assertEqual(group_segments(10, 3), [range(0, 4), range(4, 7), range(7, 10)])
+        with self.assertRaises(ValueError):
+            group_segments(2, 3)
+
+
+class TestLoadExportedTrades(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.result = {'strategy': {'GeneTrader': {'trades': [trade(0, 1, 10)], 'starting_balance': 500}}}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_json_export(self):
+        with open(os.path.join(self.temp_dir, 'backtest-result-2024-01-01_00-00-00.json'), 'w') as f:
+            json.dump(self.result, f)
+        with open(os.path.join(self.temp_dir, 'backtest-result-2024-01-01_00-00-00.meta.json'), 'w') as f:
+            json.dump({}, f)
+        trades, balance = load_exported_trades(self.temp_dir)
+        self.assertEqual(len(trades), 1)
+        self.assertEqual(balance, 500)
+
+    def test_zip_export(self):
+        path = os.path.join(self.temp_dir, 'backtest-result-2024-01-01_00-00-00.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('backtest-result-2024-01-01_00-00-00_config.json', '{}')
+            archive.writestr('backtest-result-2024-01-01_00-00-00.json', json.dumps(self.result))
+        trades, balance = load_exported_trades(self.temp_dir)
+        self.assertEqual(len(trades), 1)
+
+    def test_missing_export(self):
+        self.assertEqual(load_exported_trades(self.temp_dir), ([], None))
+
+
+def full_range_result(genes, pairs, timerange, num_parameters=0):
+    # One trade a day for 16 weeks; profit grows with buy_rsi.
+    start = datetime.strptime(timerange.split('-')[0], '%Y%m%d')
+    return {
+        'fitness': 1.0,
+        'trades': [trade(day, day, float(genes[0]) - 20, start) for day in range(16 * 7)],
+        'starting_balance': 1000,
+    }
+
+
+class TestSegmentStore(unittest.TestCase):
+    def test_one_backtest_serves_every_window(self):
+        store = SegmentStore(START, 4)
+        with patch('strategy.backtest.run_backtest_trades', side_effect=full_range_result) as backtest, \
+                patch('strategy.segments.fitness_function',
+                      side_effect=lambda parsed, *args, **kwargs: parsed['total_trades']):
+            evaluator = PoolEvaluator(1)
+            handles = [store.submit(evaluator, [30, 70], PAIRS, timerange)
+                       for timerange in ('20240101-20240115', '20240115-20240129')]
+            scores = [handle.get() for handle in handles]
+        self.assertEqual(backtest.call_count, 1)
+        self.assertEqual(backtest.call_args[0][2], '20240101-20240129')
+        self.assertEqual(scores, [14, 14])
+
+
+class TestWalkForwardSegmentReuse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fold_tests_are_sliced_from_full_range_backtests(self):
+        settings = make_settings(
+            self.temp_dir, generations=2, enable_walk_forward=True,
+            walk_forward_train_weeks=8, walk_forward_test_weeks=2,
+            walk_forward_min_train_weeks=4, total_data_weeks=16,
+            walk_forward_segment_reuse=True, cpcv_groups=4, cpcv_test_groups=2,
+        )
+        with patch('optimization.genetic_optimizer.run_backtest',
+                   side_effect=lambda genes, *args: float(genes[0])) as backtest, \
+                patch('strategy.backtest.run_backtest_trades', side_effect=full_range_result) as full, \
+                patch('strategy.segments.fitness_function',
+                      side_effect=lambda parsed, *args, **kwargs: parsed['total_trades']):
+            _, validation = GeneticOptimizer(settings, PARAMETERS, PAIRS).optimize_with_walk_forward()
+
+        folds = validation['fold_results']
+        self.assertGreater(len(folds), 1)
+        winners = {tuple(fold['best_individual'].genes) for fold in folds}
+        self.assertEqual(full.call_count, len(winners))
+        # Training is unchanged: every run_backtest call is a training generation.
+        self.assertTrue(all(call.args[2] > 0 for call in backtest.call_args_list))
+        for fold in folds:
+            # Two test weeks of daily trades; each split holds out 8 weeks.
+            self.assertEqual(fold['test_fitness'], 14)
+            self.assertEqual(fold['cpcv_fitness'], [56] * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
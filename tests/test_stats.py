@@ -0,0 +1,22 @@
+"""Unit tests for utils/stats.py."""
+import unittest
+
+from utils.stats import rank, rank_correlation
+
+
+class TestRankCorrelation(unittest.TestCase):
+    def test_ties_share_average_rank(self):
+        self.assertEqual(rank([3.0, 1.0, 3.0]), [2.5, 1.0, 2.5])
+
+    def test_monotonic_sequences_correlate_perfectly(self):
+        self.assertAlmostEqual(rank_correlation([1, 2, 3, 4], [10, 20, 25, 90]), 1.0)
+        self.assertAlmostEqual(rank_correlation([1, 2, 3, 4], [4, 3, 2, 1]), -1.0)
+
+    def test_undefined_cases_return_none(self):
+        self.assertIsNone(rank_correlation([1.0], [2.0]))
+        self.assertIsNone(rank_correlation([1, 2, 3], [5, 5, 5]))
+        self.assertIsNone(rank_correlation([1, 2], [1, 2, 3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Unit tests for optimization/surrogate.py and the GA pre-screening hook."""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from genetic_algorithm.individual import Individual
+from optimization.surrogate import SurrogateModel, SKLEARN_AVAILABLE, DISQUALIFIED_FITNESS
+from optimization.genetic_optimizer import GeneticOptimizer
+from tests.test_ga_core import make_settings, PARAMETERS, PAIRS
+
+
+def _individual(genes, fitness=None):
+    ind = Individual(list(genes), list(PAIRS), PARAMETERS)
+    ind.fitness = fitness
+    return ind
+
+
+@unittest.skipUnless(SKLEARN_AVAILABLE, "scikit-learn not installed")
+class TestSurrogateModel(unittest.TestCase):
+    def trained(self, min_samples=10):
+        model = SurrogateModel(PARAMETERS, min_samples=min_samples, uncertainty_weight=0.0)
+        # Fitness rises with buy_rsi and ignores sell_rsi.
+        model.add([_individual([b, 75], fitness=b / 40) for b in range(10, 41, 2)])
+        self.assertTrue(model.fit())
+        return model
+
+    def test_not_ready_below_min_samples(self):
+        model = SurrogateModel(PARAMETERS, min_samples=50)
+        model.add([_individual([20, 70], fitness=1.0)])
+        self.assertFalse(model.fit())
+        self.assertFalse(model.ready)
+        self.assertEqual(model.predict([_individual([20, 70])]), ([], []))
+
+    def test_screen_keeps_best_predicted(self):
+        model = self.trained()
+        candidates = [_individual([b, 70]) for b in (12, 38, 15, 35)]
+        kept = model.screen(candidates, 2)
+        self.assertEqual(sorted(ind.genes[0] for ind in kept), [35, 38])
+
+    def test_accuracy_reports_rank_correlation(self):
+        model = self.trained()
+        population = [_individual([b, 70], fitness=b / 40) for b in (12, 20, 30, 38)]
+        predicted, _ = model.predict(population)
+        accuracy = model.accuracy(population, predicted)
+        self.assertEqual(accuracy['n'], 4)
+        self.assertGreater(accuracy['rank_correlation'], 0.5)
+
+    def test_failed_backtests_train_as_disqualified(self):
+        model = SurrogateModel(PARAMETERS, min_samples=1)
+        model.add([_individual([20, 70], fitness=float('-inf')),
+                   _individual([21, 70], fitness=-3.0)])
+        self.assertEqual(model.targets, [DISQUALIFIED_FITNESS, DISQUALIFIED_FITNESS])
+
+    def test_state_round_trip_refits(self):
+        model = self.trained()
+        restored = SurrogateModel(PARAMETERS, min_samples=10)
+        restored.set_state(model.get_state())
+        self.assertTrue(restored.ready)
+
+    def test_seeded_forest_depends_on_seed_and_generation(self):
+        examples = [_individual([b, 60 + b % 7], fitness=b / 40) for b in range(10, 41)]
+        probe = [_individual([b, 71]) for b in (13, 22, 37)]
+
+        def predictions(seed, generation):
+            model = SurrogateModel(PARAMETERS, min_samples=10, n_estimators=10, seed=seed)
+            model.add(examples)
+            model.fit(generation)
+            restored = SurrogateModel(PARAMETERS, min_samples=10, n_estimators=10, seed=seed)
+            restored.set_state(model.get_state())
+            self.assertEqual(restored.predict(probe), model.predict(probe))
+            return model.predict(probe)
+
+        self.assertEqual(predictions(4, 2), predictions(4, 2))
+        self.assertNotEqual(predictions(4, 2), predictions(4, 3))
+
+
+@unittest.skipUnless(SKLEARN_AVAILABLE, "scikit-learn not installed")
+class TestGeneticOptimizerScreening(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_screening_keeps_backtest_count_per_generation(self):
+        settings = make_settings(self.temp_dir, generations=4, surrogate_enabled=True,
+                                 surrogate_min_samples=4, surrogate_oversample=3)
+        calls = {'n': 0}
+
+        def scored(genes, pairs, generation, timerange, num_parameters):
+            calls['n'] += 1
+            return genes[0] / 40
+
+        optimizer = GeneticOptimizer(settings, PARAMETERS, PAIRS)
+        with patch('optimization.genetic_optimizer.run_backtest', side_effect=scored), \
+                self.assertLogs('utils.logging_config', level='INFO') as logs:
+            results = optimizer.optimize(checkpoint_name=None)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(calls['n'], 4 * settings.population_size)
+        self.assertTrue(any('Surrogate screened' in line for line in logs.output))
+        self.assertTrue(any('Surrogate accuracy' in line for line in logs.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
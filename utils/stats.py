@@ -0,0 +1,38 @@
+"""Small statistics helpers shared by the optimizers and reports."""
+import math
+from typing import List, Optional, Sequence
+
+
+def rank(values: Sequence[float]) -> List[float]:
+    """Return 1-based ranks, giving tied values the average of their ranks."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        average = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = average
+        i = j + 1
+    return ranks
+
+
+def rank_correlation(x: Sequence[float], y: Sequence[float]) -> Optional[float]:
+    """Spearman rank correlation of two equally long sequences.
+
+    Returns None when fewer than two points are given or either side is
+    constant, since the coefficient is undefined there.
+    """
+    if len(x) != len(y) or len(x) < 2:
+        return None
+    rx, ry = rank(x), rank(y)
+    mean_x = sum(rx) / len(rx)
+    mean_y = sum(ry) / len(ry)
+    cov = sum((a - mean_x) * (b - mean_y) for a, b in zip(rx, ry))
+    var_x = sum((a - mean_x) ** 2 for a in rx)
+    var_y = sum((b - mean_y) ** 2 for b in ry)
+    if var_x == 0 or var_y == 0:
+        return None
+    return cov / math.sqrt(var_x * var_y)